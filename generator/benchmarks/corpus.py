@@ -0,0 +1,139 @@
+"""
+Generates a synthetic corpus of CommandsPython documentation pages, structured like the pages in the Maya documentation
+"""
+
+import random
+import html
+import os
+
+from src.documentation import source
+
+VERBS = ["create", "edit", "poly", "render", "anim", "curve", "node", "scene", "texture", "shader", "rig", "skin"]
+NOUNS = ["Attr", "Node", "Curve", "Layer", "Set", "Shape", "Light", "Camera", "Panel", "Context", "Editor", "Key"]
+
+FLAG_TYPES = [
+    "boolean", "boolean", "boolean", "string", "string", "int", "float", "uint", "int64", "angle", "linear", "time",
+    "script", "name", "string[]", "int[]", "float[]", "[float, float, float]", "[linear, linear, linear]",
+    "[string, string]", "[int, int]", "timerange", "floatrange", "[string, [, string, ], [, string, ]]", "on|off",
+]
+RETURN_TYPES = ["string", "string[]", "int", "float[]", "boolean", "None", "Any", "int[]", "[float, float, float]"]
+SYNOPSES = ["[String...]", "String", "", "String String", "[Name...]", "Int", "[String]", "String Int"]
+
+PROPERTY_IMAGES = {
+    "create": '<img src="create.gif" alt="create" title="create">',
+    "query": '<img src="query.gif" alt="query" title="query">',
+    "edit": '<img src="edit.gif" alt="edit" title="edit">',
+    "multiuse": '<img src="multiuse.gif" alt="multiuse" title="multiuse">',
+}
+
+PAGE_TEMPLATE = """<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">
+<html><head><meta http-equiv="Content-Type" content="text/html; charset=utf-8"><title>{name} command</title>
+<link rel="stylesheet" href="../style.css"></head>
+<body class="command">
+<div id="banner"><table width="100%"><tr><td><font size="-1"><b>command</b> (Python)</font></td><td align="right"><a href="../Commands/{name}.html">MEL version</a></td></tr></table></div>
+<h1>{name} <img src="pyth.gif"></h1>
+<p id="synopsis"><code>{name}([objects...], [{first_flag}=<i>{first_type}</i>])</code><br></p>
+<p>Note: Strings representing object names and arguments must be separated by commas. This is not depicted in the synopsis.</p>
+<p>{name} is {undoable}, {queryable}, and {editable}.</p>
+{description}
+<h2><a name="hReturn">Return value</a></h2>
+<table>{returns}</table>
+<h2><a name="hFlags">Flags</a></h2>
+<table width="100%">
+<tr><th bgcolor="#CCCCCC">Long name (short name)</th><th bgcolor="#CCCCCC">Argument types</th><th bgcolor="#CCCCCC">Properties</th></tr>
+{flags}
+</table>
+<h2><a name="hExamples">Python examples</a></h2>
+<pre>import maya.cmds as cmds
+
+{examples}
+</pre>
+</body></html>
+"""
+
+FLAG_TEMPLATE = """<tr bgcolor="#EEEEEE"><td valign="top"><a name="flag{name}"></a><code><b>{name}</b>(<b>{short_name}</b>)</code></td><td valign="top"><i>{arg_type}</i></td><td valign="top">{properties}</td></tr>
+<tr><td colspan="3"><table width="100%"><tr><td width="20">&nbsp;</td><td>{description}</td></tr></table></td></tr>"""
+
+
+def get_command_names(count: int, rng: random.Random) -> list[str]:
+    names: set[str] = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(VERBS)}{rng.choice(NOUNS)}{rng.choice(NOUNS) if rng.random() < 0.5 else ''}{len(names)}")
+
+    return sorted(names)
+
+
+def create_page(name: str, rng: random.Random, flag_count: int | None = None) -> str:
+    """
+    Create the documentation page of a command, with `flag_count` flags or a random number of flags if None
+    """
+    queryable = rng.random() < 0.7
+    editable = rng.random() < 0.5
+
+    flag_rows: list[str] = []
+    flag_names: list[str] = []
+    for i in range(flag_count or rng.randint(1, 40)):
+        flag_name = f"{rng.choice(VERBS)}{rng.choice(NOUNS)}{i}"
+        properties = ["create"]
+        if queryable and rng.random() < 0.6:
+            properties.append("query")
+        if editable and rng.random() < 0.5:
+            properties.append("edit")
+        if rng.random() < 0.05:
+            properties.append("multiuse")
+
+        description = f"Sets the {flag_name} of the node."
+        if "query" in properties and rng.random() < 0.1:
+            description += " In query mode, this flag needs a value."
+
+        flag_rows.append(FLAG_TEMPLATE.format(
+            name=flag_name,
+            short_name=f"f{i}",
+            arg_type=html.escape(rng.choice(FLAG_TYPES)),
+            properties="".join(PROPERTY_IMAGES[x] for x in properties),
+            description=description
+        ))
+        flag_names.append(flag_name)
+
+    returns = "".join(
+        f'<tr><td valign="top"><i>{html.escape(rng.choice(RETURN_TYPES))}</i></td><td>The result of the command</td></tr>'
+        for _ in range(rng.randint(1, 2))
+    )
+
+    examples = "\n".join(f"cmds.{name}( 'node{i}', {flag_name}=True )" for i, flag_name in enumerate(flag_names[:5]))
+
+    return PAGE_TEMPLATE.format(
+        name=name,
+        first_flag=flag_names[0],
+        first_type="boolean",
+        undoable="undoable" if rng.random() < 0.5 else "NOT undoable",
+        queryable="queryable" if queryable else "NOT queryable",
+        editable="editable" if editable else "NOT editable",
+        description=f"The {name} command. " * rng.randint(1, 10),
+        returns=returns,
+        flags="\n".join(flag_rows),
+        examples=examples
+    )
+
+
+def generate_corpus(directory: str, count: int, seed: int = 0) -> dict[str, str]:
+    """
+    Write `count` command pages and an index page to `directory`.
+    Returns a dict mapping the command names to the synopsis Maya would give for them
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    synopses: dict[str, str] = {}
+    index_links: list[str] = []
+    for name in get_command_names(count, rng):
+        with open(os.path.join(directory, source.get_page_filename(name)), "w", encoding="utf-8") as f:
+            f.write(create_page(name, rng))
+
+        synopses[name] = f"Synopsis: {name} [flags] {rng.choice(SYNOPSES)}".rstrip()
+        index_links.append(f'<a href="{source.get_page_filename(name)}">{name}</a><br>')
+
+    with open(os.path.join(directory, source.INDEX_PAGE), "w", encoding="utf-8") as f:
+        f.write("<html><head><title>All commands</title></head>\n<body>\n" + "\n".join(index_links) + "\n</body></html>\n")
+
+    return synopses
@@ -0,0 +1,106 @@
+"""
+Local stand-in for the online documentation, serves a directory of CommandsPython pages over HTTP.
+Responses carry ETag & Last-Modified validators and conditional requests are answered with 304 Not Modified
+
+Usage (from the generator directory):
+    python -m benchmarks.docs_server DIRECTORY [--port N]
+
+Then generate the stubs with `--docs-source http://127.0.0.1:PORT/`
+"""
+
+import email.utils
+import http.server
+import contextlib
+import threading
+import argparse
+import hashlib
+import typing
+import sys
+import os
+
+
+def create_handler(directory: str) -> type[http.server.BaseHTTPRequestHandler]:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep the connections alive like the real server
+
+        def do_GET(self):
+            filepath = os.path.join(directory, os.path.basename(self.path.split("?", 1)[0]))
+            if not os.path.isfile(filepath):
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            with open(filepath, "rb") as f:
+                body = f.read()
+
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            last_modified = email.utils.formatdate(int(os.path.getmtime(filepath)), usegmt=True)
+
+            if self.is_not_modified(etag, os.path.getmtime(filepath)):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def is_not_modified(self, etag: str, modified_time: float) -> bool:
+            # If-None-Match takes precedence over If-Modified-Since
+            if if_none_match := self.headers.get("If-None-Match"):
+                return etag in [x.strip() for x in if_none_match.split(",")]
+
+            if if_modified_since := self.headers.get("If-Modified-Since"):
+                try:
+                    return int(modified_time) <= email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+                except (TypeError, ValueError):
+                    return False
+
+            return False
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+@contextlib.contextmanager
+def serve(directory: str, port: int = 0) -> typing.Generator[str, None, None]:
+    """
+    Serve the directory in a background thread, yields the url of the directory on the server
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), create_handler(directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve a directory of CommandsPython pages with ETag & Last-Modified validators")
+    parser.add_argument("directory", help="Directory containing the CommandsPython html pages")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    args = parser.parse_args()
+
+    with serve(args.directory, args.port) as url:
+        print(f"Serving {args.directory} at {url}, press Ctrl+C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Minimal stand-in for the `maya` package, allows running the generator benchmarks on plain CPython
+"""
@@ -0,0 +1,55 @@
+"""
+Fake `maya.cmds`, the commands are registered with `_configure` and only support `help` & `about`
+"""
+
+import time
+
+_version = "2026"
+_help_latency = 0.0
+_synopses: dict[str, str] = {}
+_registered: set[str] = set()
+
+
+def _configure(synopses: dict[str, str], version: str = "2026", help_latency: float = 0.0) -> None:
+    """
+    Register the commands, `synopses` maps the command names to the synopsis line returned by `help`.
+    `help_latency` is the time in seconds each `help` call takes, to simulate querying a real Maya session
+    """
+    global _version, _help_latency
+
+    for name in _registered:
+        globals().pop(name, None)
+    _registered.clear()
+
+    _synopses.clear()
+    _synopses.update(synopses)
+    _version = version
+    _help_latency = help_latency
+
+    # Commands like 'about' & 'help' that are implemented here are kept
+    for name in synopses:
+        if name not in globals():
+            globals()[name] = _create_command(name)
+            _registered.add(name)
+
+
+def _create_command(name: str):
+    def command(*args, **kwargs):
+        raise RuntimeError(f"'{name}' is not available in the fake maya.cmds")
+
+    command.__name__ = name
+    return command
+
+
+def about(version: bool = False, **kwargs) -> str:
+    return _version
+
+
+def help(command: str, **kwargs) -> str:
+    if command not in _synopses:
+        raise RuntimeError(f"Unknown command: {command}")
+
+    if _help_latency:
+        time.sleep(_help_latency)
+
+    return f"\n{_synopses[command]}\n\nFlags:\n"
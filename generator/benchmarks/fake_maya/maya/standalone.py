@@ -0,0 +1,6 @@
+def initialize(name: str = "python") -> None:
+    pass
+
+
+def uninitialize() -> None:
+    pass
@@ -0,0 +1,86 @@
+"""
+Measure the time it takes to import the generator with `python -X importtime`, each run uses a new interpreter.
+Also measures the time until the resource tables have been loaded & the first type string has been converted
+
+Usage (from the generator directory):
+    python -m benchmarks.import_time [--module NAME] [--repeat N] [--top N]
+"""
+
+import subprocess
+import argparse
+import time
+import sys
+import os
+
+GENERATOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_WORK_SCRIPT = """
+import time
+start_time = time.perf_counter()
+from src import populate_functions
+populate_functions.get_arg_type("string[]")
+print(time.perf_counter() - start_time)
+"""
+
+
+def measure_import(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Import the module in a new interpreter, returns the self & cumulative import time in microseconds of every imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=GENERATOR_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    timings: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+
+    return timings
+
+
+def measure_first_work() -> float:
+    """
+    Returns the time in seconds to import `populate_functions` & convert the first type string, in a new interpreter
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_WORK_SCRIPT],
+        cwd=GENERATOR_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(result.stdout)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the import time of the generator")
+    parser.add_argument("--module", default="src.generator", help="Module to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of imports, the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="Number of the slowest modules to list")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    runs = [measure_import(args.module) for _ in range(args.repeat)]
+    best = min(runs, key=lambda timings: timings[args.module][1])
+
+    print(f"{args.module}: {best[args.module][1] / 1000:.1f} ms cumulative import time (fastest of {args.repeat} runs)")
+    print(f"Time to first type conversion: {min(measure_first_work() for _ in range(args.repeat)) * 1000:.1f} ms")
+
+    print("Slowest modules by self time:")
+    for name, (self_us, cumulative_us) in sorted(best.items(), key=lambda x: x[1][0], reverse=True)[:args.top]:
+        print(f"  {name:<40} {self_us / 1000:8.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative")
+
+    print(f"Measured in {time.perf_counter() - start_time:.1f} seconds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
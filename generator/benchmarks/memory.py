@@ -0,0 +1,114 @@
+"""
+Measure the memory used by the generator with tracemalloc, on a generated corpus using the fake `maya` package.
+Save the results with --save-baseline before a change and compare against them with --baseline after it
+
+Usage (from the generator directory):
+    python -m benchmarks.memory [--commands N] [--save-baseline PATH] [--baseline PATH]
+"""
+
+import tracemalloc
+import argparse
+import tempfile
+import json
+import sys
+import os
+
+from src import generator, maya_info, stub_writer
+from src.documentation import html_extractor
+from src.flags import GeneratorFlag
+
+from . import corpus
+from .pipeline import maya
+
+
+def measure_parsed_documentation(pages_dir: str, synopses: dict[str, str]) -> int:
+    """
+    Get the memory used to hold the parsed documentation & positional arguments of every command, in bytes
+    """
+    tracemalloc.start()
+    try:
+        parsed = []
+        for name, synopsis in synopses.items():
+            with open(os.path.join(pages_dir, f"{name}.html"), "rb") as f:
+                html = f.read()
+            parsed.append((html_extractor.parse_html(html), maya_info.cmds_info.parse_synopsis(name, synopsis)))
+            del html
+
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_commands(pages_dir: str, synopses: dict[str, str]) -> int:
+    """
+    Get the memory used to hold the stub objects of every command, in bytes
+    """
+    documentation = {}
+    for name, synopsis in synopses.items():
+        with open(os.path.join(pages_dir, f"{name}.html"), "rb") as f:
+            documentation[name] = (html_extractor.parse_html(f.read()), maya_info.cmds_info.parse_synopsis(name, synopsis))
+
+    tracemalloc.start()
+    try:
+        commands = [generator.create_command(name, docs, GeneratorFlag.NONE, args) for name, (docs, args) in documentation.items()]
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_pipeline(pages_dir: str) -> int:
+    """
+    Get the peak memory used while generating the stubs, in bytes. The stubs are discarded instead of kept in memory
+    """
+    tracemalloc.start()
+    try:
+        with open(os.devnull, "w") as f:
+            generator.generate_commands(
+                stub_writer.TextStubWriter(f),
+                GeneratorFlag.INCLUDE_UNDOCUMENTED_FUNCTIONS | GeneratorFlag.SINGLE_PASS_PARSER,
+                docs_source=pages_dir
+            )
+
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the memory used by the generator with tracemalloc")
+    parser.add_argument("--commands", type=int, default=1000, help="Number of commands in the generated corpus")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated corpus")
+    parser.add_argument("--save-baseline", default=None, help="Write the results to this path, to compare later runs against")
+    parser.add_argument("--baseline", default=None, help="Compare the results to a baseline written with --save-baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        synopses = corpus.generate_corpus(temp_dir, args.commands, args.seed)
+        maya.cmds._configure(synopses)
+
+        results = {
+            "parsed_documentation_bytes": measure_parsed_documentation(temp_dir, synopses),
+            "commands_bytes": measure_commands(temp_dir, synopses),
+            "pipeline_peak_bytes": measure_pipeline(temp_dir),
+        }
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    for name, value in results.items():
+        line = f"{name + ':':<30} {value / 2**20:8.2f} MiB"
+        if baseline.get(name):
+            line += f" ({(value - baseline[name]) / baseline[name]:+.1%} compared to the baseline)"
+        print(line)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=4)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Benchmark the documentation parsers & verify that the single pass extractor gives the same result as BeautifulSoup
+
+Usage (from the generator directory):
+    mayapy -m benchmarks.parse_html [PAGES_DIR] [--repeat N]
+
+PAGES_DIR should contain CommandsPython html pages, defaults to the pages in the `--cache` store
+"""
+
+import argparse
+import glob
+import time
+import sys
+import os
+
+from src.documentation import cache, command, html_extractor
+
+
+def load_cached_pages() -> dict[str, bytes]:
+    """
+    Load the documentation pages stored in the cache by `--cache`
+    """
+    pages: dict[str, bytes] = {}
+    for filename in cache.get_keys("pages"):
+        if (html := cache.read(filename)) is not None:
+            pages[filename] = html
+
+    return pages
+
+
+def load_pages(directory: str | None) -> dict[str, bytes]:
+    if directory is None:
+        return load_cached_pages()
+
+    pages: dict[str, bytes] = {}
+    for filepath in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        if os.path.basename(filepath).startswith("index"):
+            continue
+        with open(filepath, "rb") as f:
+            pages[filepath] = f.read()
+
+    return pages
+
+
+def check_equivalence(pages: dict[str, bytes]) -> list[str]:
+    """
+    Parse all pages with both parsers, returns the filepaths of the pages where the results differ
+    """
+    mismatches: list[str] = []
+    for filepath, html in pages.items():
+        try:
+            expected = command.parse_html(html)
+        except Exception as e:
+            expected = type(e)
+
+        try:
+            result = html_extractor.parse_html(html)
+        except Exception as e:
+            result = type(e)
+
+        if result != expected:
+            mismatches.append(filepath)
+
+    return mismatches
+
+
+def benchmark(parse_function, pages: dict[str, bytes], repeat: int) -> float:
+    """
+    Returns the number of pages parsed per second
+    """
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages.values():
+            try:
+                parse_function(html)
+            except ValueError:
+                pass
+
+    return len(pages) * repeat / (time.perf_counter() - start_time)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the command documentation parsers")
+    parser.add_argument("pages_dir", nargs="?", default=None, help=f"Directory containing the html pages (default: the pages cached in {cache.CACHE_DIR})")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of times to parse every page")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages_dir)
+    if not pages:
+        print(f"No html pages found in {args.pages_dir or cache.CACHE_DIR}")
+        return 1
+
+    mismatches = check_equivalence(pages)
+    for filepath in mismatches:
+        print(f"Mismatch: {filepath}")
+    print(f"{len(pages) - len(mismatches)}/{len(pages)} pages parsed identically")
+
+    bs4_rate = benchmark(command.parse_html, pages, args.repeat)
+    single_pass_rate = benchmark(html_extractor.parse_html, pages, args.repeat)
+
+    print(f"BeautifulSoup:      {bs4_rate:8.1f} pages/s")
+    print(f"Single pass parser: {single_pass_rate:8.1f} pages/s ({single_pass_rate / bs4_rate:.2f}x)")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
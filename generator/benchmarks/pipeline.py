@@ -0,0 +1,203 @@
+"""
+Benchmark the full `generate_string` pipeline on plain CPython, using a fake `maya` package
+and a generated (or recorded) corpus of CommandsPython pages. Fails if the results regressed compared to a baseline
+
+Usage (from the generator directory):
+    python -m benchmarks.pipeline [--commands N] [--pages-dir DIR] [--repeat N] [--help-latency MS] [--save-baseline PATH] [--baseline PATH]
+
+The pages are streamed from the download through parsing into the generate phase, so the download, positional args,
+manifest, parse, populate & render stages are measured per command and reported separately from the rest of the generate phase
+"""
+
+import argparse
+import tempfile
+import json
+import sys
+import os
+
+FAKE_MAYA_DIR = os.path.join(os.path.dirname(__file__), "fake_maya")
+
+# The fake maya package has to be found before any real Maya installation
+sys.path.insert(0, FAKE_MAYA_DIR)
+
+import maya.cmds  # noqa: E402
+
+from src import generator, profiling, documentation  # noqa: E402
+from src.flags import GeneratorFlag  # noqa: E402
+
+from . import corpus  # noqa: E402
+
+DEFAULT_SYNOPSIS = "[flags] [String...]"
+
+
+def get_peak_rss() -> int | None:
+    """
+    Get the peak resident set size of the process in bytes, None if it can't be determined on this platform
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+
+    return None
+
+
+def load_recorded_synopses(pages_dir: str) -> dict[str, str]:
+    """
+    Get the commands in the index page of recorded pages, all commands get the same synopsis
+    """
+    with documentation.source.DirectorySource(pages_dir) as docs_source:
+        html = docs_source.read(docs_source.get_url(documentation.source.INDEX_PAGE)).decode("utf-8")
+        commands = documentation.index.parse_index_html(html, docs_source)
+
+    return {name: f"Synopsis: {name} {DEFAULT_SYNOPSIS}" for name in commands}
+
+
+def run(pages_dir: str, flags: GeneratorFlag, processes: int) -> tuple[float, dict[str, float], int]:
+    """
+    Generate the stubs once, returns the total time, the time per stage & the number of commands
+    """
+    profiler = profiling.Profiler()
+    generator.generate_string(flags, docs_source=pages_dir, processes=processes, profiler=profiler)
+
+    stages: dict[str, float] = {}
+    for name, _, duration in profiler.phases:
+        stages[name] = stages.get(name, 0.0) + duration
+
+    command_stages: dict[str, float] = {}
+    for timings in profiler.command_timings.values():
+        for name, duration in timings.items():
+            command_stages[name] = command_stages.get(name, 0.0) + duration
+
+    stages["generate"] = stages.get("generate", 0.0) - sum(command_stages.values())
+    stages.update(command_stages)
+
+    return profiler.get_report()["total_seconds"], stages, profiler.counters["commands"]
+
+
+def benchmark(pages_dir: str, flags: GeneratorFlag, processes: int, repeat: int) -> dict:
+    """
+    Run the pipeline `repeat` times and return the results of the fastest run
+    """
+    best = None
+    for _ in range(repeat):
+        total_seconds, stages, command_count = run(pages_dir, flags, processes)
+        if best is None or total_seconds < best[0]:
+            best = (total_seconds, stages, command_count)
+
+    total_seconds, stages, command_count = best
+    return {
+        "commands": command_count,
+        "seconds": total_seconds,
+        "commands_per_second": command_count / total_seconds,
+        "peak_rss_bytes": get_peak_rss(),
+        "stages": stages,
+    }
+
+
+def find_regressions(results: dict, baseline: dict, max_slowdown: float, max_memory_growth: float) -> list[str]:
+    regressions: list[str] = []
+
+    min_rate = baseline["commands_per_second"] * (1 - max_slowdown / 100)
+    if results["commands_per_second"] < min_rate:
+        regressions.append(f"{results['commands_per_second']:.1f} commands/s is more than {max_slowdown}% slower than the baseline "
+                           f"{baseline['commands_per_second']:.1f} commands/s")
+
+    if results["peak_rss_bytes"] and baseline.get("peak_rss_bytes"):
+        max_rss = baseline["peak_rss_bytes"] * (1 + max_memory_growth / 100)
+        if results["peak_rss_bytes"] > max_rss:
+            regressions.append(f"Peak RSS of {results['peak_rss_bytes'] / 2**20:.1f} MiB is more than {max_memory_growth}% above the baseline "
+                               f"{baseline['peak_rss_bytes'] / 2**20:.1f} MiB")
+
+    return regressions
+
+
+def print_results(results: dict) -> None:
+    print(f"{results['commands']} commands in {results['seconds']:.3f} seconds, {results['commands_per_second']:.1f} commands/s")
+    if results["peak_rss_bytes"]:
+        print(f"Peak RSS: {results['peak_rss_bytes'] / 2**20:.1f} MiB")
+
+    for name, seconds in results["stages"].items():
+        print(f"  {name + ':':<18} {seconds * 1000:10.1f} ms ({seconds / results['seconds']:.1%})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the full stub generation pipeline without Maya")
+    parser.add_argument("--commands", type=int, default=1000, help="Number of commands in the generated corpus")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated corpus")
+    parser.add_argument("--pages-dir", default=None, help="Use recorded CommandsPython pages instead of a generated corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs, the fastest run is reported")
+    parser.add_argument("--processes", type=int, default=1, help="Number of processes used to parse the documentation")
+    parser.add_argument("--help-latency", type=float, default=0.0, help="Time each fake `maya.cmds.help` call takes, in milliseconds")
+    parser.add_argument("--single-pass-parser", action="store_true", help="Parse the documentation using the single pass extractor")
+    parser.add_argument("--save-baseline", default=None, help="Write the results to this path, to compare later runs against")
+    parser.add_argument("--baseline", default=None, help="Compare the results to a baseline written with --save-baseline")
+    parser.add_argument("--max-slowdown", type=float, default=10.0, help="Maximum allowed drop in commands/s compared to the baseline, in percent")
+    parser.add_argument("--max-memory-growth", type=float, default=10.0, help="Maximum allowed peak RSS growth compared to the baseline, in percent")
+    args = parser.parse_args()
+
+    flags = GeneratorFlag.INCLUDE_UNDOCUMENTED_FUNCTIONS
+    if args.single_pass_parser:
+        flags |= GeneratorFlag.SINGLE_PASS_PARSER
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.pages_dir:
+            pages_dir = args.pages_dir
+            synopses = load_recorded_synopses(pages_dir)
+        else:
+            pages_dir = temp_dir
+            synopses = corpus.generate_corpus(pages_dir, args.commands, args.seed)
+
+        maya.cmds._configure(synopses, help_latency=args.help_latency / 1000)
+        results = benchmark(pages_dir, flags, args.processes, args.repeat)
+
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+        regressions = find_regressions(results, baseline, args.max_slowdown, args.max_memory_growth)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
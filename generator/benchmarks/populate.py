@@ -0,0 +1,81 @@
+"""
+Benchmark populating the functions of commands with many flags, the time per flag should stay the same as the number of flags grows
+
+Usage (from the generator directory):
+    python -m benchmarks.populate [--flags N [N ...]] [--repeat N] [--pages-dir DIR --commands NAME [NAME ...]]
+
+Without `--pages-dir` the pages are generated, with `--pages-dir` recorded CommandsPython pages such as
+`polyOptions` & `modelEditor` are used instead
+"""
+
+import dataclasses
+import argparse
+import random
+import time
+import sys
+import os
+
+from src import base_types, populate_functions
+from src.documentation import command, html_extractor, source
+from src.flags import GeneratorFlag
+
+from . import corpus
+
+DEFAULT_FLAG_COUNTS = [25, 100, 400, 1600]
+
+
+def benchmark(command_name: str, docs: command.CommandDocumentation, repeat: int) -> float:
+    """
+    Returns the average time in seconds to populate the functions of the command
+    """
+    positional_args = [base_types.Argument("*args")]
+
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        populate_functions.get_functions_all(command_name, docs, positional_args, GeneratorFlag.NONE)
+
+    return (time.perf_counter() - start_time) / repeat
+
+
+def print_result(name: str, docs: command.CommandDocumentation, seconds: float) -> None:
+    print(f"{name + ':':<24} {len(docs.flags):6} flags {seconds * 1000:10.2f} ms {seconds / len(docs.flags) * 1e6:8.2f} us/flag")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark populating the functions of commands with many flags")
+    parser.add_argument("--flags", type=int, nargs="+", default=DEFAULT_FLAG_COUNTS, help="Number of flags of the generated commands")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated pages")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of times to populate each command")
+    parser.add_argument("--pages-dir", default=None, help="Directory with recorded CommandsPython pages")
+    parser.add_argument("--commands", nargs="+", default=["polyOptions", "modelEditor"], help="Commands to load from --pages-dir")
+    args = parser.parse_args()
+
+    if args.pages_dir:
+        for command_name in args.commands:
+            filepath = os.path.join(args.pages_dir, source.get_page_filename(command_name))
+            if not os.path.isfile(filepath):
+                print(f"No page for '{command_name}' found in {args.pages_dir}")
+                return 1
+
+            with open(filepath, "rb") as f:
+                docs = html_extractor.parse_html(f.read())
+
+            print_result(command_name, docs, benchmark(command_name, docs, args.repeat))
+
+        return 0
+
+    rng = random.Random(args.seed)
+    for flag_count in args.flags:
+        command_name = f"generatedCommand{flag_count}"
+        docs = html_extractor.parse_html(corpus.create_page(command_name, rng, flag_count))
+
+        # Make sure the query & edit functions are populated as well
+        docs = dataclasses.replace(docs, queryable=True, editable=True)
+
+        print_result(command_name, docs, benchmark(command_name, docs, args.repeat))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Benchmark rendering the stubs of the commands in a generated corpus, compared to rendering by string concatenation.
+Note that the arguments are rendered when they are created, so that time is not included for the renderer
+
+Usage (from the generator directory):
+    python -m benchmarks.render [--commands N] [--repeat N]
+"""
+
+import argparse
+import tempfile
+import time
+import sys
+import os
+
+from src import base_types, generator, maya_info
+from src.documentation import html_extractor
+from src.flags import GeneratorFlag
+
+from . import corpus
+
+
+def create_commands(count: int, seed: int) -> list[base_types.Command]:
+    commands: list[base_types.Command] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        synopses = corpus.generate_corpus(temp_dir, count, seed)
+        for name, synopsis in synopses.items():
+            with open(os.path.join(temp_dir, f"{name}.html"), "rb") as f:
+                docs = html_extractor.parse_html(f.read())
+
+            positional_args = maya_info.cmds_info.parse_synopsis(name, synopsis)
+            commands.append(generator.create_command(name, docs, GeneratorFlag.NONE, positional_args))
+
+    return commands
+
+
+def concatenate_argument(argument: base_types.Argument) -> str:
+    string = argument.name
+
+    if argument.argument_type:
+        string += f":{argument.argument_type}"
+
+    if argument.default is not None:
+        string += f"={argument.default}"
+
+    return string
+
+
+def concatenate_function(function: base_types.Function, docstring: str | None) -> str:
+    """
+    Render a function by string concatenation, without re-using the rendered arguments
+    """
+    string = ""
+    if function.deprecated:
+        string = f'@deprecated("""{function.deprecation_message}""")\n'
+
+    string += f"def {function.name}("
+
+    has_star_args = any(arg.name.startswith("*") for arg in function.positional_arguments)
+
+    if function.positional_arguments:
+        string += ",".join(concatenate_argument(arg) for arg in function.positional_arguments)
+        if not has_star_args:
+            string += ",/"
+        if function.keyword_arguments:
+            string += ","
+
+    if function.keyword_arguments:
+        keyword_args_str = ",".join(concatenate_argument(arg) for arg in function.keyword_arguments)
+        if not has_star_args:
+            keyword_args_str = f"*,{keyword_args_str}"
+        string += keyword_args_str
+
+    string += f")->{function.return_type or 'Any'}:"
+
+    if docstring and not function.deprecated:
+        string += f'\n\t"""{docstring}"""'
+    else:
+        string += '...'
+
+    return string
+
+
+def concatenate_command(command: base_types.Command) -> str:
+    overloading = len(command.functions) > 1
+
+    docstring = command.docstring if not overloading else None
+    outstring = "\n@overload\n".join(concatenate_function(func, docstring) for func in command.functions)
+
+    if overloading:
+        outstring = f"@overload\n{outstring}"
+        if command.docstring:
+            outstring += f'\ndef {command.name}(*args, **kwargs):\n\t"""{command.docstring}"""'
+
+    return outstring
+
+
+def benchmark(render_function, commands: list[base_types.Command], repeat: int) -> tuple[float, list[str]]:
+    """
+    Returns the number of functions rendered per second and the rendered commands
+    """
+    function_count = sum(len(command.functions) for command in commands)
+
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        results = [render_function(command) for command in commands]
+
+    return function_count * repeat / (time.perf_counter() - start_time), results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark rendering the stubs")
+    parser.add_argument("--commands", type=int, default=1000, help="Number of commands in the generated corpus")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated corpus")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of times to render every command")
+    args = parser.parse_args()
+
+    commands = create_commands(args.commands, args.seed)
+
+    concatenate_rate, expected = benchmark(concatenate_command, commands, args.repeat)
+    render_rate, results = benchmark(base_types.Command.get_string, commands, args.repeat)
+
+    print(f"{len(commands)} commands, {sum(len(command.functions) for command in commands)} functions")
+    print(f"Concatenation: {concatenate_rate:10.0f} functions/s")
+    print(f"Renderer:      {render_rate:10.0f} functions/s ({render_rate / concatenate_rate:.2f}x)")
+
+    if results != expected:
+        print("Rendered stubs differ from the concatenated stubs")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Check & measure revalidating the cached documentation against a local stand-in server with a generated corpus.
+The pages are cached, some of them are changed on the server, and the stubs are generated again with `REVALIDATE`.
+Fails if pages other than the changed ones are downloaded again, or if the stubs differ from an uncached run
+
+Usage (from the generator directory):
+    python -m benchmarks.revalidate [--commands N] [--changed N]
+"""
+
+import argparse
+import tempfile
+import random
+import time
+import sys
+import os
+
+from src import generator
+from src.documentation import cache, http_client
+from src.flags import GeneratorFlag
+
+from . import corpus, docs_server
+from .pipeline import maya
+
+FLAGS = GeneratorFlag.INCLUDE_UNDOCUMENTED_FUNCTIONS | GeneratorFlag.SINGLE_PASS_PARSER
+
+
+def run(flags: GeneratorFlag, docs_url: str) -> tuple[str, float, dict[str, int]]:
+    """
+    Generate the stubs, returns the stubs, the time in seconds & the requests, bytes & revalidated pages during the run
+    """
+    http_before = http_client.get_stats()
+    revalidated_before = cache.get_stats().get("revalidated", {"hits": 0, "misses": 0})
+
+    start_time = time.perf_counter()
+    stubs = generator.generate_string(flags, docs_source=docs_url)
+    seconds = time.perf_counter() - start_time
+
+    http_after = http_client.get_stats()
+    revalidated_after = cache.get_stats().get("revalidated", {"hits": 0, "misses": 0})
+
+    return stubs, seconds, {
+        "requests": http_after.requests - http_before.requests,
+        "bytes": http_after.bytes_received - http_before.bytes_received,
+        "not_modified": revalidated_after["hits"] - revalidated_before["hits"],
+        "modified": revalidated_after["misses"] - revalidated_before["misses"],
+    }
+
+
+def change_pages(pages_dir: str, names: list[str]) -> None:
+    for name in names:
+        filepath = os.path.join(pages_dir, f"{name}.html")
+        with open(filepath, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write(content.replace(f"The {name} command.", f"The updated {name} command.", 1))
+
+        # Make sure Last-Modified changes even if the file was written within the same second
+        modified_time = os.path.getmtime(filepath) + 10
+        os.utime(filepath, (modified_time, modified_time))
+
+
+def print_run(name: str, seconds: float, stats: dict[str, int]) -> None:
+    print(f"{name + ':':<22} {seconds * 1000:8.1f} ms, {stats['requests']:5} requests, {stats['bytes'] / 1024:8.1f} KiB, "
+          f"{stats['not_modified']} not modified, {stats['modified']} modified")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check & measure revalidating the cached documentation")
+    parser.add_argument("--commands", type=int, default=500, help="Number of commands in the generated corpus")
+    parser.add_argument("--changed", type=int, default=10, help="Number of pages changed on the server")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated corpus")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pages_dir = os.path.join(temp_dir, "pages")
+        synopses = corpus.generate_corpus(pages_dir, args.commands, args.seed)
+        maya.cmds._configure(synopses)
+
+        # Use an empty cache, so the first run downloads every page
+        cache.configure(directory=os.path.join(temp_dir, "cache"))
+
+        with docs_server.serve(pages_dir) as docs_url:
+            _, seconds, stats = run(FLAGS | GeneratorFlag.CACHE, docs_url)
+            print_run("Cold cache", seconds, stats)
+
+            changed_names = random.Random(args.seed).sample(sorted(synopses), min(args.changed, len(synopses)))
+            change_pages(pages_dir, changed_names)
+
+            cached_stubs, seconds, stats = run(FLAGS | GeneratorFlag.CACHE, docs_url)
+            print_run("Cached", seconds, stats)
+
+            revalidated_stubs, seconds, stats = run(FLAGS | GeneratorFlag.CACHE | GeneratorFlag.REVALIDATE, docs_url)
+            print_run("Revalidated", seconds, stats)
+
+            expected_stubs, _, _ = run(FLAGS, docs_url)
+
+    errors: list[str] = []
+    if stats["modified"] != len(changed_names):
+        errors.append(f"{stats['modified']} pages were downloaded again, expected only the {len(changed_names)} changed pages")
+    if revalidated_stubs != expected_stubs:
+        errors.append("The revalidated stubs differ from the stubs generated without the cache")
+    if changed_names and cached_stubs == expected_stubs:
+        errors.append("The changed pages had no effect on the stubs")
+
+    for error in errors:
+        print(error)
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
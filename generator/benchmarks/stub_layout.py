@@ -0,0 +1,130 @@
+"""
+Benchmark how long it takes to load the single file stubs compared to the stub package generated with `--package`
+
+Usage (from the generator directory):
+    python -m benchmarks.stub_layout STUB_FILE PACKAGE_DIR [--command NAME] [--repeat N] [--mypy]
+
+STUB_FILE is a generated cmds.pyi and PACKAGE_DIR a generated cmds package for the same Maya version
+"""
+
+import subprocess
+import importlib.util
+import argparse
+import tempfile
+import shutil
+import time
+import glob
+import ast
+import sys
+import os
+
+
+def get_command_modules(package_dir: str, command_name: str) -> list[str]:
+    """
+    Get the filepaths of the modules a type checker has to load to resolve `cmds.<command_name>`,
+    which is the `__init__.pyi` and the modules it imports the command from. Star imports require the module to be loaded
+    """
+    init_filepath = os.path.join(package_dir, "__init__.pyi")
+    with open(init_filepath, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    filepaths = [init_filepath]
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.level == 1 and node.module:
+            if any(alias.name in ("*", command_name) for alias in node.names):
+                filepaths.append(os.path.join(package_dir, f"{node.module}.pyi"))
+
+    return filepaths
+
+
+def read_files(filepaths: list[str]) -> list[str]:
+    contents: list[str] = []
+    for filepath in filepaths:
+        with open(filepath, "r", encoding="utf-8") as f:
+            contents.append(f.read())
+
+    return contents
+
+
+def benchmark_parse(contents: list[str], repeat: int) -> float:
+    """
+    Returns the average time in milliseconds to `ast.parse` all of the given file contents
+    """
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for content in contents:
+            ast.parse(content)
+
+    return (time.perf_counter() - start_time) / repeat * 1000
+
+
+def benchmark_mypy(stubs_path: str, command_name: str) -> float:
+    """
+    Returns the time in seconds for mypy to check a script calling a single command, using the given stubs as `maya.cmds`
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        maya_dir = os.path.join(temp_dir, "stubs", "maya")
+        os.makedirs(maya_dir)
+        open(os.path.join(maya_dir, "__init__.pyi"), "w").close()
+
+        if os.path.isdir(stubs_path):
+            shutil.copytree(stubs_path, os.path.join(maya_dir, "cmds"))
+        else:
+            shutil.copy(stubs_path, os.path.join(maya_dir, "cmds.pyi"))
+
+        script_filepath = os.path.join(temp_dir, "script.py")
+        with open(script_filepath, "w") as f:
+            f.write(f"import maya.cmds as cmds\ncmds.{command_name}()\n")
+
+        env = {**os.environ, "MYPYPATH": os.path.join(temp_dir, "stubs")}
+        start_time = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "mypy", "--no-incremental", "--cache-dir", os.path.join(temp_dir, ".mypy_cache"), script_filepath],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=False
+        )
+        return time.perf_counter() - start_time
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark loading the single file stubs compared to the stub package")
+    parser.add_argument("stub_file", help="Generated cmds.pyi")
+    parser.add_argument("package_dir", help="Generated cmds package directory")
+    parser.add_argument("--command", default="ls", help="Command used when only the module it is defined in is loaded")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of times to parse the files")
+    parser.add_argument("--mypy", action="store_true", help="Also measure the time for mypy to check a script using the stubs")
+    args = parser.parse_args()
+
+    if not os.path.isfile(os.path.join(args.package_dir, "__init__.pyi")):
+        print(f"No stub package found in {args.package_dir}")
+        return 1
+
+    command_modules = get_command_modules(args.package_dir, args.command)
+    if len(command_modules) == 1:
+        print(f"'{args.command}' is not exported by {args.package_dir}")
+        return 1
+
+    layouts = {
+        "Single file": read_files([args.stub_file]),
+        "Package, all modules": read_files(sorted(glob.glob(os.path.join(args.package_dir, "*.pyi")))),
+        f"Package, {args.command} ({len(command_modules)} modules)": read_files(command_modules),
+    }
+
+    for name, contents in layouts.items():
+        size = sum(len(x) for x in contents)
+        print(f"{name + ':':<28} {benchmark_parse(contents, args.repeat):8.1f} ms ast.parse, {size / 1024:8.1f} KiB")
+
+    if args.mypy:
+        if not importlib.util.find_spec("mypy"):
+            print("mypy is not installed")
+            return 1
+
+        print(f"{'mypy, single file:':<28} {benchmark_mypy(args.stub_file, args.command):8.2f} s")
+        print(f"{'mypy, package:':<28} {benchmark_mypy(args.package_dir, args.command):8.2f} s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark of the type string conversion over all flags & return values in a corpus of documentation pages
+
+Usage (from the generator directory):
+    python -m benchmarks.type_conversion [PAGES_DIR] [--repeat N]
+
+PAGES_DIR should contain CommandsPython html pages, defaults to the pages in the `--cache` store
+"""
+
+import argparse
+import time
+import sys
+
+from src import populate_functions, type_conversion
+from src.documentation import cache, html_extractor
+
+from .parse_html import load_pages
+
+
+def get_conversions(pages: dict[str, bytes]) -> list[tuple[str, bool, bool]]:
+    """
+    Get the (type string, return type, sequence as tuple) conversions done when generating the stubs for the pages
+    """
+    conversions: list[tuple[str, bool, bool]] = []
+    for html in pages.values():
+        try:
+            docs = html_extractor.parse_html(html)
+        except ValueError:
+            continue
+
+        for flag in docs.flags:
+            if flag.arg_type:
+                conversions.append((flag.arg_type, False, False))
+                conversions.append((flag.arg_type, True, True))
+
+        for return_value in docs.returns:
+            conversions.append((return_value.type, True, True))
+
+    return conversions
+
+
+def benchmark(converter: type_conversion.TypeConverter, conversions: list[tuple[str, bool, bool]], repeat: int) -> tuple[float, list[str]]:
+    """
+    Returns the number of conversions per second and the converted types
+    """
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        results = [converter.convert(x, return_type=return_type, sequence_as_tuple=as_tuple) for x, return_type, as_tuple in conversions]
+
+    return len(conversions) * repeat / (time.perf_counter() - start_time), results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the type string conversion")
+    parser.add_argument("pages_dir", nargs="?", default=None, help=f"Directory containing the html pages (default: the pages cached in {cache.CACHE_DIR})")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of times to convert every type string")
+    args = parser.parse_args()
+
+    conversions = get_conversions(load_pages(args.pages_dir))
+    if not conversions:
+        print(f"No flags found in the html pages in {args.pages_dir or cache.CACHE_DIR}")
+        return 1
+
+    tables = (populate_functions.TYPE_CONVERSION, populate_functions.TYPE_CONVERSION_RETURNS)
+    uncached_converter = type_conversion.TypeConverter(*tables, cache_size=0)
+    cached_converter = type_conversion.TypeConverter(*tables)
+
+    uncached_rate, expected = benchmark(uncached_converter, conversions, args.repeat)
+    cached_rate, results = benchmark(cached_converter, conversions, args.repeat)
+
+    cache_info = cached_converter.get_cache_info()
+    print(f"{len(conversions)} conversions of {len(set(conversions))} distinct type strings")
+    print(f"Uncached: {uncached_rate:10.0f} conversions/s")
+    print(f"Cached:   {cached_rate:10.0f} conversions/s ({cached_rate / uncached_rate:.2f}x), "
+          f"{cache_info.hits / (cache_info.hits + cache_info.misses):.1%} hit rate")
+
+    if results != expected:
+        print("Cached conversion results differ from the uncached results")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,68 @@
+import contextlib
 import argparse
+import cProfile
+import logging
+import sys
 import os
 
-from . import generator
+from . import generator, maya_info
+from .documentation import cache
 from .flags import GeneratorFlag
 
+SIZE_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Generate stubs for the `maya.cmds` module. This module must run in the mayapy interpreter.")
 
-    parser.add_argument("output", type=str, help="Output file path for the generated stubs.")
+def parse_size(size_str: str) -> int:
+    """
+    Parse a size in bytes with an optional unit, e.g. '500M' or '2G'
+    """
+    size_str = size_str.strip().upper().removesuffix("B")
+    unit = size_str[-1:] if size_str[-1:] in SIZE_UNITS else ""
+    try:
+        size = int(float(size_str.removesuffix(unit)) * SIZE_UNITS[unit])
+    except (ValueError, OverflowError):
+        raise argparse.ArgumentTypeError(f"Invalid size '{size_str}', expected e.g. '500M' or '2G'")
+
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid size '{size_str}', the size must be larger than 0")
+
+    return size
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+    return f"{size:.1f} GiB"
+
+
+def add_cache_dir_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help=f"Directory of the cache, defaults to the ${cache.ENV_CACHE_DIR} environment variable or the user cache directory (currently: {cache.CACHE_DIR})"
+    )
+
+
+def export_snapshot(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="export-snapshot",
+        description="Export a snapshot of the information queried from Maya, allowing the stubs to be generated without Maya. This must run in the mayapy interpreter."
+    )
+    parser.add_argument("output", type=str, help="Output file path for the snapshot, compressed with gzip if it ends with '.gz'.")
+
+    args = parser.parse_args(argv)
+
+    maya_info.snapshot.export(os.path.abspath(args.output))
+
+
+def add_generation_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments shared between generating the stubs for a single & multiple Maya versions
+    """
     parser.add_argument(
         "--undocumented",
         action="store_true",
@@ -19,25 +73,233 @@ def main() -> None:
         action="store_true",
         help="Cache downloaded documentation to disk"
     )
+    add_cache_dir_argument(parser)
+    parser.add_argument(
+        "--cache-compression",
+        choices=cache.COMPRESSIONS,
+        default=None,
+        help="Compress the new cache entries with gzip or lzma (default: none)"
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=parse_size,
+        default=None,
+        help="Maximum size of the cache, e.g. '500M' or '2G'. The least recently used entries are evicted after each run"
+    )
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        help="Check if the cached documentation pages changed with conditional requests and only download the pages that did, implies --cache"
+    )
     parser.add_argument(
         "--tuple-params",
         action="store_true",
         help="Use tuple parameters for functions, will otherwise use Sequence which is less strict"
     )
+    parser.add_argument(
+        "--single-pass-parser",
+        action="store_true",
+        help="Parse the documentation using the faster single pass extractor instead of BeautifulSoup"
+    )
+    parser.add_argument(
+        "--compact-overloads",
+        action="store_true",
+        help="Merge overloads that only differ by the flag they query and remove duplicate overloads, to shrink the stubs"
+    )
+    parser.add_argument(
+        "--package",
+        action="store_true",
+        help="Generate a stub package with one module per first letter instead of a single file, the output should then be the package directory"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-generate the commands whose inputs changed since the last run"
+    )
+    parser.add_argument(
+        "--docs-source",
+        type=str,
+        default=None,
+        help="Read the documentation from a local directory or zip archive containing the CommandsPython html pages instead of downloading it, "
+             "or download it from another server with a http(s) url to the CommandsPython folder"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=generator.DEFAULT_JOBS,
+        help=f"Number of worker threads used to download the documentation (default: {generator.DEFAULT_JOBS})"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Number of processes used to parse the documentation, 0 uses one process per CPU core (default: 1)"
+    )
+    parser.add_argument(
+        "--profile-report",
+        type=str,
+        default=None,
+        help="Write a JSON report of the time spent in each phase, the slowest commands and cache & network counters to this path"
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=str,
+        default=None,
+        help="Profile the generation with cProfile and dump the pstats to this path"
+    )
 
-    args = parser.parse_args()
-
-    output_path = os.path.abspath(args.output)
 
+def get_flags(args: argparse.Namespace) -> GeneratorFlag:
     flags = GeneratorFlag.NONE
     if args.undocumented:
         flags |= GeneratorFlag.INCLUDE_UNDOCUMENTED_FUNCTIONS
     if args.cache:
         flags |= GeneratorFlag.CACHE
+    if args.revalidate:
+        flags |= GeneratorFlag.CACHE | GeneratorFlag.REVALIDATE
     if args.tuple_params:
         flags |= GeneratorFlag.TUPLE_PARAMS
+    if args.single_pass_parser:
+        flags |= GeneratorFlag.SINGLE_PASS_PARSER
+    if args.incremental:
+        flags |= GeneratorFlag.INCREMENTAL
+    if args.package:
+        flags |= GeneratorFlag.PACKAGE
+    if args.compact_overloads:
+        flags |= GeneratorFlag.COMPACT_OVERLOADS
+
+    return flags
+
+
+def configure_cache(args: argparse.Namespace) -> None:
+    cache.configure(directory=args.cache_dir, compression=args.cache_compression, max_size=args.cache_max_size)
+
+
+def get_processes(args: argparse.Namespace) -> int:
+    return args.processes if args.processes > 0 else (os.cpu_count() or 1)
+
+
+@contextlib.contextmanager
+def cprofile(filepath: str | None):
+    """
+    Profile the code in the context with cProfile and dump the stats to `filepath`, does nothing if `filepath` is None
+    """
+    if not filepath:
+        yield
+        return
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(filepath)
+
+
+def generate_all(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="generate-all",
+        description="Generate the stubs for multiple Maya versions in a single run, from snapshots created with 'export-snapshot'. "
+                    "Documentation pages that are identical between the versions are only parsed once."
+    )
+    parser.add_argument("snapshots", type=str, nargs="+", help="Snapshot file paths, one per Maya version.")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=os.path.join("generated-stubs", "{VERSION}", "cmds.pyi"),
+        help="Output file path for the generated stubs, '{VERSION}' is replaced by the Maya version. '{VERSION}' may also be used in --docs-source & --profile-report (default: generated-stubs/{VERSION}/cmds.pyi)"
+    )
+    add_generation_arguments(parser)
+
+    args = parser.parse_args(argv)
+    configure_cache(args)
+
+    with cprofile(args.cprofile):
+        generator.generate_stubs_all(
+            [os.path.abspath(x) for x in args.snapshots],
+            os.path.abspath(args.output),
+            flags=get_flags(args),
+            jobs=args.jobs,
+            processes=get_processes(args),
+            docs_source=args.docs_source,
+            profile_report=args.profile_report
+        )
+
+
+def cache_command(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="cache", description="Inspect & prune the on-disk cache.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    stats_parser = subparsers.add_parser("stats", help="Show the number of entries & their size per Maya version & category")
+    add_cache_dir_argument(stats_parser)
+
+    prune_parser = subparsers.add_parser(
+        "prune",
+        help="Remove entries from the cache, all entries are removed if no options are given"
+    )
+    add_cache_dir_argument(prune_parser)
+    prune_parser.add_argument("--max-size", type=parse_size, default=None, help="Evict the least recently used entries until the cache is at most this size, e.g. '500M'")
+    prune_parser.add_argument("--version", type=str, default=None, help="Remove the entries for this Maya version")
+    prune_parser.add_argument("--category", type=str, default=None, help="Remove the entries in this category, e.g. 'pages' or 'parsed'")
+    prune_parser.add_argument("--older-than", type=float, default=None, help="Remove the entries that haven't been used in this many days")
+
+    args = parser.parse_args(argv)
+    cache.configure(directory=args.cache_dir)
+
+    if args.command == "stats":
+        summary = cache.get_summary()
+        print(f"Cache directory: {cache.CACHE_DIR}")
+        for entry in summary:
+            print(f"  {entry.scope or 'shared':<10} {entry.category:<12} {entry.entries:8} entries {format_size(entry.size):>12}")
+        print(f"Total: {sum(x.entries for x in summary)} entries, {format_size(sum(x.size for x in summary))}")
+
+    elif args.command == "prune":
+        older_than = args.older_than * 24 * 60 * 60 if args.older_than is not None else None
+        count, size = cache.prune(max_size=args.max_size, scope=args.version, category=args.category, older_than=older_than)
+        print(f"Removed {count} entries, {format_size(size)}")
+
+
+def main() -> None:
+    # The generator reports its summaries (compaction, cache & HTTP stats) through logging
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if sys.argv[1:2] == ["export-snapshot"]:
+        export_snapshot(sys.argv[2:])
+        return
+
+    if sys.argv[1:2] == ["generate-all"]:
+        generate_all(sys.argv[2:])
+        return
+
+    if sys.argv[1:2] == ["cache"]:
+        cache_command(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="Generate stubs for the `maya.cmds` module. This module must run in the mayapy interpreter, unless a snapshot is used.")
+
+    parser.add_argument("output", type=str, help="Output file path for the generated stubs.")
+    parser.add_argument(
+        "--snapshot",
+        type=str,
+        default=None,
+        help="Generate from a snapshot created with 'export-snapshot' instead of querying Maya, does not require mayapy"
+    )
+    add_generation_arguments(parser)
+
+    args = parser.parse_args()
+    configure_cache(args)
 
-    generator.generate_stubs(output_path, flags=flags)
+    with cprofile(args.cprofile):
+        generator.generate_stubs(
+            os.path.abspath(args.output),
+            flags=get_flags(args),
+            jobs=args.jobs,
+            processes=get_processes(args),
+            docs_source=args.docs_source,
+            snapshot=args.snapshot,
+            profile_report=args.profile_report
+        )
 
 
 if __name__ == "__main__":
@@ -1,25 +1,25 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Argument:
     name: str
     argument_type: str | None = None
     default: str | None = None
 
-    def get_string(self) -> str:
-        string = self.name
-
-        if self.argument_type:
-            string += f":{self.argument_type}"
+    string: str = field(init=False, repr=False, compare=False)
+    """ The rendered argument, rendered once since the same argument objects are shared between many overloads """
 
-        if self.default is not None:
-            string += f"={self.default}"
+    def __post_init__(self):
+        type_str = f":{self.argument_type}" if self.argument_type else ""
+        default_str = f"={self.default}" if self.default is not None else ""
+        object.__setattr__(self, "string", f"{self.name}{type_str}{default_str}")
 
-        return string
+    def get_string(self) -> str:
+        return self.string
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Function:
     name: str
     positional_arguments: list[Argument]
@@ -30,58 +30,62 @@ class Function:
     deprecation_message: str | None = None
 
     def get_string(self, docstring: str | None = None) -> str:
-        string = ""
+        sink: list[str] = []
+        self.write(sink, docstring)
+        return "".join(sink)
+
+    def write(self, sink: list[str], docstring: str | None = None) -> None:
+        """
+        Append the fragments of the function definition to `sink`
+        """
         if self.deprecated:
-            string = f'@deprecated("""{self.deprecation_message}""")\n'
-
-        string += f"def {self.name}("
+            sink.append(f'@deprecated("""{self.deprecation_message}""")\n')
 
         has_star_args = any(arg.name.startswith("*") for arg in self.positional_arguments)
 
+        # Joined with commas, e.g. ['a:int', '/', '*', 'b:bool=...'] -> 'a:int,/,*,b:bool=...'
+        parameters: list[str] = []
         if self.positional_arguments:
-            string += ",".join(arg.get_string() for arg in self.positional_arguments)
+            parameters.append(",".join([arg.string for arg in self.positional_arguments]))
             if not has_star_args:
-                string += ",/"
-            if self.keyword_arguments:
-                string += ","
+                parameters.append("/")
 
         if self.keyword_arguments:
-            keyword_args_str = ",".join(arg.get_string() for arg in self.keyword_arguments)
             if not has_star_args:
-                keyword_args_str = f"*,{keyword_args_str}"
-            string += keyword_args_str
+                parameters.append("*")
+            parameters.append(",".join([arg.string for arg in self.keyword_arguments]))
 
-        string += ")"
-
-        return_type = self.return_type or "Any"
-        string += f"->{return_type}"
-
-        string += ":"
+        sink.append(f"def {self.name}({','.join(parameters)})->{self.return_type or 'Any'}:")
 
         if docstring and not self.deprecated:
-            string += f'\n\t"""{docstring}"""'
+            sink.append(f'\n\t"""{docstring}"""')
         else:
-            string += '...'
+            sink.append('...')
 
-        return string
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Command:
     name: str
     docstring: str
     functions: list[Function]
 
     def get_string(self) -> str:
+        sink: list[str] = []
+        self.write(sink)
+        return "".join(sink)
+
+    def write(self, sink: list[str]) -> None:
+        """
+        Append the fragments of all function definitions to `sink`
+        """
         overloading = len(self.functions) > 1
-
         docstring = self.docstring if not overloading else None
-        outstring = "\n@overload\n".join(func.get_string(docstring) for func in self.functions)
-
-        if overloading:
-            outstring = f"@overload\n{outstring}"
 
-            # Add a final function definition without overload decorator, that has the docstring
-            if self.docstring:
-                outstring += f'\ndef {self.name}(*args, **kwargs):\n\t"""{self.docstring}"""'
+        for i, func in enumerate(self.functions):
+            if overloading:
+                sink.append("\n@overload\n" if i else "@overload\n")
+            func.write(sink, docstring)
 
-        return outstring
+        # Add a final function definition without overload decorator, that has the docstring
+        if overloading and self.docstring:
+            sink.append(f'\ndef {self.name}(*args, **kwargs):\n\t"""{self.docstring}"""')
@@ -0,0 +1,154 @@
+"""
+Build manifest for incremental generation.
+Records a hash of the inputs of every command together with the rendered stub, so commands whose inputs
+haven't changed since the last run can re-use the rendered stub instead of being generated again.
+"""
+
+import functools
+import hashlib
+import typing
+import json
+import os
+
+from dataclasses import dataclass, field
+
+from . import populate_functions
+from .documentation import cache
+from .flags import GeneratorFlag
+
+MANIFEST_FORMAT_VERSION = 1
+
+# Flags that do not affect the generated stubs
+NON_OUTPUT_FLAGS = GeneratorFlag.CACHE | GeneratorFlag.INCREMENTAL | GeneratorFlag.PACKAGE | GeneratorFlag.REVALIDATE
+
+
+@functools.cache
+def get_code_hash() -> str:
+    """
+    Hash of the generator source code, any code change invalidates all commands
+    """
+    content_hash = hashlib.sha256()
+    src_dir = os.path.dirname(__file__)
+    for root, dirs, files in os.walk(src_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.endswith(".py"):
+                with open(os.path.join(root, filename), "rb") as f:
+                    content_hash.update(filename.encode())
+                    content_hash.update(f.read())
+
+    return content_hash.hexdigest()
+
+
+def get_resource_entries(command_name: str) -> dict[str, typing.Any]:
+    """
+    Get the entries in the resource files that are used when generating the given command
+    """
+    return {
+        "create_return_types": populate_functions.CREATE_FLAG_RETURN_TYPES.get(command_name),
+        "create_return_types_split": populate_functions.CREATE_FLAG_RETURN_TYPES_SPLIT.get(command_name),
+        "support_flags": populate_functions.SUPPORT_FLAGS.get(command_name),
+        "query_return_types": populate_functions.QUERY_FLAG_RETURN_TYPES.get(command_name),
+    }
+
+
+@functools.cache
+def get_global_inputs(flags: GeneratorFlag) -> bytes:
+    """
+    Inputs shared by all commands, they're the same for every command in a run so they're only serialized once
+    """
+    return json.dumps([
+        get_code_hash(),
+        flags.value,
+        populate_functions.TYPE_CONVERSION,
+        populate_functions.TYPE_CONVERSION_RETURNS,
+    ], sort_keys=True).encode("utf-8")
+
+
+def hash_inputs(command_name: str,
+                html: str | bytes | None,
+                positional_args: typing.Sequence[typing.Any],
+                flags: GeneratorFlag) -> str:
+    """
+    Hash all inputs used to generate the stub for a command
+    """
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+
+    command_inputs = json.dumps([
+        command_name,
+        [list(x) for x in positional_args],
+        get_resource_entries(command_name),
+    ], sort_keys=True)
+
+    content_hash = hashlib.sha256()
+    content_hash.update(get_global_inputs(flags & ~NON_OUTPUT_FLAGS))
+    content_hash.update(command_inputs.encode("utf-8"))
+    content_hash.update(html or b"")
+
+    return content_hash.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    input_hash: str
+    text: str
+
+
+@dataclass
+class Manifest:
+    entries: dict[str, ManifestEntry] = field(default_factory=dict)
+    version: str = ""
+    """ The Maya version the stubs were generated for, the manifest is cached in the scope of this version """
+
+    def get_text(self, command_name: str, input_hash: str) -> str | None:
+        """
+        Get the rendered stub of the command, if its inputs haven't changed since it was recorded
+        """
+        entry = self.entries.get(command_name)
+        if entry and entry.input_hash == input_hash:
+            return entry.text
+
+        return None
+
+    def set_text(self, command_name: str, input_hash: str, text: str) -> None:
+        self.entries[command_name] = ManifestEntry(input_hash, text)
+
+    def retain(self, command_names: typing.Iterable[str]) -> None:
+        """
+        Remove all commands not in `command_names`, e.g. commands that no longer exist
+        """
+        command_names = set(command_names)
+        self.entries = {k: v for k, v in self.entries.items() if k in command_names}
+
+
+def get_manifest_filename(out_filepath: str) -> str:
+    path_hash = hashlib.md5(os.path.abspath(out_filepath).encode()).hexdigest()
+    return os.path.join("manifests", f"{path_hash}.json")
+
+
+def load(out_filepath: str) -> Manifest:
+    """
+    Load the manifest for the given output file, returns an empty manifest if there is none
+    """
+    data = cache.read(get_manifest_filename(out_filepath))
+    if not data:
+        return Manifest()
+
+    try:
+        content = json.loads(data)
+    except ValueError:
+        return Manifest()
+
+    if content.get("format_version") != MANIFEST_FORMAT_VERSION:
+        return Manifest()
+
+    return Manifest({name: ManifestEntry(**entry) for name, entry in content["commands"].items()})
+
+
+def save(out_filepath: str, manifest: Manifest) -> None:
+    content = {
+        "format_version": MANIFEST_FORMAT_VERSION,
+        "commands": {name: {"input_hash": entry.input_hash, "text": entry.text} for name, entry in manifest.entries.items()},
+    }
+    cache.write(get_manifest_filename(out_filepath), json.dumps(content).encode("utf-8"), scope=manifest.version)
@@ -0,0 +1,135 @@
+"""
+Overload compaction, shrinks the generated stubs by merging overloads that only differ by the flag they query
+and removing duplicate overloads
+"""
+
+from dataclasses import dataclass, replace
+
+from . import base_types
+
+# Mode flags are never merged into a key, the overloads are told apart by them
+MODE_ARGUMENTS = ("query", "edit")
+
+
+@dataclass
+class CompactionStats:
+    overloads_before: int = 0
+    overloads_after: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+    def add(self, before: base_types.Command, after: base_types.Command) -> None:
+        self.overloads_before += len(before.functions)
+        self.overloads_after += len(after.functions)
+        self.bytes_before += len(before.get_string().encode("utf-8"))
+        self.bytes_after += len(after.get_string().encode("utf-8"))
+
+
+def is_key_argument(argument: base_types.Argument) -> bool:
+    """
+    Check if the argument is a required `Literal[True]` flag, e.g. the queried flag in `cmds.xform(query=True, translation=True)`
+    """
+    return argument.argument_type == "Literal[True]" and argument.default is None and argument.name not in MODE_ARGUMENTS
+
+
+def get_signature(arguments: list[base_types.Argument]) -> tuple[str, ...]:
+    return tuple(arg.get_string() for arg in arguments)
+
+
+def get_key_index(function: base_types.Function) -> int | None:
+    """
+    Get the index of the keyword argument the overload is selected by, None if it doesn't have exactly one
+    """
+    key_indices = [i for i, arg in enumerate(function.keyword_arguments) if is_key_argument(arg)]
+    if len(key_indices) != 1 or function.deprecated:
+        return None
+
+    return key_indices[0]
+
+
+def remove_duplicates(functions: list[base_types.Function]) -> list[base_types.Function]:
+    """
+    Remove overloads with the exact same signature as a previous overload, they can never be selected
+    """
+    unique_functions: dict[str, base_types.Function] = {}
+    for function in functions:
+        unique_functions.setdefault(function.get_string(), function)
+
+    return list(unique_functions.values())
+
+
+def merge_keys(functions: list[base_types.Function]) -> list[base_types.Function]:
+    """
+    Merge overloads with the same return type that only differ by their key argument into one overload,
+    where all of the keys are optional.
+
+    This is only done when it is sound:
+    - A call without any of the keys must be matched by a previous overload with the remaining arguments,
+      so making the keys optional doesn't change what such a call resolves to
+    - Moving an overload up to the merged overload must not skip past another overload accepting its key
+    """
+    groups: dict[tuple, list[int]] = {}
+    for i, function in enumerate(functions):
+        key_index = get_key_index(function)
+        if key_index is None:
+            continue
+
+        remaining_arguments = function.keyword_arguments[:key_index] + function.keyword_arguments[key_index + 1:]
+        group_key = (
+            get_signature(function.positional_arguments),
+            get_signature(remaining_arguments),
+            key_index,
+            function.return_type,
+        )
+        groups.setdefault(group_key, []).append(i)
+
+    merged_functions: dict[int, base_types.Function] = {}
+    removed_indices: set[int] = set()
+    for (positional_signature, remaining_signature, key_index, _), indices in groups.items():
+        if len(indices) < 2:
+            continue
+
+        first_index = indices[0]
+        has_fallback = any(
+            get_signature(function.positional_arguments) == positional_signature and
+            get_signature(function.keyword_arguments) == remaining_signature
+            for function in functions[:first_index]
+        )
+        if not has_fallback:
+            continue
+
+        group_indices = set(indices)
+        keys = [functions[i].keyword_arguments[key_index].name for i in indices]
+        skips_overload = any(
+            key in (arg.name for arg in functions[j].keyword_arguments)
+            for i, key in zip(indices, keys)
+            for j in range(first_index + 1, i)
+            if j not in group_indices
+        )
+        if skips_overload:
+            continue
+
+        first_function = functions[first_index]
+        key_arguments = [base_types.Argument(key, "Literal[True]", "...") for key in keys]
+        merged_functions[first_index] = replace(
+            first_function,
+            keyword_arguments=[
+                *first_function.keyword_arguments[:key_index],
+                *key_arguments,
+                *first_function.keyword_arguments[key_index + 1:]
+            ]
+        )
+        removed_indices.update(indices[1:])
+
+    return [merged_functions.get(i, function) for i, function in enumerate(functions) if i not in removed_indices]
+
+
+def compact_functions(functions: list[base_types.Function]) -> list[base_types.Function]:
+    return merge_keys(remove_duplicates(functions))
+
+
+def compact_command(command: base_types.Command) -> base_types.Command:
+    """
+    Get a copy of the command with its overloads compacted
+    """
+    return replace(command, functions=compact_functions(command.functions))
@@ -1 +1 @@
-from . import index, command
\ No newline at end of file
+from . import http_client, source, index, command, html_extractor
\ No newline at end of file
@@ -0,0 +1,367 @@
+"""
+On-disk cache for downloaded & parsed documentation, the synopses queried from Maya & the build manifests.
+
+Each entry is stored as a file in the cache directory and tracked in a SQLite index, which records the scope
+(Maya version) the entry belongs to, its category, size & when it was last used, so the cache can be listed
+and pruned down to a maximum size by evicting the least recently used entries.
+Entries may be compressed with gzip or lzma, the compression is stored per entry so it can be changed at any time
+"""
+
+import contextlib
+import threading
+import sqlite3
+import hashlib
+import typing
+import gzip
+import lzma
+import zlib
+import time
+import sys
+import os
+
+ENV_CACHE_DIR = "CMDS_STUB_GENERATOR_CACHE_DIR"
+INDEX_FILENAME = "index.sqlite"
+INDEX_FORMAT_VERSION = 1
+
+COMPRESSIONS = ("none", "gzip", "lzma")
+COMPRESSION_EXTENSIONS = {"none": "", "gzip": ".gz", "lzma": ".xz"}
+
+
+def get_default_cache_dir() -> str:
+    """
+    Get the cache directory from the environment variable, otherwise the user cache directory of the platform
+    """
+    if directory := os.environ.get(ENV_CACHE_DIR):
+        return directory
+
+    if sys.platform == "win32":
+        base_dir = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+    elif sys.platform == "darwin":
+        base_dir = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+
+    return os.path.join(base_dir, "cmds_stub_generator")
+
+
+CACHE_DIR = get_default_cache_dir()
+
+COMPRESSION = "none"
+""" Compression used for new entries, one of `COMPRESSIONS` """
+MAX_SIZE: int | None = None
+""" Maximum size of the cache in bytes, enforced by `enforce_max_size` """
+
+_local = threading.local()
+
+_stats_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = {}
+
+_access_times_lock = threading.Lock()
+_access_times: dict[str, dict[str, float]] = {}
+""" When the entries were last read per cache directory, written to the index in one transaction by `flush_access_times` """
+
+
+class CategorySummary(typing.NamedTuple):
+    scope: str
+    category: str
+    entries: int
+    size: int
+
+
+def configure(directory: str | None = None, compression: str | None = None, max_size: int | None = None) -> None:
+    """
+    Set the cache directory, the compression used for new entries & the maximum size of the cache.
+    Options that are None are left unchanged
+    """
+    global CACHE_DIR, COMPRESSION, MAX_SIZE
+    if directory is not None:
+        CACHE_DIR = os.path.abspath(directory)
+
+    if compression is not None:
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression '{compression}', expected one of {', '.join(COMPRESSIONS)}")
+        COMPRESSION = compression
+
+    if max_size is not None:
+        MAX_SIZE = max_size
+
+
+def get_category(filename: str) -> str:
+    """
+    Get the category of a cached file, which is the sub directory it's stored in, e.g. 'parsed' or 'index'
+    """
+    parts = os.path.normpath(filename).split(os.sep)
+    return parts[0] if len(parts) > 1 else "pages"
+
+
+def record_lookup(category: str, hit: bool) -> None:
+    with _stats_lock:
+        category_stats = _stats.setdefault(category, {"hits": 0, "misses": 0})
+        category_stats["hits" if hit else "misses"] += 1
+
+
+def get_stats() -> dict[str, dict[str, int]]:
+    """
+    Get the number of cache hits & misses per category, in this process
+    """
+    with _stats_lock:
+        return {category: dict(category_stats) for category, category_stats in _stats.items()}
+
+
+@contextlib.contextmanager
+def transaction(connection: sqlite3.Connection) -> typing.Generator[sqlite3.Connection, None, None]:
+    """
+    Run the statements in the context in a single transaction, the index is locked for writing by other processes until it ends
+    """
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Get the connection to the index of the current cache directory, each thread & process has its own connection
+    """
+    key = (os.getpid(), CACHE_DIR)
+    connection: sqlite3.Connection | None = getattr(_local, "connection", None)
+    if connection is not None and _local.key == key:
+        return connection
+
+    if connection is not None and _local.key[0] == os.getpid():
+        connection.close()
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    connection = sqlite3.connect(os.path.join(CACHE_DIR, INDEX_FILENAME), timeout=60, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+    if connection.execute("PRAGMA user_version").fetchone()[0] != INDEX_FORMAT_VERSION:
+        with transaction(connection):
+            # Another process may have created the index while waiting for the lock
+            if connection.execute("PRAGMA user_version").fetchone()[0] != INDEX_FORMAT_VERSION:
+                create_index(connection)
+
+    _local.connection = connection
+    _local.key = key
+    return connection
+
+
+def create_index(connection: sqlite3.Connection) -> None:
+    connection.execute("DROP TABLE IF EXISTS entries")
+    connection.execute("""
+        CREATE TABLE entries (
+            key TEXT PRIMARY KEY,
+            scope TEXT NOT NULL,
+            category TEXT NOT NULL,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            compression TEXT NOT NULL,
+            last_access REAL NOT NULL
+        )
+    """)
+    connection.execute("CREATE INDEX entries_last_access ON entries (last_access)")
+    connection.execute(f"PRAGMA user_version={INDEX_FORMAT_VERSION}")
+
+
+def get_data_path(filename: str, entry_compression: str) -> str:
+    """
+    Get the path of the file storing the entry, relative to the cache directory
+    """
+    key_hash = hashlib.sha256(filename.encode("utf-8")).hexdigest()
+    return os.path.join("data", key_hash[:2], key_hash + COMPRESSION_EXTENSIONS[entry_compression])
+
+
+def read(filename: str) -> bytes | None:
+    """
+    Read a file from the cache, returns None if it hasn't been cached
+    """
+    connection = get_connection()
+    row = connection.execute("SELECT path, compression FROM entries WHERE key = ?", (filename,)).fetchone()
+
+    data = None
+    if row is not None:
+        path, entry_compression = row
+        try:
+            with open(os.path.join(CACHE_DIR, path), "rb") as f:
+                data = f.read()
+
+            if entry_compression == "gzip":
+                data = gzip.decompress(data)
+            elif entry_compression == "lzma":
+                data = lzma.decompress(data)
+        except FileNotFoundError:
+            data = None
+            connection.execute("DELETE FROM entries WHERE key = ? AND path = ?", (filename, path))
+        except (OSError, EOFError, zlib.error, lzma.LZMAError):
+            # Corrupt or truncated compressed data is removed & treated as a miss, so it's fetched or parsed again
+            data = None
+            connection.execute("DELETE FROM entries WHERE key = ? AND path = ?", (filename, path))
+            remove_data_file(path)
+        else:
+            with _access_times_lock:
+                _access_times.setdefault(CACHE_DIR, {})[filename] = time.time()
+
+    record_lookup(get_category(filename), hit=data is not None)
+    return data
+
+
+def write(filename: str, data: bytes, scope: str = "") -> None:
+    """
+    Write a file to the cache, the file is written to a temporary file first
+    so other threads/processes will never read a partially written file.
+    `scope` is the Maya version the entry belongs to, or an empty string if it's shared between versions
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    entry_compression = COMPRESSION
+    if entry_compression == "gzip":
+        data = gzip.compress(data, compresslevel=6)
+    elif entry_compression == "lzma":
+        data = lzma.compress(data)
+
+    path = get_data_path(filename, entry_compression)
+    filepath = os.path.join(CACHE_DIR, path)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    temp_filepath = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_filepath, "wb") as f:
+        f.write(data)
+    os.replace(temp_filepath, filepath)
+
+    connection = get_connection()
+    with transaction(connection):
+        row = connection.execute("SELECT path FROM entries WHERE key = ?", (filename,)).fetchone()
+        connection.execute(
+            "INSERT OR REPLACE INTO entries (key, scope, category, path, size, compression, last_access) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (filename, scope, get_category(filename), path, len(data), entry_compression, time.time())
+        )
+
+    # The entry was previously stored with another compression
+    if row is not None and row[0] != path:
+        remove_data_file(row[0])
+
+
+def flush_access_times() -> None:
+    """
+    Write when the entries read since the last flush were used to the index, reading an entry doesn't write to the index
+    so the reads don't contend for the write lock. Called before the least recently used entries are evicted
+    """
+    with _access_times_lock:
+        access_times = _access_times.pop(CACHE_DIR, {})
+
+    if access_times:
+        connection = get_connection()
+        with transaction(connection):
+            connection.executemany(
+                "UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?",
+                [(last_access, filename) for filename, last_access in access_times.items()]
+            )
+
+
+def remove(filename: str) -> None:
+    """
+    Remove a file from the cache, if it has been cached
+    """
+    connection = get_connection()
+    with transaction(connection):
+        row = connection.execute("SELECT path FROM entries WHERE key = ?", (filename,)).fetchone()
+        connection.execute("DELETE FROM entries WHERE key = ?", (filename,))
+
+    if row is not None:
+        remove_data_file(row[0])
+
+
+def remove_data_file(path: str) -> None:
+    try:
+        os.remove(os.path.join(CACHE_DIR, path))
+    except FileNotFoundError:
+        pass
+
+
+def get_keys(category: str | None = None) -> list[str]:
+    """
+    Get the filenames of the cached entries, optionally only those in the given category
+    """
+    if category is None:
+        rows = get_connection().execute("SELECT key FROM entries ORDER BY key").fetchall()
+    else:
+        rows = get_connection().execute("SELECT key FROM entries WHERE category = ? ORDER BY key", (category,)).fetchall()
+    return [row[0] for row in rows]
+
+
+def get_summary() -> list[CategorySummary]:
+    """
+    Get the number of entries & their size per scope & category
+    """
+    rows = get_connection().execute(
+        "SELECT scope, category, COUNT(*), SUM(size) FROM entries GROUP BY scope, category ORDER BY scope, category"
+    ).fetchall()
+    return [CategorySummary(*row) for row in rows]
+
+
+def prune(*,
+          max_size: int | None = None,
+          scope: str | None = None,
+          category: str | None = None,
+          older_than: float | None = None) -> tuple[int, int]:
+    """
+    Remove entries from the cache, returns the number of entries & bytes removed.
+    Entries matching `scope`, `category` & not used in the last `older_than` seconds are removed, if none of them are given
+    and no `max_size` is given all entries are removed. Afterwards the least recently used entries are removed until
+    the cache is at most `max_size` bytes
+    """
+    flush_access_times()
+    connection = get_connection()
+
+    conditions: list[str] = []
+    parameters: list[typing.Any] = []
+    if scope is not None:
+        conditions.append("scope = ?")
+        parameters.append(scope)
+    if category is not None:
+        conditions.append("category = ?")
+        parameters.append(category)
+    if older_than is not None:
+        conditions.append("last_access < ?")
+        parameters.append(time.time() - older_than)
+
+    removed: list[tuple[str, str, int]] = []
+    with transaction(connection):
+        if conditions or max_size is None:
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            removed.extend(connection.execute(f"SELECT key, path, size FROM entries {where}", parameters).fetchall())
+
+        if max_size is not None:
+            removed_keys = {key for key, _, _ in removed}
+            total_size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            total_size -= sum(size for _, _, size in removed)
+            for key, path, size in connection.execute("SELECT key, path, size FROM entries ORDER BY last_access").fetchall():
+                if total_size <= max_size:
+                    break
+                if key not in removed_keys:
+                    removed.append((key, path, size))
+                    total_size -= size
+
+        connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _, _ in removed])
+
+    for _, path, _ in removed:
+        remove_data_file(path)
+
+    return len(removed), sum(size for _, _, size in removed)
+
+
+def enforce_max_size() -> tuple[int, int]:
+    """
+    Evict the least recently used entries if the cache is larger than the configured `MAX_SIZE`,
+    called once at the end of a run so it also writes the access times of the entries read during the run
+    """
+    if MAX_SIZE is None:
+        flush_access_times()
+        return 0, 0
+
+    return prune(max_size=MAX_SIZE)
@@ -2,15 +2,28 @@
 Parse command documentation
 """
 
-import urllib.request
-import tempfile
+import concurrent.futures
+import collections
+import dataclasses
 import hashlib
 import typing
-import bs4
+import json
+import sys
 import os
 
-from dataclasses import dataclass
-from bs4 import BeautifulSoup
+from dataclasses import dataclass, field
+
+from . import http_client, cache
+from .source import DocumentationSource, OnlineSource
+
+PARSER_VERSION = 1
+""" Bump this whenever the output of `parse_html` changes, invalidates the parsed documentation cache """
+
+FETCH_AHEAD = 4
+""" Number of pages per worker thread `iter_html` fetches ahead of the page that's being used """
+
+PARSE_AHEAD = 4
+""" Number of pages per worker process `iter_parse_html` parses ahead of the page that's being used """
 
 
 class ReturnValue(typing.NamedTuple):
@@ -18,7 +31,7 @@ class ReturnValue(typing.NamedTuple):
     description: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Flag:
     name_long: str
     name_short: str
@@ -30,11 +43,22 @@ class Flag:
     create: bool
     multi_use: bool
 
+    def __post_init__(self):
+        # The same flag names & types occur in many commands, interning them lets all flags share a single string
+        object.__setattr__(self, "name_long", sys.intern(self.name_long))
+        object.__setattr__(self, "name_short", sys.intern(self.name_short))
+        if self.arg_type is not None:
+            object.__setattr__(self, "arg_type", sys.intern(self.arg_type))
+
+    def __reduce__(self):
+        # Re-created through __init__ when sent between processes, so the strings are interned in the receiving process
+        return (Flag, tuple(getattr(self, field.name) for field in dataclasses.fields(self)))
+
     def is_query_only(self) -> bool:
         return self.query and not self.edit and not self.create
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CommandDocumentation:
     undoable: bool
     queryable: bool
@@ -49,261 +73,278 @@ class CommandDocumentation:
     obsolete: bool = False
     obsolete_message: str | None = None
 
-    def get_query_flags(self) -> list[Flag]:
-        return [flag for flag in self.flags if flag.query]
+    flags_by_name: dict[str, Flag] = field(init=False, repr=False, compare=False)
+    """ The flags by their long name, computed from `flags` """
+    query_flags: tuple[Flag, ...] = field(init=False, repr=False, compare=False)
+    create_flags: tuple[Flag, ...] = field(init=False, repr=False, compare=False)
+    edit_flags: tuple[Flag, ...] = field(init=False, repr=False, compare=False)
 
-    def get_create_flags(self) -> list[Flag]:
-        return [flag for flag in self.flags if flag.create]
+    def __post_init__(self):
+        object.__setattr__(self, "returns", [ReturnValue(sys.intern(x.type), x.description) for x in self.returns])
 
-    def get_edit_flags(self) -> list[Flag]:
-        return [flag for flag in self.flags if flag.edit]
+        # Index the flags once, the functions of a command look them up by name & mode many times
+        flags_by_name: dict[str, Flag] = {}
+        for flag in self.flags:
+            flags_by_name.setdefault(flag.name_long, flag)
+        object.__setattr__(self, "flags_by_name", flags_by_name)
+        object.__setattr__(self, "query_flags", tuple(flag for flag in self.flags if flag.query))
+        object.__setattr__(self, "create_flags", tuple(flag for flag in self.flags if flag.create))
+        object.__setattr__(self, "edit_flags", tuple(flag for flag in self.flags if flag.edit))
 
+    def __reduce__(self):
+        return (CommandDocumentation, tuple(getattr(self, field.name) for field in dataclasses.fields(self) if field.init))
 
-def get_html(url: str, use_cache: bool = False) -> str:  # TODO: Flip use_cache to false, this is only for initial development
-    cache_path: None | str = None
-    if use_cache:
-        cache_path = os.path.join(tempfile.gettempdir(), "cmds_stub_generator_cache", hashlib.md5(url.encode()).hexdigest() + ".html")
-        if os.path.exists(cache_path):
-            with open(cache_path, "r", encoding="utf-8") as f:
-                return f.read()
+    def get_query_flags(self) -> tuple[Flag, ...]:
+        return self.query_flags
+
+    def get_create_flags(self) -> tuple[Flag, ...]:
+        return self.create_flags
+
+    def get_edit_flags(self) -> tuple[Flag, ...]:
+        return self.edit_flags
 
-    with urllib.request.urlopen(url) as response:
-        text = response.read()
+    def get_flag(self, name_long: str) -> Flag | None:
+        return self.flags_by_name.get(name_long)
 
-        if cache_path:
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            with open(cache_path, "wb") as f:
-                f.write(text)
+    def to_dict(self) -> dict[str, typing.Any]:
+        # Only the fields passed to __init__, the indexes are re-built when loaded
+        data = {field.name: getattr(self, field.name) for field in dataclasses.fields(self) if field.init}
+        data["flags"] = [dataclasses.asdict(flag) for flag in self.flags]
+        return data
 
-        return text
+    @classmethod
+    def from_dict(cls, data: dict[str, typing.Any]) -> "CommandDocumentation":
+        return cls(**{
+            **data,
+            "returns": [ReturnValue(*x) for x in data["returns"]],
+            "flags": tuple(Flag(**x) for x in data["flags"]),
+        })
 
 
-def get_command_description(soup: BeautifulSoup) -> str:
+def decode_html(html: str | bytes) -> str:
     """
+    Decode a page as UTF-8, the few pages that aren't valid UTF-8 are windows-1252
     """
-    body = soup.find("body")
-    if isinstance(body, bs4.Tag):
-        return_header = body.find("a", {"name": "hReturn"})
-        synopsis_tag = soup.find("p", id="synopsis")
-        return_header_parent = return_header.find_parent() if isinstance(return_header, bs4.Tag) else None
-        if not return_header_parent:
-            return ""
-
-        synopsis_found = False
-        return_string = ""
-        num_found_tags = 0
-        for child in body.children:
-            if child == return_header_parent:
-                break
-
-            if child == synopsis_tag:
-                synopsis_found = True
-                continue
-
-            if not synopsis_found:
-                continue
-
-            if isinstance(child, bs4.element.Tag):
-                num_found_tags += 1
-                if num_found_tags == 1:
-                    continue
-                text = child.get_text(separator=" ", strip=True)
-                if child.name == "i":
-                    if text.startswith("*") or text.endswith("*"):
-                        text = f"<i>{text}</i>"
-                    else:
-                        text = f"*{text}*"
-                elif child.name == "b":
-                    if text.startswith("*") or text.endswith("*"):
-                        text = f"<b>{text}</b>"
-                    else:
-                        text = f"**{text}**"
-                elif child.name == "p":
-                    text = f"{text}\n"
-                elif child.name == "br":
-                    text = "\n"
-                return_string += " " + text
-            elif isinstance(child, str) and child.strip():
-                return_string += " " + child.replace("\n", " ").strip()
-        
-        return_string = return_string.replace("\n ", "\n")
-        return_string = return_string.replace(" \n", "\n")
-
-        return return_string.strip()
-
-    return ""
-
-
-def get_return_values(soup: BeautifulSoup) -> list[ReturnValue]:
-    return_a = soup.find("a", {"name": "hReturn"})
-    if isinstance(return_a, bs4.Tag):
-        return_h2 = return_a.find_parent()
-        if not isinstance(return_h2, bs4.Tag):
-            raise ValueError("Could not find return header")
-
-        return_table = return_h2.find_next_sibling()
-        # This table has 2 columns, type and description
-        if not isinstance(return_table, bs4.Tag):
-            raise ValueError("Could not find return value")
-
-        # Either a table or single paragraph
-        if return_table.name == "p":
-            return [ReturnValue(return_table.get_text(strip=True), "")]
-        elif return_table.name == "table":
-            return_values: list[ReturnValue] = []
-            for tr in return_table.find_all("tr"):
-                if not isinstance(tr, bs4.Tag):
-                    raise ValueError(f"Expected a Tag element got {type(tr)}")
-
-                tds = tr.find_all("td", recursive=False)
-                if len(tds) != 2:
-                    continue
-
-                type_td, desc_td = tds
-                type_text = type_td.get_text("", strip=True)
-                desc_text = desc_td.get_text(strip=True)
-                return_values.append(ReturnValue(type_text, desc_text))
-
-            return return_values
-        else:
-            raise ValueError(f"Expected a paragraph or table, got {return_table.name}")
+    if isinstance(html, str):
+        return html
 
-    return []
+    try:
+        return html.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return html.decode("windows-1252", errors="replace")
 
 
-def get_undoable_queryable_editable(soup: BeautifulSoup) -> tuple[bool, bool, bool]:
-    synopsis_tag = soup.find("p", id="synopsis")
+def get_html(url: str,
+             use_cache: bool = False,
+             source: DocumentationSource | None = None,
+             revalidate: bool = False) -> str:  # TODO: Flip use_cache to false, this is only for initial development
+    """
+    Get the HTML of a documentation page. With `revalidate` a cached page is only used if the server
+    responds that it hasn't changed, based on the ETag & Last-Modified validators stored with the page
+    """
+    if source is not None and not source.remote:
+        # Local pages are already on disk, so there's no need to cache them
+        return decode_html(source.read(url))
 
-    # Check if command is undoable, queryable & editable
-    undoable_queryable_editable_doc = ""  # '<p>aaf2fcp is <b>NOT undoable</b>, <b>NOT queryable</b>, and <b>NOT editable</b>.</p>'
-    if isinstance(synopsis_tag, bs4.Tag):
-        if next_sibling := synopsis_tag.find_next_sibling():
-            undoable_queryable_editable_doc = str(next_sibling.get_text(separator=" ", strip=True))
+    cache_filename = hashlib.md5(url.encode()).hexdigest() + ".html"
+    validators_filename = os.path.join("validators", cache_filename.replace(".html", ".json"))
+
+    cached_text = None
+    if use_cache:
+        if (cached_data := cache.read(cache_filename)) is not None:
+            cached_text = decode_html(cached_data)
 
-    undoable = "NOT undoable" not in undoable_queryable_editable_doc
-    queryable = "NOT queryable" not in undoable_queryable_editable_doc
-    editable = "NOT editable" not in undoable_queryable_editable_doc
+            if not revalidate:
+                return cached_text
 
-    return undoable, queryable, editable
+    headers: dict[str, str] = {}
+    if cached_text is not None:
+        headers = get_conditional_headers(cache.read(validators_filename))
+
+    if isinstance(source, OnlineSource):
+        response = source.request(url, headers)
+    else:
+        response = http_client.get(url, headers)
+
+    if cached_text is not None:
+        # Hits are pages that haven't changed since they were cached
+        not_modified = response.status == 304
+        cache.record_lookup("revalidated", hit=not_modified)
+        if not_modified:
+            return cached_text
+
+    if use_cache:
+        # Pages are cached per Maya version, so they can be pruned when a version is no longer needed
+        scope = source.cache_scope if source is not None else ""
+        cache.write(cache_filename, response.body, scope=scope)
 
+        validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        if any(validators.values()):
+            cache.write(validators_filename, json.dumps(validators).encode("utf-8"), scope=scope)
+        else:
+            # The validators of a previous response no longer match the cached page
+            cache.remove(validators_filename)
 
-def extract_flags(soup: BeautifulSoup) -> typing.Generator[Flag, None, None]:
-    for tr_flag in soup.find_all("tr", bgcolor="#EEEEEE"):
-        if not isinstance(tr_flag, bs4.Tag):
-            raise ValueError(f"Expected a Tag element got {type(tr_flag)}")
+    return decode_html(response.body)
 
-        children = tr_flag.find_all("td", recursive=False)
-        if not len(children) == 3:
-            raise ValueError(f"Expected 3 children elements but got {len(children)}\n{tr_flag}")
 
-        td_name, td_type, td_property = children
+def get_conditional_headers(validators_data: bytes | None) -> dict[str, str]:
+    """
+    Get the headers for a conditional request from the stored validators of a page
+    """
+    try:
+        validators = json.loads(validators_data) if validators_data else {}
+    except ValueError:
+        return {}  # Corrupt cache entry, download the page again
+
+    headers: dict[str, str] = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    return headers
+
+
+def iter_html(urls: typing.Iterable[str],
+              *,
+              use_cache: bool = False,
+              jobs: int = 1,
+              source: DocumentationSource | None = None,
+              revalidate: bool = False) -> typing.Iterator[tuple[str, str]]:
+    """
+    Fetch the HTML of multiple documentation pages using a pool of `jobs` worker threads.
+    Yields each url & its HTML in the order of `urls`, at most `jobs * FETCH_AHEAD` pages are fetched ahead
+    of the page that was last yielded so the pages don't all have to be kept in memory.
+    Closing the iterator stops fetching, only the pages that are being fetched are finished
+    """
+    def fetch(url: str) -> str:
+        return get_html(url, use_cache=use_cache, source=source, revalidate=revalidate)
+
+    if jobs <= 1:
+        for url in urls:
+            yield url, fetch(url)
+        return
+
+    pending: collections.deque[tuple[str, concurrent.futures.Future[str]]] = collections.deque()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+    try:
+        for url in urls:
+            pending.append((url, executor.submit(fetch, url)))
+            if len(pending) >= jobs * FETCH_AHEAD:
+                url, future = pending.popleft()
+                yield url, future.result()
+
+        while pending:
+            url, future = pending.popleft()
+            yield url, future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
 
-        if not isinstance(td_name, bs4.Tag) or not isinstance(td_property, bs4.Tag):
-            raise TypeError(f"Expected a Tag, got {type(td_name)}")
 
-        # Name
-        b_name_long, b_name_short = td_name.find_all("b", recursive=True)
-        name_long = b_name_long.get_text(strip=True)
-        name_short = b_name_short.get_text(strip=True)
+def parse_html(html: str) -> CommandDocumentation:
+    """
+    Parse the documentation page using BeautifulSoup, which is only imported on first use since it's slow to import
+    """
+    from . import soup_parser
+    return soup_parser.parse_html(html)
 
-        # Argument Types
-        arg_type = td_type.get_text(strip=True)
-        if not arg_type:
-            arg_type = None
 
-        # Properties
-        create = td_property.find("img", alt="create") is not None
-        query = td_property.find("img", alt="query") is not None
-        edit = td_property.find("img", alt="edit") is not None
-        multi_use = td_property.find("img", alt="multiuse") is not None
+def get_content_hash(html: str | bytes) -> str:
+    html_bytes = html.encode("utf-8") if isinstance(html, str) else html
+    return hashlib.sha256(html_bytes).hexdigest()
 
-        # Description
-        description = ""
-        if tr_flag.next_sibling is not None:
-            if tr_desc := tr_flag.next_sibling.next_sibling:
-                description = tr_desc.get_text(strip=True)
 
-        yield Flag(
-            name_long,
-            name_short,
-            arg_type,
-            description,
-            query,
-            edit,
-            create,
-            multi_use
-        )
+def get_parsed_cache_filename(html: str | bytes, parse_function: typing.Callable[[str], CommandDocumentation]) -> str:
+    """
+    The parsed documentation is cached keyed by the content of the html & the parser version
+    """
+    html_bytes = html.encode("utf-8") if isinstance(html, str) else html
+    parser_stamp = f"{PARSER_VERSION}:{parse_function.__module__}:"
+    content_hash = hashlib.sha256(parser_stamp.encode() + html_bytes).hexdigest()
+    return os.path.join("parsed", f"{content_hash}.json")
 
 
-def extract_examples(soup: BeautifulSoup) -> str | None:
-    a_example_header = soup.find("a", {"name": "hExamples"})
-    if a_example_header:
-        pre_examples = a_example_header.find_next("pre")
-        if pre_examples:
-            return pre_examples.get_text(strip=True)
+def read_parsed_cache(cache_filename: str) -> CommandDocumentation | None:
+    if cached_data := cache.read(cache_filename):
+        try:
+            return CommandDocumentation.from_dict(json.loads(cached_data))
+        except (ValueError, TypeError, KeyError):
+            pass  # Corrupt or outdated cache entry, parse it again
 
     return None
 
 
-def is_obsolete(soup: BeautifulSoup) -> bool:
-    """ 
-    Check if the command is obsolete 
+def write_parsed_cache(cache_filename: str, doc_info: CommandDocumentation) -> None:
+    # Not scoped to a Maya version, the entries are keyed by the content of the page so identical pages
+    # of different versions share an entry
+    cache.write(cache_filename, json.dumps(doc_info.to_dict()).encode("utf-8"))
+
+
+def parse_html_cached(html: str,
+                      use_cache: bool,
+                      parse_function: typing.Callable[[str], CommandDocumentation] = parse_html) -> CommandDocumentation:
     """
-    # Look in the header for the word Obsolete
-    h1_tag = soup.find("h1")
-    return h1_tag is not None and "Obsolete" in h1_tag.get_text()
+    Parse the html, the parsed documentation is cached on disk keyed by the content of the html & the parser version
+    """
+    if not use_cache:
+        return parse_function(html)
+
+    cache_filename = get_parsed_cache_filename(html, parse_function)
+    if doc_info := read_parsed_cache(cache_filename):
+        return doc_info
 
+    doc_info = parse_function(html)
+    write_parsed_cache(cache_filename, doc_info)
 
-def get_obsolete_message(soup: BeautifulSoup) -> str:
+    return doc_info
+
+
+def iter_parse_html(html_pages: typing.Iterable[str],
+                    *,
+                    use_cache: bool = False,
+                    parse_function: typing.Callable[[str], CommandDocumentation] = parse_html,
+                    processes: int = 1) -> typing.Iterator[CommandDocumentation]:
     """
-    Get the obsolete message for the command
+    Lazily parse documentation pages using a pool of `processes` worker processes.
+    The results are yielded in the same order as `html_pages`, at most `processes * PARSE_AHEAD` pages are parsed ahead
+    of the page that was last yielded so the parsed documentation doesn't all have to be kept in memory
     """
-    # The obsolete message text is placed directly in the body tag
-    body = soup.find("body")
-    if isinstance(body, bs4.Tag):
-        texts: list[str] = []
-        for child in body.children:
-            # Skip banner and toolbar
-            if isinstance(child, bs4.element.Tag):
-                if child.get("id") == "banner":
-                    continue
-                element_class = child.get("class") or []
-                if "toolbar" in element_class:
-                    continue
-
-            if isinstance(child, bs4.element.Tag):
-                texts.append(child.get_text(separator=" ", strip=True))
-            elif isinstance(child, str) and child.strip():
-                texts.append(child.strip())
-
-        full_text = " ".join(texts).strip()
-        if full_text:
-            return full_text
-
-    return "This command is obsolete."
+    if processes <= 1:
+        for html in html_pages:
+            yield parse_html_cached(html, use_cache, parse_function)
+        return
 
+    # Only this process uses the cache, the worker processes only parse the pages that aren't cached
+    pending: collections.deque[tuple[str | None, CommandDocumentation | concurrent.futures.Future]] = collections.deque()
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=processes)
+    try:
+        for html in html_pages:
+            cache_filename = get_parsed_cache_filename(html, parse_function) if use_cache else None
+            if cache_filename and (doc_info := read_parsed_cache(cache_filename)):
+                pending.append((None, doc_info))
+            else:
+                pending.append((cache_filename, executor.submit(parse_function, html)))
 
-def parse_html(html: str) -> CommandDocumentation:
-    soup = BeautifulSoup(html, "html.parser")
+            if len(pending) >= processes * PARSE_AHEAD:
+                yield get_parse_result(*pending.popleft())
+
+        while pending:
+            yield get_parse_result(*pending.popleft())
+    finally:
+        executor.shutdown(cancel_futures=True)
 
-    obsolete = is_obsolete(soup)
-    obsolete_message = get_obsolete_message(soup) if obsolete else None
 
-    undoable, queryable, editable = get_undoable_queryable_editable(soup)
+def get_parse_result(cache_filename: str | None, result: CommandDocumentation | concurrent.futures.Future) -> CommandDocumentation:
+    if not isinstance(result, concurrent.futures.Future):
+        return result
 
-    return CommandDocumentation(
-        undoable=undoable,
-        queryable=queryable,
-        editable=editable,
-        description=get_command_description(soup),
-        returns=get_return_values(soup),
-        flags=tuple(extract_flags(soup)),
-        examples=extract_examples(soup),
-        obsolete=obsolete,
-        obsolete_message=obsolete_message,
-    )
+    doc_info = result.result()
+    if cache_filename:
+        write_parsed_cache(cache_filename, doc_info)
+    return doc_info
 
 
 def get_info(url: str, use_cache: bool) -> CommandDocumentation:
     html = get_html(url, use_cache=use_cache)
-    return parse_html(html)
+    return parse_html_cached(html, use_cache=use_cache)
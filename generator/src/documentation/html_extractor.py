@@ -0,0 +1,515 @@
+"""
+Single pass extractor for the command documentation pages, an alternative to `command.parse_html`
+
+The page is tokenized once by `html.parser`, and its events are used to build a minimal tree that is structured
+exactly like the tree BeautifulSoup's "html.parser" builder would create. While building it, the elements that
+`command.parse_html` searches for are recorded, so the documentation is read from those elements without searching
+the document again. The tree itself is still needed, as the text of an element depends on all of its descendants.
+"""
+
+import html.entities
+import html.parser
+import typing
+
+from .command import CommandDocumentation, Flag, ReturnValue, decode_html
+
+ROOT_TAG_NAME = "[document]"
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+# Matches the defaults of BeautifulSoup's HTMLTreeBuilder
+EMPTY_ELEMENT_TAGS = {
+    "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image", "img",
+    "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source", "spacer", "track", "wbr"
+}
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+STRING_CONTAINER_TAGS = {"rt", "rp", "style", "script", "template"}
+
+ENTITY_TO_CHARACTER = {name.removesuffix(";"): character for name, character in html.entities.html5.items() if name.endswith(";")}
+
+# String kinds that are never part of the text content, e.g. comments
+KIND_COMMENT = "#comment"
+KIND_DECLARATION = "#declaration"
+KIND_DOCTYPE = "#doctype"
+KIND_PROCESSING_INSTRUCTION = "#pi"
+
+
+class _String:
+    __slots__ = ("text", "kind")
+
+    def __init__(self, text: str, kind: str | None):
+        self.text = text
+        self.kind = kind
+        """ None for regular text, the tag name for strings inside string container tags (e.g. script) """
+
+
+class _Element:
+    __slots__ = ("name", "attrs", "parent", "children", "index")
+
+    def __init__(self, name: str, attrs: dict[str, str], parent: "_Element | None"):
+        self.name = name
+        self.attrs = attrs
+        self.parent = parent
+        self.children: list[_Element | _String] = []
+        self.index = 0
+        """ Position in the children of the parent, nodes are only ever appended so it never changes """
+
+        if parent is not None:
+            self.index = len(parent.children)
+            parent.children.append(self)
+
+    def next_sibling(self, offset: int = 1) -> "_Element | _String | None":
+        """ Get the node `offset` steps after this element, including strings """
+        if self.parent is None:
+            return None
+
+        siblings = self.parent.children
+        index = self.index + offset
+        return siblings[index] if index < len(siblings) else None
+
+    def next_element_sibling(self) -> "_Element | None":
+        if self.parent is None:
+            return None
+
+        siblings = self.parent.children
+        for i in range(self.index + 1, len(siblings)):
+            sibling = siblings[i]
+            if isinstance(sibling, _Element):
+                return sibling
+
+        return None
+
+    def has_ancestor(self, element: "_Element") -> bool:
+        parent = self.parent
+        while parent is not None:
+            if parent is element:
+                return True
+            parent = parent.parent
+        return False
+
+    def iter_elements(self, name: str) -> typing.Generator["_Element", None, None]:
+        """ Iterate over all descendant elements with the given name, in document order """
+        for child in self.children:
+            if isinstance(child, _Element):
+                if child.name == name:
+                    yield child
+                yield from child.iter_elements(name)
+
+    def find(self, name: str, **attrs: str) -> "_Element | None":
+        for element in self.iter_elements(name):
+            if all(element.attrs.get(key) == value for key, value in attrs.items()):
+                return element
+        return None
+
+    def find_children(self, name: str) -> list["_Element"]:
+        return [x for x in self.children if isinstance(x, _Element) and x.name == name]
+
+    def iter_strings(self, kind: str | None) -> typing.Generator[str, None, None]:
+        for child in self.children:
+            if isinstance(child, _String):
+                if child.kind == kind:
+                    yield child.text
+            else:
+                yield from child.iter_strings(kind)
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        kind = self.name if self.name in STRING_CONTAINER_TAGS else None
+        if strip:
+            return separator.join(x for x in (x.strip() for x in self.iter_strings(kind)) if x)
+        return separator.join(self.iter_strings(kind))
+
+    def decompose(self) -> None:
+        """ Break the parent <-> children reference cycles, so the tree is freed without waiting for the gc """
+        elements = [self]
+        while elements:
+            element = elements.pop()
+            elements.extend(x for x in element.children if isinstance(x, _Element))
+            element.children = []
+            element.parent = None
+
+
+def _get_text(node: _Element | _String, separator: str = "", strip: bool = False) -> str:
+    if isinstance(node, _Element):
+        return node.get_text(separator, strip)
+
+    if node.kind is not None:
+        return ""
+    return node.text.strip() if strip else node.text
+
+
+class _DocumentBuilder(html.parser.HTMLParser):
+    """
+    Builds the document tree following the same rules as BeautifulSoup, while recording the elements of interest
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+
+        self.root = _Element(ROOT_TAG_NAME, {}, None)
+
+        self._tag_stack = [self.root]
+        self._open_tag_counter: dict[str, int] = {}
+        self._preserve_whitespace_stack: list[_Element] = []
+        self._string_container_stack: list[_Element] = []
+        self._already_closed_empty_element: list[str] = []
+        self._current_data: list[str] = []
+
+        # Elements of interest, all first occurrences in document order
+        self.body: _Element | None = None
+        self.h1: _Element | None = None
+        self.synopsis: _Element | None = None
+        self.return_anchors: list[_Element] = []
+        self.examples_anchor: _Element | None = None
+        self.examples_pre: _Element | None = None
+        self.flag_rows: list[_Element] = []
+
+    def close(self) -> None:
+        super().close()
+        self._end_data()
+        while len(self._tag_stack) > 1:
+            self._pop_tag()
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]], handle_empty_element: bool = True) -> None:
+        self._end_data()
+
+        attr_dict = {key: "" if value is None else value for key, value in attrs}
+
+        element = _Element(tag, attr_dict, self._tag_stack[-1])
+
+        self._tag_stack.append(element)
+        self._open_tag_counter[tag] = self._open_tag_counter.get(tag, 0) + 1
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            self._preserve_whitespace_stack.append(element)
+        if tag in STRING_CONTAINER_TAGS:
+            self._string_container_stack.append(element)
+
+        self._record(element)
+
+        if handle_empty_element and tag in EMPTY_ELEMENT_TAGS:
+            self.handle_endtag(tag, check_already_closed=False)
+            self._already_closed_empty_element.append(tag)
+
+    def handle_endtag(self, tag: str, check_already_closed: bool = True) -> None:
+        if check_already_closed and tag in self._already_closed_empty_element:
+            self._already_closed_empty_element.remove(tag)
+            return
+
+        self._end_data()
+        self._pop_to_tag(tag)
+
+    def handle_data(self, data: str) -> None:
+        self._current_data.append(data)
+
+    def handle_charref(self, name: str) -> None:
+        if name.startswith("x"):
+            codepoint = int(name.lstrip("x"), 16)
+        elif name.startswith("X"):
+            codepoint = int(name.lstrip("X"), 16)
+        else:
+            codepoint = int(name)
+
+        data = None
+        if codepoint < 256:
+            try:
+                data = bytearray([codepoint]).decode("windows-1252")
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(codepoint)
+            except (ValueError, OverflowError):
+                pass
+
+        self.handle_data(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name: str) -> None:
+        character = ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data: str) -> None:
+        self._add_string(data, KIND_COMMENT)
+
+    def handle_decl(self, decl: str) -> None:
+        self._add_string(decl[len("DOCTYPE "):], KIND_DOCTYPE)
+
+    def unknown_decl(self, data: str) -> None:
+        if data.upper().startswith("CDATA["):
+            # CDATA is treated as regular text
+            self._add_string(data[len("CDATA["):], None)
+        else:
+            self._add_string(data, KIND_DECLARATION)
+
+    def handle_pi(self, data: str) -> None:
+        self._add_string(data, KIND_PROCESSING_INSTRUCTION)
+
+    def _record(self, element: _Element) -> None:
+        name = element.name
+        if name == "tr":
+            if element.attrs.get("bgcolor") == "#EEEEEE":
+                self.flag_rows.append(element)
+        elif name == "a":
+            anchor_name = element.attrs.get("name")
+            if anchor_name == "hReturn":
+                self.return_anchors.append(element)
+            elif anchor_name == "hExamples" and self.examples_anchor is None:
+                self.examples_anchor = element
+        elif name == "pre":
+            if self.examples_anchor is not None and self.examples_pre is None:
+                self.examples_pre = element
+        elif name == "p":
+            if self.synopsis is None and element.attrs.get("id") == "synopsis":
+                self.synopsis = element
+        elif name == "h1":
+            if self.h1 is None:
+                self.h1 = element
+        elif name == "body":
+            if self.body is None:
+                self.body = element
+
+    def _add_string(self, data: str, kind: str | None) -> None:
+        self._end_data()
+        self._current_data.append(data)
+        self._end_data(kind, is_text=False)
+
+    def _end_data(self, kind: str | None = None, is_text: bool = True) -> None:
+        if not self._current_data:
+            return
+
+        data = "".join(self._current_data)
+        self._current_data = []
+
+        # Strings only containing whitespace are collapsed into a single space or newline
+        if not self._preserve_whitespace_stack and not data.strip(ASCII_SPACES):
+            data = "\n" if "\n" in data else " "
+
+        if is_text and self._string_container_stack:
+            kind = self._string_container_stack[-1].name
+
+        self._tag_stack[-1].children.append(_String(data, kind))
+
+    def _pop_tag(self) -> None:
+        element = self._tag_stack.pop()
+        if self._open_tag_counter.get(element.name):
+            self._open_tag_counter[element.name] -= 1
+        if self._preserve_whitespace_stack and element is self._preserve_whitespace_stack[-1]:
+            self._preserve_whitespace_stack.pop()
+        if self._string_container_stack and element is self._string_container_stack[-1]:
+            self._string_container_stack.pop()
+
+    def _pop_to_tag(self, name: str) -> None:
+        """ Pop the tag stack up to and including the most recent element with the given name """
+        if name == ROOT_TAG_NAME:
+            return
+
+        for i in range(len(self._tag_stack) - 1, 0, -1):
+            if not self._open_tag_counter.get(name):
+                break
+
+            is_match = self._tag_stack[i].name == name
+            self._pop_tag()
+            if is_match:
+                break
+
+
+def get_command_description(document: _DocumentBuilder) -> str:
+    body = document.body
+    if body is None:
+        return ""
+
+    return_header = next((x for x in document.return_anchors if x.has_ancestor(body)), None)
+    if return_header is None or return_header.parent is None:
+        return ""
+
+    return_header_parent = return_header.parent
+
+    synopsis_found = False
+    return_string = ""
+    num_found_tags = 0
+    for child in body.children:
+        if child is return_header_parent:
+            break
+
+        if child is document.synopsis:
+            synopsis_found = True
+            continue
+
+        if not synopsis_found:
+            continue
+
+        if isinstance(child, _Element):
+            num_found_tags += 1
+            if num_found_tags == 1:
+                continue
+            text = child.get_text(separator=" ", strip=True)
+            if child.name == "i":
+                if text.startswith("*") or text.endswith("*"):
+                    text = f"<i>{text}</i>"
+                else:
+                    text = f"*{text}*"
+            elif child.name == "b":
+                if text.startswith("*") or text.endswith("*"):
+                    text = f"<b>{text}</b>"
+                else:
+                    text = f"**{text}**"
+            elif child.name == "p":
+                text = f"{text}\n"
+            elif child.name == "br":
+                text = "\n"
+            return_string += " " + text
+        elif child.text.strip():
+            return_string += " " + child.text.replace("\n", " ").strip()
+
+    return_string = return_string.replace("\n ", "\n")
+    return_string = return_string.replace(" \n", "\n")
+
+    return return_string.strip()
+
+
+def get_return_values(document: _DocumentBuilder) -> list[ReturnValue]:
+    if not document.return_anchors:
+        return []
+
+    return_h2 = document.return_anchors[0].parent
+    if return_h2 is None:
+        raise ValueError("Could not find return header")
+
+    return_table = return_h2.next_element_sibling()
+    if return_table is None:
+        raise ValueError("Could not find return value")
+
+    # Either a table or single paragraph
+    if return_table.name == "p":
+        return [ReturnValue(return_table.get_text(strip=True), "")]
+    elif return_table.name == "table":
+        return_values: list[ReturnValue] = []
+        for tr in return_table.iter_elements("tr"):
+            tds = tr.find_children("td")
+            if len(tds) != 2:
+                continue
+
+            type_td, desc_td = tds
+            return_values.append(ReturnValue(type_td.get_text("", strip=True), desc_td.get_text(strip=True)))
+
+        return return_values
+    else:
+        raise ValueError(f"Expected a paragraph or table, got {return_table.name}")
+
+
+def get_undoable_queryable_editable(document: _DocumentBuilder) -> tuple[bool, bool, bool]:
+    undoable_queryable_editable_doc = ""
+    if document.synopsis is not None:
+        if next_sibling := document.synopsis.next_element_sibling():
+            undoable_queryable_editable_doc = next_sibling.get_text(separator=" ", strip=True)
+
+    undoable = "NOT undoable" not in undoable_queryable_editable_doc
+    queryable = "NOT queryable" not in undoable_queryable_editable_doc
+    editable = "NOT editable" not in undoable_queryable_editable_doc
+
+    return undoable, queryable, editable
+
+
+def extract_flags(document: _DocumentBuilder) -> typing.Generator[Flag, None, None]:
+    for tr_flag in document.flag_rows:
+        children = tr_flag.find_children("td")
+        if not len(children) == 3:
+            raise ValueError(f"Expected 3 children elements but got {len(children)}")
+
+        td_name, td_type, td_property = children
+
+        # Name
+        b_name_long, b_name_short = td_name.iter_elements("b")
+        name_long = b_name_long.get_text(strip=True)
+        name_short = b_name_short.get_text(strip=True)
+
+        # Argument Types
+        arg_type = td_type.get_text(strip=True)
+        if not arg_type:
+            arg_type = None
+
+        # Properties
+        create = td_property.find("img", alt="create") is not None
+        query = td_property.find("img", alt="query") is not None
+        edit = td_property.find("img", alt="edit") is not None
+        multi_use = td_property.find("img", alt="multiuse") is not None
+
+        # Description
+        description = ""
+        if tr_flag.next_sibling() is not None:
+            if tr_desc := tr_flag.next_sibling(2):
+                description = _get_text(tr_desc, strip=True)
+
+        yield Flag(
+            name_long,
+            name_short,
+            arg_type,
+            description,
+            query,
+            edit,
+            create,
+            multi_use
+        )
+
+
+def extract_examples(document: _DocumentBuilder) -> str | None:
+    if document.examples_anchor is not None and document.examples_pre is not None:
+        return document.examples_pre.get_text(strip=True)
+
+    return None
+
+
+def is_obsolete(document: _DocumentBuilder) -> bool:
+    return document.h1 is not None and "Obsolete" in document.h1.get_text()
+
+
+def get_obsolete_message(document: _DocumentBuilder) -> str:
+    if document.body is not None:
+        texts: list[str] = []
+        for child in document.body.children:
+            if isinstance(child, _Element):
+                # Skip banner and toolbar
+                if child.attrs.get("id") == "banner":
+                    continue
+                if "toolbar" in child.attrs.get("class", "").split():
+                    continue
+
+                texts.append(child.get_text(separator=" ", strip=True))
+            elif child.text.strip():
+                texts.append(child.text.strip())
+
+        full_text = " ".join(texts).strip()
+        if full_text:
+            return full_text
+
+    return "This command is obsolete."
+
+
+def parse_html(html: str | bytes) -> CommandDocumentation:
+    """
+    Parse the documentation page in a single pass, gives the same result as `command.parse_html`
+    """
+    document = _DocumentBuilder()
+    try:
+        document.feed(decode_html(html))
+        document.close()
+
+        obsolete = is_obsolete(document)
+        obsolete_message = get_obsolete_message(document) if obsolete else None
+
+        undoable, queryable, editable = get_undoable_queryable_editable(document)
+
+        return CommandDocumentation(
+            undoable=undoable,
+            queryable=queryable,
+            editable=editable,
+            description=get_command_description(document),
+            returns=get_return_values(document),
+            flags=tuple(extract_flags(document)),
+            examples=extract_examples(document),
+            obsolete=obsolete,
+            obsolete_message=obsolete_message,
+        )
+    finally:
+        document.root.decompose()
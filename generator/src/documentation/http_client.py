@@ -0,0 +1,196 @@
+"""
+Pooled HTTP client, keeps connections alive so multiple pages can be downloaded from the same host
+without paying for a new TCP & TLS handshake for every request
+"""
+
+from __future__ import annotations
+
+import urllib.error
+import urllib.parse
+import threading
+import typing
+import sys
+
+if typing.TYPE_CHECKING:
+    import http.client
+
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_TIMEOUT = 60.0
+MAX_REDIRECTS = 5
+
+USER_AGENT = f"Python-urllib/{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+class Response(typing.NamedTuple):
+    url: str
+    status: int
+    headers: http.client.HTTPMessage
+    body: bytes
+
+
+class PoolStats(typing.NamedTuple):
+    requests: int
+    connections_opened: int
+    connections_reused: int
+    bytes_received: int
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of keep-alive connections, at most `max_connections` connections are opened per host
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS, timeout: float = DEFAULT_TIMEOUT):
+        self.max_connections = max(max_connections, 1)
+        self.timeout = timeout
+
+        self._condition = threading.Condition()
+        self._idle: dict[tuple[str, str, int | None], list[http.client.HTTPConnection]] = {}
+        self._num_open: dict[tuple[str, str, int | None], int] = {}
+
+        self._requests = 0
+        self._connections_opened = 0
+        self._connections_reused = 0
+        self._bytes_received = 0
+
+    def get(self, url: str, headers: dict[str, str] | None = None) -> Response:
+        """
+        Send a GET request, redirects are followed.
+        Raises `urllib.error.HTTPError` if the server responds with an error status
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._request(url, headers or {})
+
+            location = response.headers.get("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+
+            if response.status >= 400:
+                import http.client
+                raise urllib.error.HTTPError(url, response.status, http.client.responses.get(response.status, ""), response.headers, None)
+
+            return response
+
+        raise urllib.error.URLError(f"Too many redirects for {url}")
+
+    def set_max_connections(self, max_connections: int) -> None:
+        with self._condition:
+            self.max_connections = max(max_connections, 1)
+            self._condition.notify_all()
+
+    def get_stats(self) -> PoolStats:
+        with self._condition:
+            return PoolStats(self._requests, self._connections_opened, self._connections_reused, self._bytes_received)
+
+    def close(self) -> None:
+        """
+        Close all idle connections
+        """
+        with self._condition:
+            for key, connections in self._idle.items():
+                for connection in connections:
+                    connection.close()
+                self._num_open[key] -= len(connections)
+            self._idle.clear()
+            self._condition.notify_all()
+
+    def _request(self, url: str, headers: dict[str, str]) -> Response:
+        import http.client  # Imported on first use, it imports ssl which is slow to import
+
+        parsed_url = urllib.parse.urlsplit(url)
+        if parsed_url.scheme not in ("http", "https") or not parsed_url.hostname:
+            raise ValueError(f"Unsupported url: {url}")
+
+        key = (parsed_url.scheme, parsed_url.hostname, parsed_url.port)
+        path = urllib.parse.urlunsplit(("", "", parsed_url.path or "/", parsed_url.query, ""))
+        request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity", **headers}
+
+        connection, reused = self._acquire(key)
+        try:
+            try:
+                response = self._send(connection, path, request_headers)
+            except (ConnectionError, http.client.BadStatusLine):
+                if not reused:
+                    raise
+
+                # The server has closed the idle connection, try again on a new one
+                connection.close()
+                reused = False
+                with self._condition:
+                    self._connections_opened += 1
+                response = self._send(connection, path, request_headers)
+
+            body = response.read()
+        except BaseException:
+            self._release(key, connection, reusable=False)
+            raise
+
+        self._release(key, connection, reusable=not response.will_close)
+
+        with self._condition:
+            self._requests += 1
+            self._bytes_received += len(body)
+            if reused:
+                self._connections_reused += 1
+
+        return Response(url, response.status, response.headers, body)
+
+    @staticmethod
+    def _send(connection: http.client.HTTPConnection, path: str, headers: dict[str, str]) -> http.client.HTTPResponse:
+        connection.request("GET", path, headers=headers)
+        return connection.getresponse()
+
+    def _acquire(self, key: tuple[str, str, int | None]) -> tuple[http.client.HTTPConnection, bool]:
+        """
+        Get an idle connection for the host, or open a new one if the pool isn't full.
+        Blocks until a connection is available, returns the connection and if it's being re-used
+        """
+        with self._condition:
+            while True:
+                if idle_connections := self._idle.get(key):
+                    return idle_connections.pop(), True
+
+                if self._num_open.get(key, 0) < self.max_connections:
+                    self._num_open[key] = self._num_open.get(key, 0) + 1
+                    self._connections_opened += 1
+                    break
+
+                self._condition.wait()
+
+        import http.client
+
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, key: tuple[str, str, int | None], connection: http.client.HTTPConnection, reusable: bool) -> None:
+        with self._condition:
+            if reusable:
+                self._idle.setdefault(key, []).append(connection)
+            else:
+                connection.close()
+                self._num_open[key] -= 1
+            self._condition.notify()
+
+
+default_pool = ConnectionPool()
+
+
+def get(url: str, headers: dict[str, str] | None = None) -> Response:
+    """
+    Send a GET request using the shared connection pool
+    """
+    return default_pool.get(url, headers)
+
+
+def set_max_connections(max_connections: int) -> None:
+    """
+    Set the maximum number of connections per host for the shared connection pool
+    """
+    default_pool.set_max_connections(max_connections)
+
+
+def get_stats() -> PoolStats:
+    return default_pool.get_stats()
@@ -2,54 +2,91 @@
 Functions for fetching & parsing the Maya cmds documentation index
 """
 
-import urllib.request
-import bs4
+import hashlib
+import json
+import os
 
-from bs4 import BeautifulSoup
+from . import source as docs_source
+from . import cache, command
 
 
 def get_docs_url(version: int, page: str) -> str:
-    if not page.lower().endswith('.html'):
-        page += '.html'
-
-    return f"https://help.autodesk.com/cloudhelp/{version}/ENU/Maya-Tech-Docs/CommandsPython/{page}"
+    return docs_source.OnlineSource(version).get_url(page)
 
 
 def get_index_url(version: int) -> str:
     return get_docs_url(version, "index_all")
 
 
-def get_index_html(version: int) -> str:
+def get_index_html(version: int,
+                   source: docs_source.DocumentationSource | None = None,
+                   use_cache: bool = False,
+                   revalidate: bool = False) -> str:
     """ 
     Get the raw HTML of the index page
     """
-    url = get_index_url(version)
-    with urllib.request.urlopen(url) as response:
-        return response.read().decode('utf-8')
+    source = source or docs_source.OnlineSource(version)
+    url = source.get_url(docs_source.INDEX_PAGE)
+    return command.get_html(url, use_cache=use_cache, source=source, revalidate=revalidate)
 
 
-def get_commands(version: int) -> dict[str, str]:
+def parse_index_html(html: str, source: docs_source.DocumentationSource) -> dict[str, str]:
     """
-    Fetches and parses the Maya cmds documentation index for the given version.
-    Returns a list of command names & urls.
+    Parse the index page, returns a dict mapping the command names to their urls
     """
-    html = get_index_html(version)
+    import bs4  # Imported on first use, it's slow to import & not needed when the index is cached
 
     commands: dict[str, str] = {}
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = bs4.BeautifulSoup(html, "html.parser")
     for a in soup.find_all('a'):
         if not isinstance(a, bs4.element.Tag):
             raise TypeError(f"Expected a Tag element, got {type(a)}")
 
-        command = a.get_text(strip=True)
+        command_name = a.get_text(strip=True)
 
         relative_url = a.get('href')
         if not isinstance(relative_url, str):
             raise TypeError(f"Expected a string, got {type(relative_url)}")
 
-        absolute_url = get_docs_url(version, relative_url)
+        absolute_url = source.get_url(relative_url)
+
+        commands[command_name] = absolute_url
+
+    # The tree is full of reference cycles, break them so it doesn't linger until the next gc collection.
+    # Decomposing the soup itself doesn't walk its children, so decompose the top level elements instead.
+    for element in list(soup.contents):
+        element.decompose()
+
+    return commands
+
+
+def get_commands(version: int,
+                 source: docs_source.DocumentationSource | None = None,
+                 use_cache: bool = False,
+                 revalidate: bool = False) -> dict[str, str]:
+    """
+    Fetches and parses the Maya cmds documentation index for the given version.
+    Returns a list of command names & urls.
+    """
+    source = source or docs_source.OnlineSource(version)
+    html = get_index_html(version, source, use_cache=use_cache, revalidate=revalidate)
+
+    if not use_cache:
+        return parse_index_html(html, source)
+
+    # The parsed commands are cached per version & index page content
+    index_url = source.get_url(docs_source.INDEX_PAGE)
+    content_hash = hashlib.sha256(f"{version}:{index_url}:{html}".encode("utf-8")).hexdigest()
+    cache_filename = os.path.join("index", f"{content_hash}.json")
+
+    if cached_data := cache.read(cache_filename):
+        try:
+            return json.loads(cached_data)
+        except ValueError:
+            pass  # Corrupt cache entry, parse it again
 
-        commands[command] = absolute_url
+    commands = parse_index_html(html, source)
+    cache.write(cache_filename, json.dumps(commands).encode("utf-8"), scope=str(version))
 
     return commands
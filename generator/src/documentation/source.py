@@ -0,0 +1,143 @@
+"""
+Sources the documentation pages can be read from, either the online documentation
+or an offline copy of the CommandsPython folder as a directory or zip archive
+"""
+
+import threading
+import zipfile
+import abc
+import os
+
+from . import http_client
+
+ONLINE_URL = "https://help.autodesk.com/cloudhelp/{version}/ENU/Maya-Tech-Docs/CommandsPython/{page}"
+INDEX_PAGE = "index_all.html"
+
+
+def get_page_filename(page: str) -> str:
+    if not page.lower().endswith('.html'):
+        page += '.html'
+
+    return page
+
+
+class DocumentationSource(abc.ABC):
+    remote = False
+    """ If the pages are downloaded, remote pages may be cached on disk """
+    cache_scope = ""
+    """ Scope of the cached pages, the Maya version for remote sources """
+
+    @abc.abstractmethod
+    def get_url(self, page: str) -> str:
+        """
+        Get the url/path used to read the given page, e.g. 'xform' or 'xform.html'
+        """
+
+    @abc.abstractmethod
+    def read(self, url: str) -> bytes:
+        """
+        Read the page at the url/path returned by `get_url`
+        """
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class OnlineSource(DocumentationSource):
+    """
+    The online documentation hosted on help.autodesk.com, or another server with the CommandsPython pages if `url` is given
+    """
+    remote = True
+
+    def __init__(self, version: int | str, url: str | None = None):
+        self.version = version
+        self.cache_scope = str(version)
+        self.url_template = f"{url.rstrip('/')}/{{page}}" if url else ONLINE_URL
+
+    def get_url(self, page: str) -> str:
+        return self.url_template.format(version=self.version, page=get_page_filename(page))
+
+    def read(self, url: str) -> bytes:
+        return self.request(url).body
+
+    def request(self, url: str, headers: dict[str, str] | None = None) -> http_client.Response:
+        """
+        Send a GET request for a page with the given headers, e.g. to revalidate a cached page
+        """
+        return http_client.get(url, headers)
+
+
+class DirectorySource(DocumentationSource):
+    """
+    A local directory containing the CommandsPython html pages
+    """
+
+    def __init__(self, directory: str):
+        commands_python_dir = os.path.join(directory, "CommandsPython")
+        if not os.path.isfile(os.path.join(directory, INDEX_PAGE)) and os.path.isdir(commands_python_dir):
+            directory = commands_python_dir
+
+        self.directory = directory
+
+    def get_url(self, page: str) -> str:
+        return os.path.join(self.directory, get_page_filename(page))
+
+    def read(self, url: str) -> bytes:
+        with open(url, "rb") as f:
+            return f.read()
+
+
+class ZipSource(DocumentationSource):
+    """
+    A zip archive containing the CommandsPython html pages, the pages are read directly from the archive
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._zip_file = zipfile.ZipFile(filepath)
+        self._lock = threading.Lock()
+
+        # The pages are placed next to the index page, which may be in a sub directory of the archive
+        index_members = [x for x in self._zip_file.namelist() if x.rsplit("/", 1)[-1] == INDEX_PAGE]
+        if not index_members:
+            self._zip_file.close()
+            raise ValueError(f"Could not find {INDEX_PAGE} in {filepath}")
+
+        index_member = min(index_members, key=lambda x: (not x.endswith(f"CommandsPython/{INDEX_PAGE}"), len(x)))
+        self.prefix = index_member[:-len(INDEX_PAGE)]
+
+    def get_url(self, page: str) -> str:
+        return self.prefix + get_page_filename(page)
+
+    def read(self, url: str) -> bytes:
+        with self._lock:
+            return self._zip_file.read(url)
+
+    def close(self) -> None:
+        self._zip_file.close()
+
+
+def get_source(version: int | str, location: str | None = None) -> DocumentationSource:
+    """
+    Get the documentation source for the given location, the online documentation is used if no location is given.
+    The location may be a directory, a zip archive or a http(s) url to a folder with the CommandsPython pages
+    """
+    if not location:
+        return OnlineSource(version)
+
+    if location.startswith(("http://", "https://")):
+        return OnlineSource(version, location)
+
+    if os.path.isdir(location):
+        return DirectorySource(location)
+
+    if zipfile.is_zipfile(location):
+        return ZipSource(location)
+
+    raise ValueError(f"Documentation source must be a directory or a zip archive: {location}")
@@ -8,3 +8,13 @@ class GeneratorFlag(enum.Flag):
     """ Cache downloaded documentation to disk """
     TUPLE_PARAMS = enum.auto()
     """ Use tuple parameters for functions, will otherwise use Sequence which is less strict """
+    SINGLE_PASS_PARSER = enum.auto()
+    """ Parse the documentation using the single pass extractor instead of BeautifulSoup """
+    INCREMENTAL = enum.auto()
+    """ Only re-generate the commands whose inputs changed since the last run, re-using the previous stubs for the rest """
+    PACKAGE = enum.auto()
+    """ Generate a stub package with one module per first letter instead of a single file, faster for type checkers to load """
+    COMPACT_OVERLOADS = enum.auto()
+    """ Merge overloads that only differ by the flag they query and remove duplicate overloads, to shrink the stubs """
+    REVALIDATE = enum.auto()
+    """ Revalidate the cached documentation pages with conditional requests, only the pages that changed are downloaded again """
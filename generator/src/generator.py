@@ -1,24 +1,43 @@
+import collections
+import dataclasses
+import contextlib
 import logging
+import typing
+import io
 import time
 import os
 
-from . import populate_functions, documentation, base_types, maya_info, docstring
+from . import populate_functions, documentation, base_types, maya_info, docstring, build_manifest, compact_overloads, profiling, stub_writer
 from .flags import GeneratorFlag
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_JOBS = 8
 
 
+@dataclasses.dataclass(slots=True)
+class PreparedCommand:
+    """
+    A command whose inputs have been gathered, waiting to be generated
+    """
+    name: str
+    docs_url: str | None
+    positional_args: list[maya_info.cmds_info.Argument]
+    input_hash: str | None
+    reused_text: str | None
+    """ The stub from the previous run if the inputs haven't changed """
+    page_key: str | tuple[str, str] | None
+    """ Key of the parsed documentation, None if the page doesn't have to be parsed """
 
-def create_command(command_name: str, doc_url: str | None, flags: GeneratorFlag) -> base_types.Command:
-    positional_args = maya_info.cmds_info.get_positional_args(command_name)
+
+def create_command(command_name: str,
+                   doc_info: documentation.command.CommandDocumentation | None,
+                   flags: GeneratorFlag,
+                   positional_args: list[maya_info.cmds_info.Argument]) -> base_types.Command:
     positional_args = [base_types.Argument(arg.name, arg.argument_type, arg.default) for arg in positional_args]
 
-    doc_info = None
-    if doc_url:
-        doc_info = documentation.command.get_info(doc_url, use_cache=bool(flags & GeneratorFlag.CACHE))
-        if doc_info.obsolete:
-            positional_args = [base_types.Argument("*args"), base_types.Argument("**kwargs")]
+    if doc_info and doc_info.obsolete:
+        positional_args = [base_types.Argument("*args"), base_types.Argument("**kwargs")]
 
     functions = populate_functions.get_functions_all(command_name, doc_info, positional_args, flags)
     doc_str = docstring.create_docstring(doc_info) if doc_info else ""
@@ -27,43 +46,365 @@ def create_command(command_name: str, doc_url: str | None, flags: GeneratorFlag)
     return command
 
 
-def generate_string(flags=GeneratorFlag.NONE) -> str:
-    commands: list[base_types.Command] = []
+def get_header(version: str) -> str:
+    header_filepath = os.path.join(os.path.dirname(__file__), "template_header.py")
+    with open(header_filepath, "r") as f:
+        header = f.read()
+
+    return header.replace("{VERSION}", version)
+
+
+def generate_commands(writer: stub_writer.StubWriter,
+                      flags=GeneratorFlag.NONE,
+                      *,
+                      jobs: int = DEFAULT_JOBS,
+                      processes: int = 1,
+                      docs_source: str | None = None,
+                      snapshot: str | maya_info.snapshot.Snapshot | None = None,
+                      manifest: build_manifest.Manifest | None = None,
+                      profiler: profiling.Profiler | None = None,
+                      parsed_pages: dict[tuple[str, str], documentation.command.CommandDocumentation] | None = None) -> None:
+    """
+    Generate the stubs for all commands and stream them to `writer`, the pages flow from the download through
+    parsing into the generate loop and each command is written before moving on, so only a bounded window of
+    pages & commands is held in memory at a time.
+    If a manifest is given, commands whose inputs haven't changed re-use the stubs stored in it
+    and the manifest is updated with the newly generated stubs.
+    `parsed_pages` maps the parser & content hash of pages to their parsed documentation, it's shared between
+    runs for different Maya versions so pages that are identical between the versions are only parsed once.
+    Pages that aren't part of this run are removed from it
+    """
+    if profiler is None:
+        profiler = profiling.Profiler()
 
-    with maya_info.MayaStandalone():
-        maya_commands = maya_info.cmds_info.get_commands()
-        documentation_commands = documentation.index.get_commands(maya_info.version())
+    with contextlib.ExitStack() as exit_stack:
+        with profiler.phase("maya_startup"):
+            maya_backend = exit_stack.enter_context(maya_info.backend.open_backend(
+                snapshot,
+                use_cache=bool(flags & GeneratorFlag.CACHE)
+            ))
+            source = exit_stack.enter_context(documentation.source.get_source(maya_backend.get_version(), docs_source))
+
+        with profiler.phase("index"):
+            maya_commands = maya_backend.get_commands()
+            documentation_commands = documentation.index.get_commands(
+                maya_backend.get_version(),
+                source,
+                use_cache=bool(flags & GeneratorFlag.CACHE),
+                revalidate=bool(flags & GeneratorFlag.REVALIDATE)
+            )
 
         all_commands = set(maya_commands) | set(documentation_commands.keys())
 
+        command_urls: list[tuple[str, str | None]] = []
         for command_name in sorted(all_commands):
             docs_url = documentation_commands.get(command_name)
             if not docs_url and not (flags & GeneratorFlag.INCLUDE_UNDOCUMENTED_FUNCTIONS):
                 continue
 
-            command = create_command(command_name, docs_url, flags)
-            commands.append(command)
+            command_urls.append((command_name, docs_url))
 
-        header_filepath = os.path.join(os.path.dirname(__file__), "template_header.py")
-        with open(header_filepath, "r") as f:
-            header = f.read()
+        if flags & GeneratorFlag.SINGLE_PASS_PARSER:
+            parse_function = documentation.html_extractor.parse_html
+        else:
+            parse_function = documentation.command.parse_html
 
-        header = header.replace("{VERSION}", maya_info.version())
+        # The commands flow through the stages one at a time: the page is downloaded, the positional args are
+        # queried from Maya, the manifest is checked, the page is parsed & the stub is generated. The pages are
+        # downloaded by worker threads & parsed by worker processes ahead of the command that's being generated,
+        # only the pages & commands within those windows are held in memory. Maya is only queried from the main thread,
+        # which also starts the parse processes, they must not be forked from another thread while Maya may hold locks
+        documentation.http_client.set_max_connections(jobs)
+        pages = exit_stack.enter_context(contextlib.closing(documentation.command.iter_html(
+            dict.fromkeys(url for _, url in command_urls if url),
+            use_cache=bool(flags & GeneratorFlag.CACHE),
+            jobs=jobs,
+            source=source,
+            revalidate=bool(flags & GeneratorFlag.REVALIDATE)
+        )))
 
-    code_str = "\n".join(x.get_string() for x in commands)
-    return f"{header}\n{code_str}"
+        # A page is released once the last command using it has been prepared,
+        # its parsed documentation once the last command using it has been generated
+        html_uses = collections.Counter(url for _, url in command_urls if url)
+        doc_uses = collections.Counter(html_uses)
+        html_lookup: dict[str, str] = {}
+        doc_info_lookup: dict[str | tuple[str, str], documentation.command.CommandDocumentation] = {}
 
+        # Pages identical to a page parsed for a previous version are only parsed once, so they're keyed by their content in that case
+        requested_keys: set[str | tuple[str, str]] = set()
+        used_keys: set[str | tuple[str, str]] = set()
+        parse_keys: collections.deque[str | tuple[str, str]] = collections.deque()
+        pages_to_parse: collections.deque[str] = collections.deque()
 
-def generate_stubs(out_filepath: str, *, flags: GeneratorFlag = GeneratorFlag.NONE) -> None:
-    start_time = time.perf_counter()
+        remaining_commands = iter(command_urls)
+        prepared_commands: collections.deque[PreparedCommand] = collections.deque()
+        page_count = 0
+        page_bytes = 0
+        reused_count = 0
+        prepare_seconds = 0.0
+
+        def prepare_next_command() -> bool:
+            """
+            Prepare the next command & queue its page to be parsed, returns False once all commands have been prepared
+            """
+            nonlocal page_count, page_bytes, prepare_seconds
+            start_time = time.perf_counter()
+
+            command_name, docs_url = next(remaining_commands, (None, None))
+            if command_name is None:
+                return False
+
+            html = None
+            if docs_url:
+                with profiler.command_stage(command_name, "download"):
+                    while docs_url not in html_lookup:
+                        url, page_html = next(pages)
+                        html_lookup[url] = page_html
+                        page_count += 1
+                        # The pages are decoded, count their size in bytes rather than characters
+                        page_bytes += len(page_html) if page_html.isascii() else len(page_html.encode("utf-8"))
+
+                html = html_lookup[docs_url]
+                html_uses[docs_url] -= 1
+                if not html_uses[docs_url]:
+                    del html_lookup[docs_url]
+
+            with profiler.command_stage(command_name, "positional_args"):
+                positional_args = maya_backend.get_positional_args(command_name)
+
+            # Look up if the command can re-use the stub from the previous run
+            input_hash = None
+            reused_text = None
+            if manifest is not None:
+                with profiler.command_stage(command_name, "manifest"):
+                    input_hash = build_manifest.hash_inputs(command_name, html, positional_args, flags)
+                    reused_text = manifest.get_text(command_name, input_hash)
+
+            # Only the pages of the commands that aren't re-used from the manifest are parsed
+            page_key = None
+            if html is not None and reused_text is None:
+                if parsed_pages is None:
+                    page_key = docs_url
+                else:
+                    page_key = (parse_function.__module__, documentation.command.get_content_hash(html))
+                used_keys.add(page_key)
+
+                if page_key not in requested_keys and (parsed_pages is None or page_key not in parsed_pages):
+                    requested_keys.add(page_key)
+                    parse_keys.append(page_key)
+                    pages_to_parse.append(html)
+
+            prepared_commands.append(PreparedCommand(command_name, docs_url, positional_args, input_hash, reused_text, page_key))
+            prepare_seconds += time.perf_counter() - start_time
+            return True
+
+        def iter_pages_to_parse():
+            while pages_to_parse or prepare_next_command():
+                if pages_to_parse:
+                    yield pages_to_parse.popleft()
+
+        doc_infos = exit_stack.enter_context(contextlib.closing(documentation.command.iter_parse_html(
+            iter_pages_to_parse(),
+            use_cache=bool(flags & GeneratorFlag.CACHE),
+            parse_function=parse_function,
+            processes=processes
+        )))
+
+        def get_doc_info(command_name: str, page_key: str | tuple[str, str]) -> documentation.command.CommandDocumentation:
+            lookup = doc_info_lookup if parsed_pages is None else parsed_pages
+            if page_key in lookup:
+                return lookup[page_key]
+
+            # Parsing ahead may prepare the next commands, their time is already recorded in their own stages
+            start_time = time.perf_counter()
+            start_prepare_seconds = prepare_seconds
+            while page_key not in lookup:
+                lookup[parse_keys[0]] = next(doc_infos)
+                parse_keys.popleft()
+            profiler.add_command_time(command_name, "parse", time.perf_counter() - start_time - (prepare_seconds - start_prepare_seconds))
+
+            return lookup[page_key]
+
+        compaction_stats = compact_overloads.CompactionStats()
+
+        with profiler.phase("generate"):
+            writer.begin(get_header(maya_backend.get_version()))
+
+            while prepared_commands or prepare_next_command():
+                prepared = prepared_commands.popleft()
+                command_name = prepared.name
+
+                doc_info = None
+                if prepared.page_key is not None:
+                    doc_info = get_doc_info(command_name, prepared.page_key)
+
+                # Release the parsed documentation once the last command using it has been built,
+                # the examples & descriptions are only needed until the docstring has been rendered
+                if prepared.docs_url:
+                    doc_uses[prepared.docs_url] -= 1
+                    if not doc_uses[prepared.docs_url]:
+                        doc_info_lookup.pop(prepared.docs_url, None)
+
+                if prepared.reused_text is not None:
+                    writer.write_command(command_name, prepared.reused_text)
+                    reused_count += 1
+                    continue
+
+                with profiler.command_stage(command_name, "populate"):
+                    command = create_command(command_name, doc_info, flags, prepared.positional_args)
+                    if flags & GeneratorFlag.COMPACT_OVERLOADS:
+                        compacted_command = compact_overloads.compact_command(command)
+                        compaction_stats.add(command, compacted_command)
+                        command = compacted_command
 
-    code = generate_string(flags)
+                with profiler.command_stage(command_name, "render"):
+                    command_string = command.get_string()
+                writer.write_command(command_name, command_string)
 
-    if os.path.isdir(out_filepath):
+                if manifest is not None:
+                    manifest.set_text(command_name, typing.cast(str, prepared.input_hash), command_string)
+
+        http_stats = documentation.http_client.get_stats()
+        logger.info(f"Sent {http_stats.requests} HTTP requests, opened {http_stats.connections_opened} connections and re-used {http_stats.connections_reused}")
+
+        if flags & GeneratorFlag.REVALIDATE:
+            revalidated = documentation.cache.get_stats().get("revalidated", {"hits": 0, "misses": 0})
+            logger.info(f"Revalidated {revalidated['hits'] + revalidated['misses']} cached pages, {revalidated['misses']} had changed and were downloaded again")
+
+        cache_info = populate_functions.TYPE_CONVERTER.get_cache_info()
+        if cache_info.hits + cache_info.misses:
+            hit_rate = cache_info.hits / (cache_info.hits + cache_info.misses)
+            logger.info(f"Converted {cache_info.hits + cache_info.misses} type strings, {hit_rate:.1%} cache hit rate")
+
+        if flags & GeneratorFlag.COMPACT_OVERLOADS:
+            logger.info(f"Compacted {compaction_stats.overloads_before} overloads into {compaction_stats.overloads_after}, "
+                        f"{compaction_stats.bytes_before} bytes into {compaction_stats.bytes_after}")
+
+        if parsed_pages is not None:
+            # Only the pages of this version are kept, pages of a previous version that this version doesn't use
+            # are unlikely to be used by the next version
+            for page_key in [x for x in parsed_pages if x not in used_keys]:
+                del parsed_pages[page_key]
+            logger.info(f"Parsed {len(requested_keys)} pages, re-used {len(used_keys) - len(requested_keys)} identical pages")
+
+        if manifest is not None:
+            manifest.version = maya_backend.get_version()
+            manifest.retain(name for name, _ in command_urls)
+            logger.info(f"Re-used {reused_count} of {len(command_urls)} commands from the previous build")
+
+        profiler.counters.update({
+            "commands": len(command_urls),
+            "commands_reused": reused_count,
+            "pages_fetched": page_count,
+            "page_bytes": page_bytes,
+            "http": http_stats._asdict(),
+            "cache": documentation.cache.get_stats(),
+            "type_conversion_cache": {"hits": cache_info.hits, "misses": cache_info.misses},
+        })
+        if flags & GeneratorFlag.COMPACT_OVERLOADS:
+            profiler.counters["overload_compaction"] = dataclasses.asdict(compaction_stats)
+
+
+def generate_string(flags=GeneratorFlag.NONE, **kwargs) -> str:
+    """
+    Generate the content of the single file stub, see `generate_commands` for the keyword arguments
+    """
+    stream = io.StringIO()
+    generate_commands(stub_writer.TextStubWriter(stream), flags, **kwargs)
+    return stream.getvalue()
+
+
+def generate_stubs(out_filepath: str,
+                   *,
+                   flags: GeneratorFlag = GeneratorFlag.NONE,
+                   jobs: int = DEFAULT_JOBS,
+                   processes: int = 1,
+                   docs_source: str | None = None,
+                   snapshot: str | maya_info.snapshot.Snapshot | None = None,
+                   profile_report: str | None = None,
+                   parsed_pages: dict[tuple[str, str], documentation.command.CommandDocumentation] | None = None) -> None:
+    """
+    Generate the stubs and write them to `out_filepath`.
+    With `GeneratorFlag.PACKAGE` a stub package is written to the directory `out_filepath` (without any '.pyi' extension).
+    If `profile_report` is given, a JSON report of the time spent in each phase is written to it
+    """
+    profiler = profiling.Profiler()
+
+    if flags & GeneratorFlag.PACKAGE:
+        out_filepath = out_filepath.removesuffix(".pyi")
+    elif os.path.isdir(out_filepath):
         out_filepath = os.path.join(out_filepath, "cmds.pyi")
 
-    os.makedirs(os.path.dirname(out_filepath), exist_ok=True)
-    with open(out_filepath, "w", encoding="utf-8") as f:
-        f.write(code)
+    manifest = build_manifest.load(out_filepath) if flags & GeneratorFlag.INCREMENTAL else None
+
+    kwargs = {
+        "jobs": jobs,
+        "processes": processes,
+        "docs_source": docs_source,
+        "snapshot": snapshot,
+        "manifest": manifest,
+        "profiler": profiler,
+        "parsed_pages": parsed_pages,
+    }
+
+    if flags & GeneratorFlag.PACKAGE:
+        writer = stub_writer.PackageStubWriter(out_filepath)
+    else:
+        writer = stub_writer.FileStubWriter(out_filepath)
+
+    with writer:
+        generate_commands(writer, flags, **kwargs)
+
+    if flags & GeneratorFlag.PACKAGE and os.path.isfile(f"{out_filepath}.pyi"):
+        logger.warning(f"'{out_filepath}.pyi' exists next to the generated package and may be picked up by type checkers instead")
+
+    if manifest is not None:
+        build_manifest.save(out_filepath, manifest)
+
+    if flags & (GeneratorFlag.CACHE | GeneratorFlag.INCREMENTAL):
+        evicted_count, evicted_size = documentation.cache.enforce_max_size()
+        if evicted_count:
+            logger.info(f"Evicted {evicted_count} least recently used cache entries ({evicted_size / 2**20:.1f} MiB)")
+
+    if profile_report:
+        profiler.write_report(profile_report)
+
+    logger.info(f"Generated stubs in {time.perf_counter() - profiler.start_time:.2f} seconds")
+
+
+def generate_stubs_all(snapshots: list[str],
+                       out_filepath: str,
+                       *,
+                       flags: GeneratorFlag = GeneratorFlag.NONE,
+                       jobs: int = DEFAULT_JOBS,
+                       processes: int = 1,
+                       docs_source: str | None = None,
+                       profile_report: str | None = None) -> None:
+    """
+    Generate the stubs for multiple Maya versions in a single run, from snapshots exported with 'export-snapshot'.
+    '{VERSION}' in `out_filepath`, `docs_source` & `profile_report` is replaced by the Maya version of each snapshot.
+    Documentation pages that are identical between the versions are only parsed once
+    """
+    if len(snapshots) > 1 and "{VERSION}" not in out_filepath:
+        raise ValueError(f"The output '{out_filepath}' must contain '{{VERSION}}' to generate the stubs for multiple Maya versions")
+
+    start_time = time.perf_counter()
+    parsed_pages: dict[tuple[str, str], documentation.command.CommandDocumentation] = {}
+
+    for snapshot_filepath in snapshots:
+        snapshot = maya_info.snapshot.load(snapshot_filepath)
+        version = snapshot.get_version()
+        logger.info(f"Generating stubs for Maya {version}")
+
+        generate_stubs(
+            out_filepath.replace("{VERSION}", version),
+            flags=flags,
+            jobs=jobs,
+            processes=processes,
+            docs_source=docs_source.replace("{VERSION}", version) if docs_source else None,
+            snapshot=snapshot,
+            profile_report=profile_report.replace("{VERSION}", version) if profile_report else None,
+            parsed_pages=parsed_pages
+        )
 
-    logger.info(f"Generated stubs in {time.perf_counter() - start_time:.2f} seconds")
+    logger.info(f"Generated stubs for {len(snapshots)} Maya versions in {time.perf_counter() - start_time:.2f} seconds")
@@ -1,7 +1,8 @@
 from .standalone import MayaStandalone
 
-import maya.cmds
-from . import cmds_info
+from . import cmds_info, backend, snapshot
 
-def version():
-    return maya.cmds.about(version=True)
\ No newline at end of file
+def version() -> str:
+    import maya.cmds  # Imported here so generation from a snapshot does not require Maya
+
+    return maya.cmds.about(version=True)
@@ -0,0 +1,113 @@
+"""
+The information the generator needs from Maya, either queried directly from Maya or loaded from a snapshot
+"""
+
+import contextlib
+import typing
+import json
+import abc
+import os
+
+from . import cmds_info
+
+
+class MayaBackend(abc.ABC):
+    @abc.abstractmethod
+    def get_version(self) -> str:
+        """
+        Get the Maya version, e.g. '2026'
+        """
+
+    @abc.abstractmethod
+    def get_commands(self) -> list[str]:
+        """
+        Get the names of all commands available in Maya
+        """
+
+    @abc.abstractmethod
+    def get_positional_args(self, command: str) -> list[cmds_info.Argument]:
+        """
+        Get the positional arguments of a command, parsed from its synopsis
+        """
+
+
+class LiveBackend(MayaBackend):
+    """
+    Queries the information from Maya, must be used inside of `MayaStandalone`.
+    The synopses are only queried for the commands that are generated (one help query per command),
+    if `use_cache` is True they're stored per Maya version so later runs can skip querying Maya for them
+    """
+
+    def __init__(self, use_cache: bool = False):
+        self.use_cache = use_cache
+        self._synopses: dict[str, str | None] | None = None
+        self._modified = False
+
+    def get_version(self) -> str:
+        from . import version
+        return version()
+
+    def get_commands(self) -> list[str]:
+        return cmds_info.get_commands()
+
+    def get_synopses(self, commands: typing.Iterable[str]) -> dict[str, str | None]:
+        """
+        Get the synopses of the given commands, only the commands that aren't cached are queried from Maya
+        """
+        if self._synopses is None:
+            self._synopses = self._load_synopses() if self.use_cache else {}
+
+        commands = list(commands)
+        missing_commands = [command for command in commands if command not in self._synopses]
+        if missing_commands:
+            self._synopses.update(cmds_info.get_synopses(missing_commands))
+            self._modified = True
+
+        return {command: self._synopses[command] for command in commands}
+
+    def get_positional_args(self, command: str) -> list[cmds_info.Argument]:
+        return cmds_info.parse_synopsis(command, self.get_synopses([command])[command])
+
+    def save(self) -> None:
+        """
+        Store the synopses queried from Maya in the cache, if caching is enabled
+        """
+        if self.use_cache and self._modified and self._synopses is not None:
+            from ..documentation import cache
+            cache.write(
+                self._get_cache_filename(),
+                json.dumps(self._synopses, separators=(",", ":")).encode("utf-8"),
+                scope=self.get_version()
+            )
+            self._modified = False
+
+    def _load_synopses(self) -> dict[str, str | None]:
+        from ..documentation import cache
+
+        data = cache.read(self._get_cache_filename())
+        return json.loads(data) if data else {}
+
+    def _get_cache_filename(self) -> str:
+        return os.path.join("synopses", f"{cmds_info.get_version_key()}.json")
+
+
+@contextlib.contextmanager
+def open_backend(snapshot: str | MayaBackend | None = None, use_cache: bool = False) -> typing.Generator[MayaBackend, None, None]:
+    """
+    Open a snapshot if a filepath or an already loaded snapshot is given, otherwise initialize Maya standalone and query Maya directly.
+    `use_cache` stores the synopses queried from Maya so later runs for the same Maya version doesn't have to query them
+    """
+    if isinstance(snapshot, MayaBackend):
+        yield snapshot
+        return
+
+    if snapshot:
+        from . import snapshot as snapshot_module
+        yield snapshot_module.load(snapshot)
+        return
+
+    from .standalone import MayaStandalone
+    with MayaStandalone():
+        live_backend = LiveBackend(use_cache)
+        yield live_backend
+        live_backend.save()
@@ -1,5 +1,4 @@
-import maya.cmds
-
+import functools
 import builtins
 import re
 
@@ -13,6 +12,7 @@ logger = logging.getLogger(__name__)
 PATTERN_SYNOPSIS_PREFIX = re.compile(r"Synopsis: \w+(?: \[flags\])?")
 PATTRERN_BRACKETS = re.compile(r"\[([A-Za-z. ]+)\]")
 PATTERN_PARENS = re.compile(r"\([^)]*\)")
+PATTERN_SYNOPSIS_LINE = re.compile(r"^Synopsis:[^\r\n]*", re.MULTILINE)
 
 
 TYPE_MAP = resources.load("type_conversion.jsonc")
@@ -37,29 +37,79 @@ def default_arg() -> list[Argument]:
 
 
 def get_commands() -> list[str]:
+    import maya.cmds  # Imported here so the synopsis parsing can be used without Maya
+
     return [x for x in dir(maya.cmds) if not x.startswith("_") and callable(getattr(maya.cmds, x))]
 
 
-def get_positional_args(command: str) -> list[Argument]:
+def get_synopsis(command: str) -> str | None:
+    """
+    Get the synopsis line from the help of the command, e.g. 'Synopsis: xform [flags] [String...]'
+    """
+    import maya.cmds
+
     try:
         help_str: str = maya.cmds.help(command)
     except RuntimeError as e:
-        return default_arg()
+        return None
+
+    if match := PATTERN_SYNOPSIS_LINE.search(help_str):
+        return match.group()
+
+    return None
+
+
+def get_synopses(commands: typing.Iterable[str]) -> dict[str, str | None]:
+    """
+    Get the synopsis of each command, Maya's help has no batch query so this still calls `maya.cmds.help` once per command
+    """
+    return {command: get_synopsis(command) for command in commands}
+
+
+def get_version_key() -> str:
+    """
+    Get a key identifying the Maya version including updates, e.g. '2026-20260100'
+    """
+    import maya.cmds
 
-    help_lines = help_str.splitlines()
+    return f"{maya.cmds.about(version=True)}-{maya.cmds.about(apiVersion=True)}"
 
-    synopsis = next((x for x in help_lines if x.startswith("Synopsis:")), None)
+
+def get_positional_args(command: str) -> list[Argument]:
+    return parse_synopsis(command, get_synopsis(command))
+
+
+def parse_synopsis(command: str, synopsis: str | None) -> list[Argument]:
     if not synopsis:
         return default_arg()  # Could not determine, allow any args
 
-    # Remove the prefix from the synopsis:
+    # Remove the prefix from the synopsis, commands with the same arguments share the same normalized synopsis
     arg_str = PATTERN_SYNOPSIS_PREFIX.sub("", synopsis).strip().lower()
+
+    arguments, warnings = _parse_arg_str(arg_str)
+    for message, detail in warnings:
+        logger.warning(f"{message} for command '{command}': {detail}")
+
+    return list(arguments)
+
+
+@functools.cache
+def _parse_arg_str(arg_str: str) -> tuple[tuple[Argument, ...], tuple[tuple[str, str], ...]]:
+    """
+    Parse the normalized synopsis, returns the arguments & the warnings to log as (message, detail)
+    """
+    warnings: list[tuple[str, str]] = []
+    arguments = tuple(_parse_arguments(arg_str, warnings))
+    return arguments, tuple(warnings)
+
+
+def _parse_arguments(arg_str: str, warnings: list[tuple[str, str]]) -> list[Argument]:
     if not arg_str:
         return []  # No positional args
 
     # render command currently contains a comment inside parens, remove it
     if "(" in arg_str:
-        logger.warning(f"Removing comment in parentheses from arg type for command '{command}': \"{arg_str}\"")
+        warnings.append(("Removing comment in parentheses from arg type", f"\"{arg_str}\""))
         arg_str = PATTERN_PARENS.sub("", arg_str).strip()
 
     if "[...]" in arg_str:  # Used in setAttr as Name[...], where it takes name then Any
@@ -74,7 +124,7 @@ def get_positional_args(command: str) -> list[Argument]:
             break
         arg_str = PATTRERN_BRACKETS.sub(r"\1", arg_str).strip()
     else:
-        logger.warning(f"Could not fully remove brackets from arg string for command '{command}': {arg_str_raw}")
+        warnings.append(("Could not fully remove brackets from arg string", arg_str_raw))
 
     if " " not in arg_str:  # Single type
         # Single argument, e.g. 'String' or 'Int'
@@ -98,7 +148,7 @@ def get_positional_args(command: str) -> list[Argument]:
             for i, arg in enumerate(args):
                 valid_type = _type_lookup(arg)
                 if not valid_type:
-                    logger.warning(f"Could not determine positional arg type for command '{command}': unknown type '{arg}'")
+                    warnings.append(("Could not determine positional arg type", f"unknown type '{arg}'"))
                 arguments.append(Argument(f"arg{i+1}", valid_type, default="..."))
 
             return arguments
@@ -110,7 +160,7 @@ def get_positional_args(command: str) -> list[Argument]:
             for arg in args:
                 valid_type = _type_lookup(arg.strip("."))
                 if not valid_type:
-                    logger.warning(f"Could not determine positional arg type for command '{command}': unknown type '{arg}'")
+                    warnings.append(("Could not determine positional arg type", f"unknown type '{arg}'"))
                     return default_arg()
 
                 if arg.endswith("..."):
@@ -129,6 +179,6 @@ def get_positional_args(command: str) -> list[Argument]:
 
             return arguments
 
-    logger.warning(f"Could not determine positional args for command '{command}': {arg_str}")
+    warnings.append(("Could not determine positional args", arg_str))
 
     return default_arg()
@@ -0,0 +1,88 @@
+"""
+Snapshot of the information queried from Maya, allows generating the stubs without Maya
+"""
+
+import gzip
+import json
+import os
+
+from dataclasses import dataclass
+
+from . import cmds_info
+from .backend import MayaBackend
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+@dataclass
+class Snapshot(MayaBackend):
+    version: str
+    commands: list[str]
+    synopses: dict[str, str | None]
+    """ The synopsis line from the help of each command, None if the command has no help """
+
+    def get_version(self) -> str:
+        return self.version
+
+    def get_commands(self) -> list[str]:
+        return self.commands
+
+    def get_positional_args(self, command: str) -> list[cmds_info.Argument]:
+        return cmds_info.parse_synopsis(command, self.synopses.get(command))
+
+    def save(self, filepath: str) -> None:
+        """
+        Save the snapshot as JSON, compressed with gzip if the filepath ends with '.gz'
+        """
+        data = json.dumps({
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "version": self.version,
+            "commands": self.commands,
+            "synopses": self.synopses,
+        }, separators=(",", ":")).encode("utf-8")
+
+        if filepath.endswith(".gz"):
+            data = gzip.compress(data)
+
+        if os.path.dirname(filepath):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "wb") as f:
+            f.write(data)
+
+
+def load(filepath: str) -> Snapshot:
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    if data[:2] == b"\x1f\x8b":  # gzip magic number
+        data = gzip.decompress(data)
+
+    content = json.loads(data)
+    if content.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version {content.get('format_version')} in {filepath}")
+
+    return Snapshot(content["version"], content["commands"], content["synopses"])
+
+
+def create_snapshot() -> Snapshot:
+    """
+    Query all information from Maya, must be called inside of `MayaStandalone`
+    """
+    from . import version
+
+    commands = cmds_info.get_commands()
+    synopses = cmds_info.get_synopses(commands)
+
+    return Snapshot(version(), commands, synopses)
+
+
+def export(filepath: str) -> None:
+    """
+    Initialize Maya standalone and export a snapshot to the given filepath
+    """
+    from .standalone import MayaStandalone
+
+    with MayaStandalone():
+        snapshot = create_snapshot()
+
+    snapshot.save(filepath)
@@ -1,8 +1,7 @@
-import maya.standalone
-
-
 class MayaStandalone:
     def __enter__(self):
+        import maya.standalone
+
         try:
             maya.standalone.initialize()
         except RuntimeError:
@@ -10,6 +9,8 @@ class MayaStandalone:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        import maya.standalone
+
         try:
             maya.standalone.uninitialize()
         except RuntimeError:
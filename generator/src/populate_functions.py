@@ -1,13 +1,12 @@
-import re
+import dataclasses
+import collections
 
-from . import base_types
+from . import base_types, type_conversion
 from .documentation import command
 from .flags import GeneratorFlag
 
 from . import resources
 
-PATTERN_ARRAY = re.compile(r'\[\d*\]$')
-
 TYPE_CONVERSION = resources.load("type_conversion.jsonc")
 TYPE_CONVERSION_RETURNS = resources.load("type_conversion_returns.jsonc")
 CREATE_FLAG_RETURN_TYPES_SPLIT = resources.load("create_return_types_split.jsonc")
@@ -15,38 +14,28 @@ CREATE_FLAG_RETURN_TYPES = resources.load("create_return_types.jsonc")
 SUPPORT_FLAGS = resources.load("support_flags.jsonc")
 QUERY_FLAG_RETURN_TYPES = resources.load("query_return_types.jsonc")
 
+TYPE_CONVERTER = type_conversion.TypeConverter(TYPE_CONVERSION, TYPE_CONVERSION_RETURNS)
 
-def get_arg_type(arg_type_str: str, *, return_type: bool = False, sequence_as_tuple: bool = False) -> str:
-    def __get_type(arg: str):
-        if match := PATTERN_ARRAY.search(arg):
-            base_type = arg[:match.start()]
-            return f"list[{__get_type(base_type)}]"
-
-        if return_type and arg in TYPE_CONVERSION_RETURNS:
-            return TYPE_CONVERSION_RETURNS[arg]
-
-        return TYPE_CONVERSION.get(arg, arg)
-
-    arg_type = arg_type_str.lower().strip()
-    if "|" in arg_type:
-        items = {get_arg_type(x, return_type=return_type, sequence_as_tuple=sequence_as_tuple) for x in arg_type.split("|")}
-        return "|".join(sorted(items))
-
-    # [string, [, string, ], [, string, ]] -> tuple[str, str, str]
-    # [[, boolean, float, ]] -> tuple[bool, float]
-    if "[, " in arg_type:
-        arg_type = arg_type.replace("[, ", "").replace(", ]", "")
-
-    if arg_type.startswith("["):
-        items = arg_type.removeprefix("[").removesuffix("]").split(",")
-        items = [__get_type(x.strip()) for x in items]
-        if sequence_as_tuple:
-            return f"tuple[{','.join(items)}]"
-        else:
-            items = sorted(list(set(items)))  # Remove duplicates
-            return f"Sequence[{','.join(items)}]"
 
-    return __get_type(arg_type)
+def get_modifier_index(support_flags: dict[str, dict[str, list[str]]]) -> dict[str, dict[str, list[str]]]:
+    """
+    Invert the support flags, to map each command's flags to the modifier flags that can be combined with them
+    """
+    modifier_index: dict[str, dict[str, list[str]]] = {}
+    for command_name, modifiers in support_flags.items():
+        flag_modifiers = modifier_index.setdefault(command_name, {})
+        for modifier_flag, flag_names in modifiers.items():
+            for flag_name in dict.fromkeys(flag_names):
+                flag_modifiers.setdefault(flag_name, []).append(modifier_flag)
+
+    return modifier_index
+
+
+MODIFIER_INDEX = get_modifier_index(SUPPORT_FLAGS)
+
+
+def get_arg_type(arg_type_str: str, *, return_type: bool = False, sequence_as_tuple: bool = False) -> str:
+    return TYPE_CONVERTER.convert(arg_type_str, return_type=return_type, sequence_as_tuple=sequence_as_tuple)
 
 
 def flag_to_arg(flag: command.Flag, *, sequence_as_tuple: bool = False) -> base_types.Argument:
@@ -83,26 +72,34 @@ def get_functions_create(command_name: str,
     if not return_types:
         return_types.add("Any")
 
-    cmd_support_flags: dict[str, list[str]] = SUPPORT_FLAGS.get(command_name, {})
+    cmd_modifiers: dict[str, list[str]] = MODIFIER_INDEX.get(command_name, {})
 
     # Figure out if we need to split up the create functions based on known return types
     if create_returns := CREATE_FLAG_RETURN_TYPES_SPLIT.get(command_name):
         # Assume all flags with this return type has been documented and remove them from the general return types
         return_types.difference_update(create_returns.values())
 
-        for flag_name, flag_return_type in create_returns.items():
-            if arg_to_modify := next((x for x in create_args if x.name == flag_name), None):
-                # Remove the flag from the default create args
-                create_args.remove(arg_to_modify)
+        # Indices of the create args per name, a duplicated flag name only has its first remaining occurrence removed
+        create_arg_indices: dict[str, collections.deque[int]] = {}
+        for i, arg in enumerate(create_args):
+            create_arg_indices.setdefault(arg.name, collections.deque()).append(i)
+        removed_indices: set[int] = set()
 
-                arg_to_modify.default = None
+        def pop_create_arg(name: str) -> base_types.Argument | None:
+            if indices := create_arg_indices.get(name):
+                index = indices.popleft()
+                removed_indices.add(index)
+                return create_args[index]
+            return None
 
-                args = [arg_to_modify]
-                for support_flag in [k for k, v in cmd_support_flags.items() if flag_name in v]:
-                    if arg := next((x for x in create_args if x.name == support_flag), None):
-                        create_args.remove(arg)
+        for flag_name, flag_return_type in create_returns.items():
+            # Remove the flag from the default create args
+            if arg_to_modify := pop_create_arg(flag_name):
+                args = [dataclasses.replace(arg_to_modify, default=None)]
+                for support_flag in cmd_modifiers.get(flag_name, []):
+                    if arg := pop_create_arg(support_flag):
                         args.append(arg)
-                    elif flag := next((x for x in docs.flags if x.name_long == support_flag), None):
+                    elif flag := docs.get_flag(support_flag):
                         args.append(flag_to_arg(flag, sequence_as_tuple=bool(flags & GeneratorFlag.TUPLE_PARAMS)))
 
                 functions.append(
@@ -114,6 +111,8 @@ def get_functions_create(command_name: str,
                     )
                 )
 
+        create_args = [arg for i, arg in enumerate(create_args) if i not in removed_indices]
+
     return_type_str = "|".join(sorted(return_types))
 
     functions.insert(
@@ -159,6 +158,7 @@ def get_functions_query(command_name: str,
     general_modifier_args = [flag_to_arg(x, sequence_as_tuple=bool(flags & GeneratorFlag.TUPLE_PARAMS)) for x in general_modifier_flags]
 
     modifiers = SUPPORT_FLAGS.get(command_name, {})
+    flag_modifiers = MODIFIER_INDEX.get(command_name, {})
     query_return_type = QUERY_FLAG_RETURN_TYPES.get(command_name, {})
 
     query_arg = base_types.Argument(
@@ -175,7 +175,13 @@ def get_functions_query(command_name: str,
         )
     )
 
+    # Positions of the query flags by name, so the modifiers of a flag can be listed in the order they're documented.
+    # A flag name may be documented more than once, each occurrence is a modifier
     query_flags = docs.get_query_flags()
+    query_flag_positions: dict[str, list[int]] = {}
+    for i, flag in enumerate(query_flags):
+        query_flag_positions.setdefault(flag.name_long, []).append(i)
+
     for flag in query_flags:
         if flag.name_long in modifiers:
             # This flag is a modifier for other query flags
@@ -183,8 +189,8 @@ def get_functions_query(command_name: str,
             continue
 
         # Find all flags that are modifiers for this flag
-        modifier_flags = [x for x in query_flags if flag.name_long in modifiers.get(x.name_long, [])]
-        modifier_args = [flag_to_arg(x, sequence_as_tuple=bool(flags & GeneratorFlag.TUPLE_PARAMS)) for x in modifier_flags]
+        modifier_positions = sorted(i for x in flag_modifiers.get(flag.name_long, []) for i in query_flag_positions.get(x, []))
+        modifier_args = [flag_to_arg(query_flags[i], sequence_as_tuple=bool(flags & GeneratorFlag.TUPLE_PARAMS)) for i in modifier_positions]
 
         flag_arg = base_types.Argument(
             name=flag.name_long,
@@ -0,0 +1,76 @@
+"""
+Timing instrumentation for generation runs.
+Records the time spent in each phase, the time spent on each command and counters such as cache hits & bytes fetched
+"""
+
+import contextlib
+import json
+import time
+import os
+
+DEFAULT_SLOWEST_COMMANDS = 20
+
+
+class Profiler:
+    def __init__(self):
+        self.start_time = time.perf_counter()
+
+        self.phases: list[tuple[str, float, float]] = []
+        """ Name, start time relative to the profiler start & duration of each phase, in seconds """
+
+        self.command_timings: dict[str, dict[str, float]] = {}
+        """ Time spent on each stage of every command, in seconds """
+
+        self.counters: dict[str, int | float | dict] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start_time - self.start_time, time.perf_counter() - start_time))
+
+    @contextlib.contextmanager
+    def command_stage(self, command_name: str, stage: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_command_time(command_name, stage, time.perf_counter() - start_time)
+
+    def add_command_time(self, command_name: str, stage: str, seconds: float) -> None:
+        stages = self.command_timings.setdefault(command_name, {})
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def get_slowest_commands(self, count: int = DEFAULT_SLOWEST_COMMANDS) -> list[tuple[str, float, dict[str, float]]]:
+        """
+        Get the name, total time & time per stage of the `count` commands that took the longest to generate
+        """
+        commands = [(name, sum(stages.values()), stages) for name, stages in self.command_timings.items()]
+        commands.sort(key=lambda x: x[1], reverse=True)
+        return commands[:count]
+
+    def get_report(self, slowest_commands: int = DEFAULT_SLOWEST_COMMANDS) -> dict:
+        return {
+            "total_seconds": time.perf_counter() - self.start_time,
+            "phases": [
+                {"name": name, "start": start, "seconds": duration}
+                for name, start, duration in self.phases
+            ],
+            "slowest_commands": [
+                {"name": name, "seconds": total, "stages": stages}
+                for name, total, stages in self.get_slowest_commands(slowest_commands)
+            ],
+            "counters": self.counters,
+        }
+
+    def write_report(self, filepath: str, slowest_commands: int = DEFAULT_SLOWEST_COMMANDS) -> None:
+        """
+        Write the report as JSON to `filepath`
+        """
+        if directory := os.path.dirname(filepath):
+            os.makedirs(directory, exist_ok=True)
+
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.get_report(slowest_commands), f, indent=4)
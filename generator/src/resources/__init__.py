@@ -1,17 +1,23 @@
+import functools
 import typing
 import json
 import os
 import re
 
+# Remove comments (//...) for JSONC
+# This is unsafe if the double slashes are inside values (e.g. key: "http://example.com")
+# Should be safe for this package's use cases, otherwise just switch to a proper JSONC parser
+PATTERN_COMMENT = re.compile(r'//.*')
 
+
+@functools.cache
 def load(file: str) -> dict[str, typing.Any]:
+    """
+    Load a JSONC resource file. Each file is only read once per process and the same dict is returned
+    to every caller, so the tables are shared between modules and must not be modified
+    """
     path = os.path.join(os.path.dirname(__file__), file)
     with open(path, 'r') as f:
         content = f.read()
 
-        # Remove comments (//...) for JSONC
-        # This is unsafe if the double slashes are inside values (e.g. key: "http://example.com")
-        # Should be safe for this package's use cases, otherwise just switch to a proper JSONC parser
-        content = re.sub(r'//.*', '', content)
-
-        return json.loads(content)
+    return json.loads(PATTERN_COMMENT.sub('', content))
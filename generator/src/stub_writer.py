@@ -0,0 +1,179 @@
+"""
+Writers the generated stubs are streamed to one command at a time, so the whole stub file never has to be held in memory.
+Files are written to a temporary file first and moved into place when the writer is closed,
+so a failed run never leaves a partially written stub behind
+"""
+
+import typing
+import abc
+import os
+import re
+
+
+# Matches the shard imports of a package's `__init__.pyi`
+SHARD_IMPORT_PATTERN = re.compile(r"^from \.(_[a-z]|_other) import \($", re.MULTILINE)
+
+
+def get_temp_filepath(filepath: str) -> str:
+    return f"{filepath}.{os.getpid()}.tmp"
+
+
+def get_shard_name(command_name: str) -> str:
+    first_letter = command_name[0].lower()
+    return f"_{first_letter}" if first_letter.isascii() and first_letter.isalpha() else "_other"
+
+
+def read_shard_names(init_filepath: str) -> set[str]:
+    """
+    Get the shards imported by the `__init__.pyi` of a stub package, empty if it doesn't exist
+    """
+    try:
+        with open(init_filepath, "r", encoding="utf-8") as f:
+            return set(SHARD_IMPORT_PATTERN.findall(f.read()))
+    except FileNotFoundError:
+        return set()
+
+
+class StubWriter(abc.ABC):
+    @abc.abstractmethod
+    def begin(self, header: str) -> None:
+        """
+        Start writing the stubs, `header` is the content placed above the commands
+        """
+
+    @abc.abstractmethod
+    def write_command(self, command_name: str, command_string: str) -> None:
+        """
+        Write the rendered stub of a single command
+        """
+
+    def close(self) -> None:
+        """
+        Finish writing, called once all commands have been written
+        """
+
+    def abort(self) -> None:
+        """
+        Discard everything written, called if the generation failed
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class TextStubWriter(StubWriter):
+    """
+    Writes the header followed by all commands to a text stream, separated by newlines
+    """
+
+    def __init__(self, stream: typing.TextIO):
+        self.stream = stream
+        self._empty = True
+
+    def begin(self, header: str) -> None:
+        self.stream.write(f"{header}\n")
+
+    def write_command(self, command_name: str, command_string: str) -> None:
+        if not self._empty:
+            self.stream.write("\n")
+        self.stream.write(command_string)
+        self._empty = False
+
+
+class FileStubWriter(StubWriter):
+    """
+    Writes all commands to a single stub file
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.temp_filepath = get_temp_filepath(filepath)
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        self._file = open(self.temp_filepath, "w", encoding="utf-8")
+        self._writer = TextStubWriter(self._file)
+
+    def begin(self, header: str) -> None:
+        self._writer.begin(header)
+
+    def write_command(self, command_name: str, command_string: str) -> None:
+        self._writer.write_command(command_name, command_string)
+
+    def close(self) -> None:
+        self._file.close()
+        os.replace(self.temp_filepath, self.filepath)
+
+    def abort(self) -> None:
+        self._file.close()
+        os.remove(self.temp_filepath)
+
+
+class PackageStubWriter(StubWriter):
+    """
+    Writes a stub package, where the commands are split into one module per first letter
+    and each command is explicitly re-exported by the `__init__.pyi`
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._header = ""
+        self._shards: dict[str, tuple[typing.TextIO, list[str]]] = {}
+
+        os.makedirs(directory, exist_ok=True)
+
+    def begin(self, header: str) -> None:
+        self._header = header
+
+    def write_command(self, command_name: str, command_string: str) -> None:
+        shard_name = get_shard_name(command_name)
+        if shard_name not in self._shards:
+            shard_file = open(get_temp_filepath(self._get_filepath(shard_name)), "w", encoding="utf-8")
+            shard_file.write(f"{self._header}\n")
+            self._shards[shard_name] = (shard_file, [])
+
+        shard_file, command_names = self._shards[shard_name]
+        shard_file.write(f"\n{command_string}")
+        command_names.append(command_name)
+
+    def close(self) -> None:
+        # The commands in each shard are only known once all commands are written, so `__all__` is placed last
+        for shard_name, (shard_file, command_names) in self._shards.items():
+            all_str = ",".join(f'"{command_name}"' for command_name in command_names)
+            shard_file.write(f"\n\n__all__ = [{all_str}]\n")
+            shard_file.close()
+            os.replace(shard_file.name, self._get_filepath(shard_name))
+
+        # The `__init__.pyi` of the previous run imports every shard it wrote
+        init_filepath = os.path.join(self.directory, "__init__.pyi")
+        previous_shard_names = read_shard_names(init_filepath)
+
+        # Explicit re-exports, so type checkers only have to load the shards of the commands that are used.
+        # A star import would make them load every shard to find out which names it binds
+        imports_str = "\n".join(
+            f"from .{shard_name} import (\n" + "".join(f"    {x} as {x},\n" for x in command_names) + ")"
+            for shard_name, (_, command_names) in sorted(self._shards.items())
+        )
+        with open(get_temp_filepath(init_filepath), "w", encoding="utf-8") as f:
+            f.write(f"{self._header}\n{imports_str}\n")
+        os.replace(get_temp_filepath(init_filepath), init_filepath)
+
+        # Remove the shards of the previous run that are no longer generated, any other files are left untouched
+        for shard_name in previous_shard_names - self._shards.keys():
+            try:
+                os.remove(self._get_filepath(shard_name))
+            except FileNotFoundError:
+                pass
+
+    def abort(self) -> None:
+        for shard_file, _ in self._shards.values():
+            shard_file.close()
+            os.remove(shard_file.name)
+
+    def _get_filepath(self, shard_name: str) -> str:
+        return os.path.join(self.directory, f"{shard_name}.pyi")
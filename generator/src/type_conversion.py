@@ -0,0 +1,241 @@
+"""
+Conversion of the type strings found in the Maya documentation, e.g. 'string[]' or '[float, float, float]', to Python type annotations
+"""
+
+import functools
+import typing
+import re
+
+DEFAULT_CACHE_SIZE = 4096
+
+# The documentation writes some sequences as flattened groups, e.g. '[string, [, string, ], [, string, ]]'
+TOKEN_GROUP_OPEN = "[, "
+TOKEN_GROUP_CLOSE = ", ]"
+
+PATTERN_TOKEN = re.compile(r"""
+    (?P<group_open>\[,\x20)
+  | (?P<group_close>,\x20\])
+  | (?<=[^\s\[\],|])(?P<dimensions>(?:\[\d*\])+)  # Array dimensions directly after a name, e.g. 'int[2][]'
+  | (?P<punctuation>[\[\],|])
+  | (?P<name>[^\s\[\],|]+(?:\s+[^\s\[\],|]+)*)
+  | (?P<space>\s+)
+""", re.VERBOSE)
+
+# Splits an element into its name and trailing array dimensions, e.g. 'int[2][]' -> ('int', '[2][]')
+PATTERN_ELEMENT = re.compile(r'(.*?)((?:\[\d*\])*)', re.DOTALL)
+
+
+class CacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+class Element(typing.NamedTuple):
+    name: str
+    dimensions: int
+
+
+class Sequence(typing.NamedTuple):
+    elements: list[Element]
+
+
+class Union(typing.NamedTuple):
+    alternatives: list[Element | Sequence]
+
+
+TypeNode = Element | Sequence | Union
+
+
+class TypeSyntaxError(ValueError):
+    pass
+
+
+class Token(typing.NamedTuple):
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+def tokenize(type_str: str) -> list[Token]:
+    """
+    Split a lowercase & stripped type string into tokens, whitespace between tokens is dropped
+    """
+    tokens: list[Token] = []
+    for match in PATTERN_TOKEN.finditer(type_str):
+        kind = typing.cast(str, match.lastgroup)
+        if kind == "punctuation":
+            tokens.append(Token(match.group(), match.group(), match.start(), match.end()))
+        elif kind != "space":
+            tokens.append(Token(kind, match.group(), match.start(), match.end()))
+
+    return tokens
+
+
+class TypeParser:
+    """
+    Recursive descent parser for the type strings, the grammar is:
+        type        := alternative ('|' alternative)*
+        alternative := sequence | group | element
+        sequence    := '[' item (',' item)* ']'
+        item        := element | group
+        group       := '[, ' element (',' element)* ', ]'
+        element     := name dimensions?
+
+    A group is flattened into the sequence it's in. A group outside of a sequence must hold a single element,
+    without any whitespace around it as it's part of the name. Raises `TypeSyntaxError` for type strings outside of the grammar
+    """
+
+    def __init__(self, type_str: str):
+        self.tokens = tokenize(type_str)
+        self.position = 0
+
+    def parse(self) -> TypeNode:
+        alternatives = [self.parse_alternative()]
+        while self.accept("|"):
+            alternatives.append(self.parse_alternative())
+
+        if self.position != len(self.tokens):
+            raise TypeSyntaxError(f"Unexpected '{self.tokens[self.position].text}'")
+
+        return alternatives[0] if len(alternatives) == 1 else Union(alternatives)
+
+    def parse_alternative(self) -> Element | Sequence:
+        if self.accept("["):
+            elements = self.parse_items()
+            self.expect("]")
+            return Sequence(elements)
+
+        if self.peek() == "group_open":
+            start = self.position
+            elements = self.parse_group()
+            if len(elements) != 1:
+                raise TypeSyntaxError("Expected a single element in a group outside of a sequence")
+            if any(a.end != b.start for a, b in zip(self.tokens[start:self.position], self.tokens[start + 1:self.position])):
+                raise TypeSyntaxError("Unexpected whitespace in a group outside of a sequence")
+            return elements[0]
+
+        return self.parse_element()
+
+    def parse_items(self) -> list[Element]:
+        elements: list[Element] = []
+        while True:
+            if self.peek() == "group_open":
+                elements.extend(self.parse_group())
+            else:
+                elements.append(self.parse_element())
+
+            if not self.accept(","):
+                return elements
+
+    def parse_group(self) -> list[Element]:
+        self.expect("group_open")
+        elements = [self.parse_element()]
+        while self.accept(","):
+            elements.append(self.parse_element())
+        self.expect("group_close")
+        return elements
+
+    def parse_element(self) -> Element:
+        name = self.expect("name")
+        dimensions = self.accept("dimensions")
+        return Element(name, dimensions.count("[") if dimensions else 0)
+
+    def peek(self) -> str | None:
+        return self.tokens[self.position].kind if self.position < len(self.tokens) else None
+
+    def accept(self, kind: str) -> str | None:
+        if self.peek() != kind:
+            return None
+
+        text = self.tokens[self.position].text
+        self.position += 1
+        return text
+
+    def expect(self, kind: str) -> str:
+        text = self.accept(kind)
+        if text is None:
+            found = self.tokens[self.position].text if self.position < len(self.tokens) else "end of type"
+            raise TypeSyntaxError(f"Expected {kind}, got '{found}'")
+        return text
+
+
+class TypeConverter:
+    """
+    Converts type strings using the given lookup tables, the results are memoized in a bounded cache
+    keyed on the type string and the conversion options.
+
+    Type strings are parsed with `TypeParser`. Malformed type strings outside of its grammar, e.g. with unbalanced
+    brackets, are converted with the plain string rules used before the parser existed, so they give the same result
+    """
+
+    def __init__(self, type_table: dict[str, str], return_type_table: dict[str, str], cache_size: int | None = DEFAULT_CACHE_SIZE):
+        self.type_table = type_table
+        self.return_type_table = return_type_table
+        self._convert_cached = functools.lru_cache(maxsize=cache_size)(self._convert)
+
+    def convert(self, type_str: str, *, return_type: bool = False, sequence_as_tuple: bool = False) -> str:
+        return self._convert_cached(type_str, return_type, sequence_as_tuple)
+
+    def get_cache_info(self) -> CacheInfo:
+        cache_info = self._convert_cached.cache_info()
+        return CacheInfo(cache_info.hits, cache_info.misses, cache_info.currsize)
+
+    def clear_cache(self) -> None:
+        self._convert_cached.cache_clear()
+
+    def _convert(self, type_str: str, return_type: bool, sequence_as_tuple: bool) -> str:
+        type_str = type_str.lower().strip()
+
+        try:
+            node = TypeParser(type_str).parse()
+        except TypeSyntaxError:
+            return self._convert_malformed(type_str, return_type, sequence_as_tuple)
+
+        return self._convert_node(node, return_type, sequence_as_tuple)
+
+    def _convert_node(self, node: TypeNode, return_type: bool, sequence_as_tuple: bool) -> str:
+        if isinstance(node, Union):
+            items = {self._convert_node(x, return_type, sequence_as_tuple) for x in node.alternatives}
+            return "|".join(sorted(items))
+
+        if isinstance(node, Sequence):
+            items = [self._convert_element(x, return_type) for x in node.elements]
+            if sequence_as_tuple:
+                return f"tuple[{','.join(items)}]"
+            return f"Sequence[{','.join(sorted(set(items)))}]"
+
+        return self._convert_element(node, return_type)
+
+    def _convert_element(self, element: Element, return_type: bool) -> str:
+        if return_type and element.name in self.return_type_table:
+            converted = self.return_type_table[element.name]
+        else:
+            converted = self.type_table.get(element.name, element.name)
+
+        for _ in range(element.dimensions):
+            converted = f"list[{converted}]"
+
+        return converted
+
+    def _convert_malformed(self, type_str: str, return_type: bool, sequence_as_tuple: bool) -> str:
+        if "|" in type_str:
+            items = {self.convert(x, return_type=return_type, sequence_as_tuple=sequence_as_tuple) for x in type_str.split("|")}
+            return "|".join(sorted(items))
+
+        if TOKEN_GROUP_OPEN in type_str:
+            type_str = type_str.replace(TOKEN_GROUP_OPEN, "").replace(TOKEN_GROUP_CLOSE, "")
+
+        if type_str.startswith("["):
+            items = type_str.removeprefix("[").removesuffix("]").split(",")
+            items = [self._convert_malformed_element(x.strip(), return_type) for x in items]
+            if sequence_as_tuple:
+                return f"tuple[{','.join(items)}]"
+            return f"Sequence[{','.join(sorted(set(items)))}]"
+
+        return self._convert_malformed_element(type_str, return_type)
+
+    def _convert_malformed_element(self, element: str, return_type: bool) -> str:
+        name, dimensions = PATTERN_ELEMENT.fullmatch(element).groups()
+        return self._convert_element(Element(name, dimensions.count("[")), return_type)
@@ -0,0 +1,58 @@
+import shutil
+import os
+
+import pytest
+
+from src.documentation import cache
+from src.maya_info import snapshot
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FAKE_MAYA_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "fake_maya")
+
+SNAPSHOT_SYNOPSES = {
+    "headsUpMessage": "Synopsis: headsUpMessage [flags] String",
+    "ls": "Synopsis: ls [flags] [String...]",
+    "undocumentedCmd": "Synopsis: undocumentedCmd [flags] String Int",
+    "xform": "Synopsis: xform [flags] [String...]",
+}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch) -> str:
+    """
+    An empty cache directory, used by the cache module for the duration of the test
+    """
+    directory = str(tmp_path / "cache")
+    monkeypatch.setattr(cache, "CACHE_DIR", directory)
+    monkeypatch.setattr(cache, "COMPRESSION", "none")
+    monkeypatch.setattr(cache, "MAX_SIZE", None)
+    return directory
+
+
+@pytest.fixture
+def docs_dir(tmp_path) -> str:
+    """
+    A copy of the fixture documentation pages, which the test may modify
+    """
+    directory = str(tmp_path / "CommandsPython")
+    shutil.copytree(os.path.join(FIXTURES_DIR, "CommandsPython"), directory)
+    return directory
+
+
+@pytest.fixture
+def snapshot_path(tmp_path) -> str:
+    filepath = str(tmp_path / "maya2026.json")
+    snapshot.Snapshot("2026", sorted(SNAPSHOT_SYNOPSES), dict(SNAPSHOT_SYNOPSES)).save(filepath)
+    return filepath
+
+
+@pytest.fixture
+def fake_maya(monkeypatch):
+    """
+    The fake `maya.cmds` of the benchmarks, configure the commands with `_configure`
+    """
+    monkeypatch.syspath_prepend(FAKE_MAYA_DIR)
+    import maya.cmds
+
+    yield maya.cmds
+    maya.cmds._configure({})
@@ -0,0 +1,21 @@
+from src import generator
+from src.flags import GeneratorFlag
+
+from .conftest import SNAPSHOT_SYNOPSES
+
+
+def test_live_backend_only_queries_generated_commands(fake_maya, docs_dir, monkeypatch):
+    fake_maya._configure(dict(SNAPSHOT_SYNOPSES))
+
+    queried_commands: list[str] = []
+    help_command = fake_maya.help
+
+    def help_spy(command, **kwargs):
+        queried_commands.append(command)
+        return help_command(command, **kwargs)
+
+    monkeypatch.setattr(fake_maya, "help", help_spy)
+    generator.generate_string(GeneratorFlag.NONE, docs_source=docs_dir)
+
+    # 'undocumentedCmd' isn't generated without GeneratorFlag.INCLUDE_UNDOCUMENTED_FUNCTIONS
+    assert sorted(queried_commands) == ["dagObjectHit", "headsUpMessage", "ls", "xform"]
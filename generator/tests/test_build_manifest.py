@@ -0,0 +1,73 @@
+import os
+
+from src import build_manifest, generator
+from src.documentation import cache
+from src.flags import GeneratorFlag
+
+FLAGS = GeneratorFlag.INCLUDE_UNDOCUMENTED_FUNCTIONS | GeneratorFlag.SINGLE_PASS_PARSER
+
+
+def generate(out_filepath: str, flags: GeneratorFlag, docs_dir: str, snapshot_path: str, monkeypatch) -> tuple[str, list[str]]:
+    """
+    Generate the stubs, returns the stubs and the names of the commands that were built
+    """
+    built_commands: list[str] = []
+    create_command = generator.create_command
+
+    def create_command_spy(command_name, *args, **kwargs):
+        built_commands.append(command_name)
+        return create_command(command_name, *args, **kwargs)
+
+    monkeypatch.setattr(generator, "create_command", create_command_spy)
+    generator.generate_stubs(out_filepath, flags=flags, docs_source=docs_dir, snapshot=snapshot_path)
+
+    with open(out_filepath, "r", encoding="utf-8") as f:
+        return f.read(), built_commands
+
+
+def test_reuses_unchanged_commands(cache_dir, docs_dir, snapshot_path, tmp_path, monkeypatch):
+    out_filepath = str(tmp_path / "cmds.pyi")
+
+    first_stubs, first_built = generate(out_filepath, FLAGS | GeneratorFlag.INCREMENTAL, docs_dir, snapshot_path, monkeypatch)
+    assert first_built == ["dagObjectHit", "headsUpMessage", "ls", "undocumentedCmd", "xform"]
+
+    stubs, built = generate(out_filepath, FLAGS | GeneratorFlag.INCREMENTAL, docs_dir, snapshot_path, monkeypatch)
+    assert built == []
+    assert stubs == first_stubs
+
+    # Only the command whose page changed is built again
+    ls_filepath = os.path.join(docs_dir, "ls.html")
+    with open(ls_filepath, "r", encoding="utf-8") as f:
+        html = f.read()
+    with open(ls_filepath, "w", encoding="utf-8") as f:
+        f.write(html.replace("List objects that are currently selected.", "List the selected objects."))
+
+    stubs, built = generate(out_filepath, FLAGS | GeneratorFlag.INCREMENTAL, docs_dir, snapshot_path, monkeypatch)
+    assert built == ["ls"]
+    assert "List the selected objects." in stubs
+
+    expected_stubs, _ = generate(str(tmp_path / "expected.pyi"), FLAGS, docs_dir, snapshot_path, monkeypatch)
+    assert stubs == expected_stubs
+
+
+def test_output_flags_change_the_hash():
+    positional_args = [("objects", "str", None)]
+    input_hash = build_manifest.hash_inputs("ls", b"<html></html>", positional_args, FLAGS)
+
+    assert build_manifest.hash_inputs("ls", b"<html></html>", positional_args, FLAGS | GeneratorFlag.CACHE) == input_hash
+    assert build_manifest.hash_inputs("ls", b"<html></html>", positional_args, FLAGS | GeneratorFlag.TUPLE_PARAMS) != input_hash
+    assert build_manifest.hash_inputs("ls", b"<html><p></p></html>", positional_args, FLAGS) != input_hash
+
+
+def test_round_trip(cache_dir, tmp_path):
+    out_filepath = str(tmp_path / "cmds.pyi")
+
+    manifest = build_manifest.Manifest(version="2026")
+    manifest.set_text("ls", "hash", "def ls(): ...")
+    build_manifest.save(out_filepath, manifest)
+    assert [(x.scope, x.category) for x in cache.get_summary()] == [("2026", "manifests")]
+
+    loaded = build_manifest.load(out_filepath)
+    assert loaded.get_text("ls", "hash") == "def ls(): ..."
+    assert loaded.get_text("ls", "other hash") is None
+    assert build_manifest.load(str(tmp_path / "other.pyi")).entries == {}
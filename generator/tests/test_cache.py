@@ -0,0 +1,114 @@
+import argparse
+import itertools
+import os
+
+import pytest
+
+from src import __main__ as main
+from src.documentation import cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    A clock that advances by a second every time it's read, so every access has a distinct time
+    """
+    counter = itertools.count(1000)
+    monkeypatch.setattr(cache.time, "time", lambda: float(next(counter)))
+
+
+def get_data_paths(cache_dir: str) -> list[str]:
+    return sorted(os.path.relpath(os.path.join(root, x), cache_dir) for root, _, files in os.walk(os.path.join(cache_dir, "data")) for x in files)
+
+
+def test_compression_can_be_changed(cache_dir, monkeypatch):
+    cache.write("page.html", b"<html>none</html>")
+    assert cache.read("page.html") == b"<html>none</html>"
+
+    for compression in ("gzip", "lzma"):
+        monkeypatch.setattr(cache, "COMPRESSION", compression)
+        cache.write("page.html", f"<html>{compression}</html>".encode())
+
+        assert cache.read("page.html") == f"<html>{compression}</html>".encode()
+        # The data file stored with the previous compression is removed
+        assert get_data_paths(cache_dir) == [cache.get_data_path("page.html", compression)]
+
+    # Entries written with another compression can still be read
+    monkeypatch.setattr(cache, "COMPRESSION", "none")
+    assert cache.read("page.html") == b"<html>lzma</html>"
+
+
+@pytest.mark.parametrize("compression", ["gzip", "lzma"])
+def test_corrupt_entry_is_a_miss(cache_dir, monkeypatch, compression):
+    monkeypatch.setattr(cache, "COMPRESSION", compression)
+    cache.write(os.path.join("parsed", "page.json"), b"{}" * 1000)
+
+    data_path = os.path.join(cache_dir, cache.get_data_path(os.path.join("parsed", "page.json"), compression))
+    with open(data_path, "r+b") as f:
+        f.truncate(os.path.getsize(data_path) // 2)
+
+    assert cache.read(os.path.join("parsed", "page.json")) is None
+    assert cache.get_keys() == []
+    assert not os.path.exists(data_path)
+
+
+def test_corrupt_gzip_stream_is_a_miss(cache_dir, monkeypatch):
+    monkeypatch.setattr(cache, "COMPRESSION", "gzip")
+    cache.write(os.path.join("parsed", "page.json"), b"{}" * 1000)
+
+    # Flip the first byte of the deflate stream after the 10 byte gzip header, zlib fails to decompress it
+    data_path = os.path.join(cache_dir, cache.get_data_path(os.path.join("parsed", "page.json"), "gzip"))
+    with open(data_path, "r+b") as f:
+        f.seek(10)
+        byte = f.read(1)[0]
+        f.seek(10)
+        f.write(bytes([byte ^ 0xFF]))
+
+    assert cache.read(os.path.join("parsed", "page.json")) is None
+    assert cache.get_keys() == []
+    assert not os.path.exists(data_path)
+
+
+def test_prune_by_scope_and_category(cache_dir):
+    cache.write("a.html", b"a", scope="2025")
+    cache.write("b.html", b"b", scope="2026")
+    cache.write(os.path.join("index", "2025.json"), b"[]", scope="2025")
+    cache.write(os.path.join("parsed", "c.json"), b"{}")
+
+    assert cache.prune(scope="2025", category="pages") == (1, 1)
+    assert cache.get_keys() == ["b.html", os.path.join("index", "2025.json"), os.path.join("parsed", "c.json")]
+
+    assert cache.prune(scope="2025") == (1, 2)
+    assert cache.prune() == (2, 3)
+    assert cache.get_keys() == []
+    assert get_data_paths(cache_dir) == []
+
+
+def test_least_recently_used_entries_are_evicted(cache_dir, clock, monkeypatch):
+    for name in ("a", "b", "c"):
+        cache.write(f"{name}.html", b"x" * 100)
+
+    cache.read("a.html")
+    monkeypatch.setattr(cache, "MAX_SIZE", 200)
+    assert cache.enforce_max_size() == (1, 100)
+    assert cache.get_keys() == ["a.html", "c.html"]
+
+
+def test_access_times_are_written_when_flushed(cache_dir, clock):
+    cache.write("a.html", b"a")
+
+    def get_last_access() -> float:
+        return cache.get_connection().execute("SELECT last_access FROM entries WHERE key = 'a.html'").fetchone()[0]
+
+    last_access = get_last_access()
+    cache.read("a.html")
+    assert get_last_access() == last_access
+
+    cache.flush_access_times()
+    assert get_last_access() > last_access
+
+
+@pytest.mark.parametrize("size_str", ["0", "-1M", "abc"])
+def test_invalid_max_size(size_str):
+    with pytest.raises(argparse.ArgumentTypeError):
+        main.parse_size(size_str)
@@ -0,0 +1,84 @@
+from src import compact_overloads
+from src.base_types import Argument, Command, Function
+
+OBJECTS = Argument("*args", "str")
+QUERY = Argument("query", "Literal[True]")
+
+
+def query_function(key: str | None, return_type: str, *extra_arguments: Argument) -> Function:
+    """
+    An overload of `xform` querying the given flag, e.g. `xform(query=True, translation=True)`
+    """
+    keyword_arguments = [QUERY, *extra_arguments]
+    if key is not None:
+        keyword_arguments.insert(1, Argument(key, "Literal[True]"))
+
+    return Function("xform", [OBJECTS], keyword_arguments, return_type)
+
+
+def test_remove_duplicates_keeps_the_first_overload():
+    first = query_function("translation", "list[float]")
+    functions = [first, query_function("rotation", "list[float]"), query_function("translation", "list[float]")]
+
+    result = compact_overloads.remove_duplicates(functions)
+
+    assert len(result) == 2
+    assert result[0] is first
+
+
+def test_merge_keys_with_the_same_return_type():
+    functions = [
+        query_function(None, "Any"),
+        query_function("translation", "list[float]"),
+        query_function("rotation", "list[float]"),
+        query_function("worldSpace", "bool"),
+    ]
+
+    result = compact_overloads.compact_functions(functions)
+
+    assert len(result) == 3
+    assert [arg.get_string() for arg in result[1].keyword_arguments] == [
+        "query:Literal[True]",
+        "translation:Literal[True]=...",
+        "rotation:Literal[True]=...",
+    ]
+    assert result[1].return_type == "list[float]"
+    assert result[2] == functions[3]
+
+
+def test_no_merge_without_a_fallback_overload():
+    # Without an overload matching `xform(query=True)` the merged overload would start accepting that call
+    functions = [query_function("translation", "list[float]"), query_function("rotation", "list[float]")]
+
+    assert compact_overloads.compact_functions(functions) == functions
+
+
+def test_no_merge_past_an_overload_accepting_the_key():
+    # `xform(query=True, rotation=True, worldSpace=True)` resolves to the second overload, moving
+    # the rotation overload above it would change that
+    functions = [
+        query_function(None, "Any"),
+        query_function("translation", "list[float]"),
+        query_function(None, "bool", Argument("rotation", "bool", "..."), Argument("worldSpace", "Literal[True]", "...")),
+        query_function("rotation", "list[float]"),
+    ]
+
+    assert compact_overloads.compact_functions(functions) == functions
+
+
+def test_compact_command_stats():
+    command = Command("xform", "Docstring", [
+        query_function(None, "Any"),
+        query_function("translation", "list[float]"),
+        query_function("rotation", "list[float]"),
+        query_function("rotation", "list[float]"),
+    ])
+
+    compacted = compact_overloads.compact_command(command)
+    stats = compact_overloads.CompactionStats()
+    stats.add(command, compacted)
+
+    assert len(compacted.functions) == 2
+    assert (stats.overloads_before, stats.overloads_after) == (4, 2)
+    assert stats.bytes_after < stats.bytes_before
+    assert command.functions[1] is not compacted.functions[1]
@@ -0,0 +1,103 @@
+import threading
+import time
+import os
+
+import pytest
+
+from src import generator, documentation, profiling
+from src.flags import GeneratorFlag
+from src.maya_info import snapshot
+
+
+def test_maya_error_stops_the_download(docs_dir, snapshot_path, monkeypatch):
+    downloaded_urls: list[str] = []
+    download_started = threading.Event()
+    get_html = documentation.command.get_html
+
+    def slow_get_html(url, *args, **kwargs):
+        download_started.set()
+        time.sleep(0.2)
+        downloaded_urls.append(url)
+        return get_html(url, *args, **kwargs)
+
+    def failing_get_positional_args(self, command):
+        download_started.wait()
+        raise RuntimeError("Maya failed")
+
+    monkeypatch.setattr(documentation.command, "get_html", slow_get_html)
+    monkeypatch.setattr(snapshot.Snapshot, "get_positional_args", failing_get_positional_args)
+
+    with pytest.raises(RuntimeError, match="Maya failed"):
+        generator.generate_string(GeneratorFlag.NONE, jobs=1, docs_source=docs_dir, snapshot=snapshot_path)
+
+    # Only the pages already being downloaded when the error was raised are finished
+    assert len(downloaded_urls) < 4
+
+
+def test_pages_are_parsed_when_used(docs_dir, snapshot_path, monkeypatch):
+    events: list[str] = []
+    parse_html = documentation.command.parse_html
+    create_command = generator.create_command
+
+    def parse_html_spy(html):
+        events.append("parse")
+        return parse_html(html)
+
+    def create_command_spy(command_name, *args, **kwargs):
+        events.append(command_name)
+        return create_command(command_name, *args, **kwargs)
+
+    monkeypatch.setattr(documentation.command, "parse_html", parse_html_spy)
+    monkeypatch.setattr(generator, "create_command", create_command_spy)
+    generator.generate_string(GeneratorFlag.NONE, docs_source=docs_dir, snapshot=snapshot_path)
+
+    assert events == ["parse", "dagObjectHit", "parse", "headsUpMessage", "parse", "ls", "parse", "xform"]
+
+
+
+def test_page_bytes_counts_the_encoded_size(docs_dir, snapshot_path):
+    profiler = profiling.Profiler()
+    generator.generate_string(GeneratorFlag.NONE, docs_source=docs_dir, snapshot=snapshot_path, profiler=profiler)
+
+    # headsUpMessage is encoded as windows-1252 & has characters that take more than a byte in utf-8
+    expected_bytes = 0
+    for name in ("dagObjectHit", "headsUpMessage", "ls", "xform"):
+        with open(os.path.join(docs_dir, f"{name}.html"), "rb") as f:
+            expected_bytes += len(documentation.command.decode_html(f.read()).encode("utf-8"))
+
+    assert profiler.counters["page_bytes"] == expected_bytes
+
+def test_generate_all_parses_identical_pages_once(docs_dir, snapshot_path, tmp_path, monkeypatch):
+    parsed_pages: list[str] = []
+    parse_html = documentation.command.parse_html
+
+    def parse_html_spy(html):
+        parsed_pages.append(html)
+        return parse_html(html)
+
+    snapshot_2025_path = str(tmp_path / "maya2025.json")
+    snapshot_2026 = snapshot.load(snapshot_path)
+    snapshot.Snapshot("2025", snapshot_2026.commands, snapshot_2026.synopses).save(snapshot_2025_path)
+
+    monkeypatch.setattr(documentation.command, "parse_html", parse_html_spy)
+    out_filepath = str(tmp_path / "{VERSION}" / "cmds.pyi")
+    generator.generate_stubs_all([snapshot_2025_path, snapshot_path], out_filepath, docs_source=docs_dir)
+
+    assert len(parsed_pages) == 4
+    assert (tmp_path / "2025" / "cmds.pyi").is_file()
+    assert (tmp_path / "2026" / "cmds.pyi").is_file()
+
+
+def test_generate_all_requires_version_in_output(snapshot_path, tmp_path):
+    with pytest.raises(ValueError, match="VERSION"):
+        generator.generate_stubs_all([snapshot_path, snapshot_path], str(tmp_path / "cmds.pyi"))
+
+
+def test_parsed_pages_of_other_versions_are_evicted(docs_dir, snapshot_path):
+    stale_key = ("src.documentation.command", "0" * 64)
+    parsed_pages = {stale_key: documentation.command.parse_html("")}
+
+    generator.generate_string(GeneratorFlag.NONE, docs_source=docs_dir, snapshot=snapshot_path, parsed_pages=parsed_pages)
+
+    assert stale_key not in parsed_pages
+    assert len(parsed_pages) == 4
@@ -0,0 +1,64 @@
+"""
+The single pass extractor must give the same result as the BeautifulSoup parser.
+The fixtures follow the markup of the CommandsPython pages: flag rows separated by whitespace,
+return values as a table or paragraph, windows-1252 encoded pages & obsolete pages
+"""
+
+import os
+
+import pytest
+
+from src.documentation import command, html_extractor
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "CommandsPython")
+FIXTURE_PAGES = sorted(x for x in os.listdir(FIXTURES_DIR) if x.endswith(".html") and x != "index_all.html")
+
+
+def read_fixture(filename: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, filename), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("filename", FIXTURE_PAGES)
+def test_same_result_as_beautifulsoup(filename: str):
+    html = read_fixture(filename)
+    assert html_extractor.parse_html(html) == command.parse_html(html)
+
+
+def test_flags():
+    docs = html_extractor.parse_html(read_fixture("xform.html"))
+
+    assert [flag.name_long for flag in docs.flags] == ["absolute", "boundingBox", "matrix", "rotation", "translation", "worldSpace"]
+
+    bounding_box = docs.get_flag("boundingBox")
+    assert bounding_box is not None
+    assert (bounding_box.create, bounding_box.query, bounding_box.edit) == (False, True, False)
+    assert bounding_box.description.startswith("Returns the bounding box of an object.")
+
+    assert (docs.undoable, docs.queryable, docs.editable) == (True, True, False)
+    assert [x.type for x in docs.returns] == ["None", "float[]"]
+    assert docs.examples is not None and docs.examples.startswith("import maya.cmds as cmds")
+
+
+def test_return_paragraph_and_multi_use():
+    docs = html_extractor.parse_html(read_fixture("ls.html"))
+
+    assert [x.type for x in docs.returns] == ["string[]"]
+    assert (docs.undoable, docs.queryable, docs.editable) == (False, False, False)
+
+    type_flag = docs.get_flag("type")
+    assert type_flag is not None and type_flag.multi_use
+
+
+def test_windows_1252_page():
+    docs = html_extractor.parse_html(read_fixture("headsUpMessage.html"))
+
+    assert "\N{LEFT DOUBLE QUOTATION MARK}center\N{RIGHT DOUBLE QUOTATION MARK}" in docs.description
+    assert docs.get_flag("uvTextureEditor").description == "Show the message in the \N{LEFT DOUBLE QUOTATION MARK}UV Editor\N{RIGHT DOUBLE QUOTATION MARK} instead."
+
+
+def test_obsolete_page():
+    docs = html_extractor.parse_html(read_fixture("dagObjectHit.html"))
+
+    assert docs.obsolete
+    assert docs.obsolete_message is not None and "Use the hitTest command instead." in docs.obsolete_message
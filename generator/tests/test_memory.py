@@ -0,0 +1,26 @@
+from benchmarks import corpus, memory
+
+# Without any limit on the pages & commands held in memory, the peak grows by ~20 KiB per command
+SMALL_CORPUS_COMMANDS = 40
+LARGE_CORPUS_COMMANDS = 160
+MAX_PEAK_BYTES = 2 * 2**20
+MAX_PEAK_GROWTH_PER_COMMAND = 4 * 2**10
+
+
+def measure_corpus(fake_maya, tmp_path, count: int) -> int:
+    pages_dir = tmp_path / str(count)
+    pages_dir.mkdir()
+    fake_maya._configure(corpus.generate_corpus(str(pages_dir), count, 0))
+    return memory.measure_pipeline(str(pages_dir))
+
+
+def test_pipeline_peak_memory_is_bounded(fake_maya, tmp_path):
+    # The modules imported on first use would be counted in the first measurement
+    measure_corpus(fake_maya, tmp_path, 5)
+
+    small_peak = measure_corpus(fake_maya, tmp_path, SMALL_CORPUS_COMMANDS)
+    large_peak = measure_corpus(fake_maya, tmp_path, LARGE_CORPUS_COMMANDS)
+
+    assert large_peak < MAX_PEAK_BYTES
+    growth_per_command = (large_peak - small_peak) / (LARGE_CORPUS_COMMANDS - SMALL_CORPUS_COMMANDS)
+    assert growth_per_command < MAX_PEAK_GROWTH_PER_COMMAND
@@ -0,0 +1,26 @@
+from src import populate_functions, base_types
+from src.documentation.command import CommandDocumentation, Flag, ReturnValue
+from src.flags import GeneratorFlag
+
+
+def create_flag(name: str, arg_type: str) -> Flag:
+    return Flag(name, name[:2], arg_type, "", query=False, edit=False, create=True, multi_use=False)
+
+
+def test_split_create_flag_only_removes_its_first_occurrence():
+    docs = CommandDocumentation(
+        undoable=True,
+        queryable=False,
+        editable=False,
+        description="",
+        returns=[ReturnValue("int", "")],
+        flags=(create_flag("exists", "int"), create_flag("killAll", "boolean"), create_flag("exists", "string")),
+        examples=None
+    )
+
+    functions = populate_functions.get_functions_create("scriptJob", docs, [base_types.Argument("*args")], GeneratorFlag.NONE)
+
+    assert [arg.name for arg in functions[0].keyword_arguments] == ["killAll", "exists"]
+    assert functions[0].keyword_arguments[1].argument_type == "str"
+    assert [arg.name for arg in functions[1].keyword_arguments] == ["exists"]
+    assert functions[1].return_type == "bool"
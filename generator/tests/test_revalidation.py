@@ -0,0 +1,69 @@
+import http.client
+import os
+
+import pytest
+
+from benchmarks import docs_server
+from src.documentation import cache, command, http_client, source
+
+
+@pytest.fixture
+def online_source(docs_dir):
+    with docs_server.serve(docs_dir) as url:
+        yield source.OnlineSource("2026", url)
+
+
+def get_revalidated() -> dict[str, int]:
+    return cache.get_stats().get("revalidated", {"hits": 0, "misses": 0})
+
+
+def test_unchanged_page_is_not_downloaded_again(cache_dir, online_source):
+    url = online_source.get_url("ls")
+    html = command.get_html(url, use_cache=True, source=online_source)
+    assert cache.get_keys("validators")
+
+    revalidated = get_revalidated()
+    assert command.get_html(url, use_cache=True, source=online_source, revalidate=True) == html
+    assert get_revalidated()["hits"] == revalidated["hits"] + 1
+
+
+def test_changed_page_is_downloaded_again(cache_dir, docs_dir, online_source):
+    url = online_source.get_url("ls")
+    command.get_html(url, use_cache=True, source=online_source)
+
+    filepath = os.path.join(docs_dir, "ls.html")
+    with open(filepath, "ab") as f:
+        f.write(b"<!-- changed -->")
+    os.utime(filepath, (os.path.getmtime(filepath) + 10,) * 2)
+
+    revalidated = get_revalidated()
+    html = command.get_html(url, use_cache=True, source=online_source, revalidate=True)
+    assert html.endswith("<!-- changed -->")
+    assert get_revalidated()["misses"] == revalidated["misses"] + 1
+    assert cache.read(cache.get_keys("pages")[0]).endswith(b"<!-- changed -->")
+
+
+def test_response_without_validators_removes_the_stale_validators(cache_dir, online_source, monkeypatch):
+    url = online_source.get_url("ls")
+    command.get_html(url, use_cache=True, source=online_source)
+    assert cache.get_keys("validators")
+
+    def request_without_validators(self, url, headers=None):
+        return http_client.Response(url, 200, http.client.HTTPMessage(), b"<html>changed</html>")
+
+    monkeypatch.setattr(source.OnlineSource, "request", request_without_validators)
+    assert command.get_html(url, use_cache=True, source=online_source, revalidate=True) == "<html>changed</html>"
+    assert cache.get_keys("validators") == []
+
+
+def test_pages_are_decoded_on_every_path(cache_dir, docs_dir, online_source):
+    # The page is windows-1252, it has to be decoded the same way when downloaded, cached & read from disk
+    url = online_source.get_url("headsUpMessage")
+    downloaded = command.get_html(url, use_cache=True, source=online_source)
+    cached = command.get_html(url, use_cache=True, source=online_source)
+
+    directory_source = source.DirectorySource(docs_dir)
+    local = command.get_html(directory_source.get_url("headsUpMessage"), source=directory_source)
+
+    assert isinstance(downloaded, str)
+    assert downloaded == cached == local
@@ -0,0 +1,42 @@
+import io
+import os
+
+from src import stub_writer
+
+
+def write(writer: stub_writer.StubWriter, command_strings: list[str]) -> None:
+    with writer:
+        writer.begin("# header")
+        for i, command_string in enumerate(command_strings):
+            writer.write_command(f"command{i}", command_string)
+
+
+def test_text_and_file_writers_agree(tmp_path):
+    for command_strings in ([], ["def a(): ..."], ["def a(): ...", "def b(): ..."]):
+        stream = io.StringIO()
+        write(stub_writer.TextStubWriter(stream), command_strings)
+
+        filepath = str(tmp_path / "cmds.pyi")
+        write(stub_writer.FileStubWriter(filepath), command_strings)
+        with open(filepath, "r", encoding="utf-8") as f:
+            assert f.read() == stream.getvalue()
+
+        assert stream.getvalue() == "# header\n" + "\n".join(command_strings)
+
+
+def test_package_writer_only_removes_its_stale_shards(tmp_path):
+    directory = str(tmp_path / "cmds")
+
+    with stub_writer.PackageStubWriter(directory) as writer:
+        writer.begin("# header")
+        writer.write_command("ls", "def ls(): ...")
+        writer.write_command("xform", "def xform(): ...")
+
+    (tmp_path / "cmds" / "_helpers.pyi").write_text("def helper(): ...")
+
+    with stub_writer.PackageStubWriter(directory) as writer:
+        writer.begin("# header")
+        writer.write_command("ls", "def ls(): ...")
+
+    assert sorted(os.listdir(directory)) == ["__init__.pyi", "_helpers.pyi", "_l.pyi"]
+    assert stub_writer.read_shard_names(os.path.join(directory, "__init__.pyi")) == {"_l"}
@@ -0,0 +1,45 @@
+import pytest
+
+from src import type_conversion
+
+TYPE_TABLE = {"string": "str", "boolean": "bool", "float": "float", "int": "int", "linear": "float", "angle": "float|str"}
+RETURN_TYPE_TABLE = {"boolean": "bool"}
+
+
+@pytest.fixture
+def converter() -> type_conversion.TypeConverter:
+    return type_conversion.TypeConverter(TYPE_TABLE, RETURN_TYPE_TABLE)
+
+
+@pytest.mark.parametrize("type_str, sequence_as_tuple, expected", [
+    ("String", False, "str"),
+    ("string[]", False, "list[str]"),
+    ("int[2][]", False, "list[list[int]]"),
+    ("boolean|int", False, "bool|int"),
+    ("[linear, linear, linear]", False, "Sequence[float]"),
+    ("[linear, linear, linear]", True, "tuple[float,float,float]"),
+    ("[string, [, string, ], [, string, ]]", True, "tuple[str,str,str]"),
+    ("[[, boolean, float, ]]", False, "Sequence[bool,float]"),
+    ("[, int, ]", False, "int"),
+])
+def test_convert(converter: type_conversion.TypeConverter, type_str: str, sequence_as_tuple: bool, expected: str):
+    assert converter.convert(type_str, sequence_as_tuple=sequence_as_tuple) == expected
+
+
+def test_parser_rejects_malformed_types():
+    for type_str in ("[int|float]", "[int, ]", "int [2]", "[int, [float, float]]"):
+        with pytest.raises(type_conversion.TypeSyntaxError):
+            type_conversion.TypeParser(type_str).parse()
+
+
+def test_malformed_types_use_the_string_rules(converter: type_conversion.TypeConverter):
+    # The '|' splits through the brackets, as it did before the parser existed
+    assert converter.convert("[int|float]") == "Sequence[int]|float]"
+
+
+def test_cache_info(converter: type_conversion.TypeConverter):
+    converter.convert("string[]")
+    converter.convert("string[]")
+    converter.convert("string[]", return_type=True)
+
+    assert converter.get_cache_info() == type_conversion.CacheInfo(hits=1, misses=2, size=2)